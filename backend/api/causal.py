@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from datetime import datetime, timezone
 from schemas.causal import (
     CausalGraphResponse,
@@ -9,12 +9,13 @@ from schemas.causal import (
     FactorDetail,
 )
 from causal.graph import CausalGraph
+from core.redis_client import prefer_replica
 
 router = APIRouter()
 _graph = CausalGraph()
 
 
-@router.get("/graph", response_model=CausalGraphResponse)
+@router.get("/graph", response_model=CausalGraphResponse, dependencies=[Depends(prefer_replica)])
 async def get_causal_graph():
     graph_data = await _graph.get_graph()
 
@@ -48,7 +49,7 @@ async def get_causal_graph():
     )
 
 
-@router.get("/factors", response_model=FactorsResponse)
+@router.get("/factors", response_model=FactorsResponse, dependencies=[Depends(prefer_replica)])
 async def get_factors():
     graph_data = await _graph.get_graph()
     edges = graph_data.get("edges", {})
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from schemas.learning import (
     LearningMetricsResponse,
     LearningLogResponse,
@@ -6,18 +6,19 @@ from schemas.learning import (
     LastImprovement,
 )
 from evaluation.evaluator import PredictionEvaluator
-from core.redis_client import get_list
+from core.redis_client import read_events, prefer_replica
+from core.keys import LEARNING_LOG
 
 router = APIRouter()
 _evaluator = PredictionEvaluator()
 
 
-@router.get("/metrics", response_model=LearningMetricsResponse)
+@router.get("/metrics", response_model=LearningMetricsResponse, dependencies=[Depends(prefer_replica)])
 async def get_learning_metrics():
     metrics = await _evaluator.compute_metrics()
 
     # Find last improvement from log
-    events = await get_list("learning:log", limit=5)
+    events = await read_events(LEARNING_LOG, limit=5)
     last_improvement = None
     for ev in events:
         if ev.get("type") == "edge_weight_update":
@@ -31,12 +32,9 @@ async def get_learning_metrics():
             )
             break
 
-    # Count graph versions
-    all_events = await get_list("learning:log", limit=1000)
-    seen_cycles = set()
-    for ev in all_events:
-        seen_cycles.add(ev.get("cycle", 0))
-    graph_versions = len(seen_cycles)
+    # Count of cycles that changed the graph, maintained by the learner
+    aggregates = await _evaluator.get_aggregates()
+    graph_versions = aggregates["graph_versions"]
 
     return LearningMetricsResponse(
         total_cycles=metrics["total_cycles"],
@@ -49,12 +47,14 @@ async def get_learning_metrics():
     )
 
 
-@router.get("/log", response_model=LearningLogResponse)
-async def get_learning_log(limit: int = 20):
-    raw_events = await get_list("learning:log", limit=limit)
+@router.get("/log", response_model=LearningLogResponse, dependencies=[Depends(prefer_replica)])
+async def get_learning_log(limit: int = 20, after: str | None = None):
+    """Newest events first; with the stream backend, ``after`` tails from a cursor."""
+    raw_events = await read_events(LEARNING_LOG, limit=limit, after=after)
 
     events = [
         LearningEvent(
+            id=ev.get("id"),
             cycle=ev.get("cycle", 0),
             timestamp=ev.get("timestamp", ""),
             type=ev.get("type", "unknown"),
@@ -65,4 +65,10 @@ async def get_learning_log(limit: int = 20):
         for ev in raw_events
     ]
 
-    return LearningLogResponse(events=events)
+    ids = [ev.id for ev in events if ev.id]
+    return LearningLogResponse(events=events, cursor=max(ids, key=_stream_id) if ids else after)
+
+
+def _stream_id(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
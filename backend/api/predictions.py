@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from datetime import datetime, timezone
 from schemas.predictions import (
     PredictionResponse,
@@ -7,19 +7,21 @@ from schemas.predictions import (
     PredictionHistoryResponse,
     PredictionHistoryItem,
 )
-from core.redis_client import get_json, get_redis
+from core.redis_client import get_json, get_json_many, get_read_redis, prefer_replica
+from core.keys import PREDICTIONS_INDEX, eval_key, prediction_key
+from core.archive import read_archived_predictions
 
 router = APIRouter()
 
 
-@router.get("/latest", response_model=PredictionResponse)
+@router.get("/latest", response_model=PredictionResponse, dependencies=[Depends(prefer_replica)])
 async def get_latest_prediction():
-    r = await get_redis()
-    latest = await r.zrevrange("predictions:index", 0, 0)
+    r = await get_read_redis()
+    latest = await r.zrevrange(PREDICTIONS_INDEX, 0, 0)
 
     if latest:
         pred_id = latest[0]
-        pred = await get_json(f"prediction:{pred_id}")
+        pred = await get_json(prediction_key(pred_id))
         if pred:
             return PredictionResponse(
                 prediction_id=pred["prediction_id"],
@@ -52,23 +54,49 @@ async def get_latest_prediction():
     )
 
 
-@router.get("/history", response_model=PredictionHistoryResponse)
+@router.get("/history", response_model=PredictionHistoryResponse, dependencies=[Depends(prefer_replica)])
 async def get_prediction_history(limit: int = 50):
-    r = await get_redis()
-    pred_ids = await r.zrevrange("predictions:index", 0, limit - 1)
+    r = await get_read_redis()
+    pred_ids = await r.zrevrange(PREDICTIONS_INDEX, 0, limit - 1)
+
+    # Project only the fields the history view renders
+    preds = await get_json_many(
+        [prediction_key(pid) for pid in pred_ids],
+        fields={
+            "prediction_id": "prediction_id",
+            "cycle": "cycle",
+            "timestamp": "timestamp",
+            "predicted_price_1h": "predictions[0].predicted_price",
+        },
+    )
+    evals = await get_json_many(
+        [eval_key(pid) for pid in pred_ids],
+        fields=["actual_price", "absolute_error", "direction_correct"],
+    )
 
     items = []
-    for pred_id in pred_ids:
-        pred = await get_json(f"prediction:{pred_id}")
-        ev = await get_json(f"eval:{pred_id}")
+    for pred, ev in zip(preds, evals):
+        if pred and pred["prediction_id"]:
+            items.append(PredictionHistoryItem(
+                prediction_id=pred["prediction_id"],
+                cycle=pred["cycle"] or 0,
+                timestamp=pred["timestamp"],
+                predicted_price_1h=pred["predicted_price_1h"] or 0.0,
+                actual_price_1h=ev["actual_price"] if ev else None,
+                error_1h=ev["absolute_error"] if ev else None,
+                direction_correct=ev["direction_correct"] if ev else None,
+            ))
 
-        if pred:
-            pred_1h = pred["predictions"][0] if pred.get("predictions") else {}
+    # Older rows have been archived out of Redis; continue from the archive
+    if len(pred_ids) < limit:
+        for pred, ev in await read_archived_predictions(limit - len(pred_ids)):
+            if pred["prediction_id"] in pred_ids:
+                continue
             items.append(PredictionHistoryItem(
                 prediction_id=pred["prediction_id"],
                 cycle=pred.get("cycle", 0),
                 timestamp=pred["timestamp"],
-                predicted_price_1h=pred_1h.get("predicted_price", 0.0),
+                predicted_price_1h=(pred.get("predictions") or [{}])[0].get("predicted_price", 0.0),
                 actual_price_1h=ev.get("actual_price") if ev else None,
                 error_1h=ev.get("absolute_error") if ev else None,
                 direction_correct=ev.get("direction_correct") if ev else None,
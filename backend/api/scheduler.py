@@ -1,16 +1,17 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from schemas.scheduler import (
     SchedulerResponse,
     PriceWindow,
     CumulativeSavings,
 )
 from scheduler.optimizer import SchedulerOptimizer
+from core.redis_client import prefer_replica
 
 router = APIRouter()
 _optimizer = SchedulerOptimizer()
 
 
-@router.get("/windows", response_model=SchedulerResponse)
+@router.get("/windows", response_model=SchedulerResponse, dependencies=[Depends(prefer_replica)])
 async def get_scheduler_windows(hours: int = 48):
     result = await _optimizer.get_optimal_windows(hours_ahead=hours)
 
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, BackgroundTasks
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, BackgroundTasks, Depends
 from datetime import datetime, timezone
 from schemas.signals import (
     Signal,
@@ -9,23 +11,14 @@ from schemas.signals import (
     SourcesResponse,
     SourceStatus,
 )
-from core.redis_client import get_latest_signals as redis_get_latest, get_signal_history as redis_get_history
-from ingestion.aws_spot import AWSSpotSource
-from ingestion.eia_electricity import EIAElectricitySource
+from core.redis_client import get_latest_signals as redis_get_latest, get_signal_history as redis_get_history, prefer_replica
+from ingestion.health import get_health
+from ingestion.scheduler import get_scheduler
 
 router = APIRouter()
 
-# Source registry
-_sources = {
-    "aws_spot": {"name": "AWS Spot Pricing", "class": AWSSpotSource},
-    "eia_electricity": {"name": "EIA Electricity", "class": EIAElectricitySource},
-    "weather": {"name": "OpenWeatherMap", "class": None},
-    "gpu_pricing": {"name": "GPU Cloud Pricing", "class": None},
-    "news": {"name": "News Events", "class": None},
-}
 
-
-@router.get("/latest", response_model=SignalsLatestResponse)
+@router.get("/latest", response_model=SignalsLatestResponse, dependencies=[Depends(prefer_replica)])
 async def get_latest_signals():
     now = datetime.now(timezone.utc)
     signals_data = await redis_get_latest()
@@ -57,9 +50,16 @@ async def get_latest_signals():
     return SignalsLatestResponse(timestamp=now, signals=signals)
 
 
-@router.get("/history", response_model=SignalHistoryResponse)
-async def get_signal_history(source: str = "aws_spot", name: str = "p3.2xlarge", hours: int = 168):
-    data = await redis_get_history(source, name, hours)
+@router.get("/history", response_model=SignalHistoryResponse, dependencies=[Depends(prefer_replica)])
+async def get_signal_history(
+    source: str = "aws_spot",
+    name: str = "p3.2xlarge",
+    hours: int = 168,
+    bucket: Literal["1h", "1d"] | None = None,
+    aggregation: Literal["avg", "min", "max"] = "avg",
+):
+    """Raw samples by default; pass ``bucket`` to read the server-side rollups."""
+    data = await redis_get_history(source, name, hours, bucket=bucket, aggregation=aggregation)
     return SignalHistoryResponse(
         source=SignalSource(source),
         name=name,
@@ -69,39 +69,45 @@ async def get_signal_history(source: str = "aws_spot", name: str = "p3.2xlarge",
 
 @router.get("/sources", response_model=SourcesResponse)
 async def get_sources():
+    """Every registered source with its last ingest and upstream health.
+
+    ``error`` means the circuit breaker is open or the last upstream call
+    or ingest failed;
+    ``inactive`` means the source has never ingested successfully.
+    """
+    scheduler = get_scheduler()
     sources = []
-    for src_id, info in _sources.items():
+    for src_id, source in scheduler.sources.items():
+        health, ingest = await asyncio.gather(
+            get_health(src_id), scheduler.get_status(src_id)
+        )
+        last_update = ingest.get("last_success") or health["last_success"]
+        if health["circuit"] == "open" or health["consecutive_failures"] or ingest.get("last_error"):
+            status = "error"
+        elif last_update:
+            status = "active"
+        else:
+            status = "inactive"
         sources.append(SourceStatus(
             id=src_id,
-            name=info["name"],
-            status="active" if info["class"] is not None else "inactive",
-            last_update=datetime.now(timezone.utc) if info["class"] is not None else None,
+            name=source.source_name,
+            status=status,
+            last_update=last_update,
+            circuit=health["circuit"],
+            last_error=health["last_error"] or ingest.get("last_error") or None,
+            last_error_at=health["last_error_at"],
+            latency_ms=health["last_latency_ms"] or (
+                int(ingest["last_duration_ms"]) if ingest.get("last_duration_ms") else None
+            ),
+            success_count=health["successes"],
+            error_count=health["errors"],
+            rejected_count=health["rejected"],
         ))
     return SourcesResponse(sources=sources)
 
 
 @router.post("/ingest")
 async def trigger_ingestion(background_tasks: BackgroundTasks, source: str | None = None):
-    """Manually trigger signal ingestion."""
-    async def _ingest():
-        sources_to_run = []
-        if source:
-            info = _sources.get(source)
-            if info and info["class"]:
-                sources_to_run.append(info["class"]())
-        else:
-            for info in _sources.values():
-                if info["class"]:
-                    sources_to_run.append(info["class"]())
-
-        results = {}
-        for src in sources_to_run:
-            try:
-                data = await src.ingest()
-                results[src.source_id] = len(data)
-            except Exception as e:
-                results[src.source_id] = f"error: {e}"
-        return results
-
-    background_tasks.add_task(_ingest)
+    """Manually trigger signal ingestion (concurrent, with per-source deadlines)."""
+    background_tasks.add_task(get_scheduler().run_all, [source] if source else None)
     return {"status": "ingestion_started", "source": source or "all"}
@@ -0,0 +1,221 @@
+"""Bulk-load historical signals into Redis TimeSeries.
+
+Seeds the ``signal:*`` series (and their rollups) from a source's
+``fetch_history`` or from a dataset in ``data/manifest.json``, one time
+window at a time, in large chunked TS.MADD pipelines. Dataset rows go
+through the source that owns the dataset (its ``history_dataset``), so
+they land in the same series, with the same labels, as live ingestion.
+
+Progress is checkpointed per target and range in
+``backfill:checkpoint:{target}:{start_ms}-{end_ms}``, so re-running an
+interrupted command picks up after the last finished window, and a run
+over a different range starts fresh. A window whose fetch fails stops
+that target without moving its checkpoint, so the rerun fetches it again.
+
+``all`` covers the sources whose history is real. Weather, news and GPU
+pricing history is simulated; those need ``--include-synthetic``.
+
+    python backfill.py aws_spot --start 2025-08-01 --end 2025-09-01
+    python backfill.py all --start 2025-08-01 --end 2025-08-08
+    python backfill.py dataset:electricity --start 2025-08-01 --end 2025-09-01
+
+Samples older than a series' retention (30 days behind its newest sample
+by default) are rejected by Redis; pass ``--retention-days`` when seeding
+a fresh environment with older history.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Any
+
+from dotenv import load_dotenv
+
+load_dotenv("../.env")
+
+from core.http_client import close_http_client
+from core.keys import meta
+from core.redis_client import close_redis, get_redis, ts_add_many
+from ingestion.base_source import BaseSignalSource
+from ingestion.datasets import first_per_hour, iter_rows, load_manifest
+from ingestion.scheduler import get_scheduler
+
+BACKFILL_CHUNK_SIZE = 5000
+DEFAULT_WINDOW_HOURS = 24
+
+
+def checkpoint_key(target: str, start: datetime, end: datetime) -> str:
+    return meta(f"backfill:checkpoint:{target}:{_ms(start)}-{_ms(end)}")
+
+
+def _ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def _parse_date(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+async def _fetch_points(target: str, start: datetime, end: datetime) -> list[dict[str, Any]]:
+    """TimeSeries points for one window of ``target``."""
+    if target.startswith("dataset:"):
+        return await _dataset_points(target.split(":", 1)[1], start, end)
+    source = get_scheduler().sources[target]
+    return source.to_points(await source.fetch_history(start, end))
+
+
+def dataset_owner(name: str) -> BaseSignalSource | None:
+    """The source whose ``history_item`` maps rows of dataset ``name``."""
+    for source in get_scheduler().sources.values():
+        if source.history_dataset == name:
+            return source
+    return None
+
+
+async def _dataset_points(name: str, start: datetime, end: datetime) -> list[dict[str, Any]]:
+    """The first row per key per hour of dataset ``name``, mapped by its
+    owning source into that source's series."""
+    source = dataset_owner(name)
+
+    def load() -> list[dict[str, Any]]:
+        rows = first_per_hour(iter_rows(name, _ms(start), _ms(end)))
+        return source.to_points([source.history_item(*row) for row in rows])
+
+    return await asyncio.to_thread(load)
+
+
+async def backfill(
+    target: str,
+    start: datetime,
+    end: datetime,
+    window: timedelta = timedelta(hours=DEFAULT_WINDOW_HOURS),
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+    retention_days: int | None = None,
+    resume: bool = True,
+) -> dict[str, int]:
+    """Backfill ``target`` (a source id or ``dataset:{name}``) over ``[start, end)``.
+
+    ``complete`` in the returned totals is 0 if a fetch failed and the run
+    stopped early.
+    """
+    r = await get_redis()
+    key = checkpoint_key(target, start, end)
+    if resume:
+        last = int((await r.hget(key, "last_ts")) or 0)
+        if last > _ms(start):
+            start = min(datetime.fromtimestamp(last / 1000, tz=timezone.utc), end)
+            print(f"[backfill] {target}: resuming from {start.isoformat()}")
+
+    totals = {"points": 0, "written": 0, "failed": 0, "complete": 1}
+    span_ms = max(1, _ms(end) - _ms(start))
+    origin = start
+    started = time.monotonic()
+    cursor = start
+    while cursor < end:
+        window_end = min(cursor + window, end)
+        try:
+            points = await _fetch_points(target, cursor, window_end)
+        except Exception as e:
+            print(
+                f"[backfill] {target} {cursor:%Y-%m-%d %H:%M} -> {window_end:%Y-%m-%d %H:%M}: "
+                f"fetch failed ({e}); stopping, rerun to resume from here"
+            )
+            totals["complete"] = 0
+            break
+        # Oldest first, so the rollup compactions see samples in order
+        points.sort(key=lambda p: p["timestamp"])
+        if retention_days is not None:
+            for p in points:
+                p["retention"] = retention_days * 86400 * 1000
+        report = await ts_add_many(points, chunk_size=chunk_size)
+
+        totals["points"] += len(points)
+        totals["written"] += report["written"]
+        totals["failed"] += len(report["failed"])
+        await r.hset(key, mapping={
+            "last_ts": _ms(window_end),
+            "written": totals["written"],
+            "failed": totals["failed"],
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+        elapsed = time.monotonic() - started
+        pct = (_ms(window_end) - _ms(origin)) / span_ms * 100
+        print(
+            f"[backfill] {target} {cursor:%Y-%m-%d %H:%M} -> {window_end:%Y-%m-%d %H:%M}: "
+            f"{report['written']}/{len(points)} written ({pct:.1f}%, "
+            f"{totals['written'] / max(elapsed, 1e-9):.0f} samples/s)"
+        )
+        if report["failed"]:
+            print(f"[backfill] {target}: first rejection: {report['failed'][0]['error']}")
+        cursor = window_end
+
+    return totals
+
+
+async def main() -> None:
+    targets = list(get_scheduler().sources)
+    parser = argparse.ArgumentParser(description="Backfill historical signals into Redis.")
+    parser.add_argument(
+        "target",
+        help=f"source id ({', '.join(targets)}), 'all', or dataset:<name> from data/manifest.json",
+    )
+    parser.add_argument("--start", required=True, help="ISO date/time (UTC if no offset)")
+    parser.add_argument("--end", required=True, help="ISO date/time, exclusive")
+    parser.add_argument("--window-hours", type=int, default=DEFAULT_WINDOW_HOURS,
+                        help="history fetched and written per step")
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE,
+                        help="samples per TS.MADD")
+    parser.add_argument("--retention-days", type=int, default=None,
+                        help="retention for series created by this run (0 = keep forever)")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the checkpoint and start from --start")
+    parser.add_argument("--include-synthetic", action="store_true",
+                        help="allow sources whose history is simulated (weather, news, gpu_pricing)")
+    args = parser.parse_args()
+
+    sources = get_scheduler().sources
+    if args.target == "all":
+        chosen = [t for t in targets if args.include_synthetic or not sources[t].synthetic_history]
+    else:
+        chosen = [args.target]
+    for target in chosen:
+        if target.startswith("dataset:"):
+            name = target.split(":", 1)[1]
+            if name not in load_manifest():
+                parser.error(f"no dataset {name!r} in data/manifest.json")
+            if dataset_owner(name) is None:
+                parser.error(f"no source maps dataset {name!r} (history_dataset)")
+        elif target not in targets:
+            parser.error(f"unknown target {target!r}")
+        elif sources[target].synthetic_history and not args.include_synthetic:
+            parser.error(
+                f"{target} history is simulated; pass --include-synthetic to write it anyway"
+            )
+    start, end = _parse_date(args.start), _parse_date(args.end)
+    incomplete = []
+    try:
+        for target in chosen:
+            totals = await backfill(
+                target, start, end,
+                window=timedelta(hours=args.window_hours),
+                chunk_size=args.chunk_size,
+                retention_days=args.retention_days,
+                resume=not args.restart,
+            )
+            if totals["complete"]:
+                print(f"[backfill] {target} done: {totals}")
+            else:
+                print(f"[backfill] {target} incomplete: {totals}")
+                incomplete.append(target)
+    finally:
+        await close_http_client()
+        await close_redis()
+    if incomplete:
+        raise SystemExit(f"[backfill] incomplete: {', '.join(incomplete)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
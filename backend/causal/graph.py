@@ -1,9 +1,22 @@
+import copy
+import json
 from datetime import datetime, timezone
-from typing import Any
-from core.redis_client import store_json, get_json
+from typing import Any, Callable
+from core.redis_client import get_json, get_redis, get_read_redis, commit_json_changes
+from core.keys import GRAPH
 from causal.factors import get_initial_graph
 
-GRAPH_KEY = "causal_graph"
+GRAPH_KEY = GRAPH
+COMMIT_RETRIES = 5
+
+# Process-wide copy of the last graph read, keyed by its version. Every
+# write bumps the version (see CausalGraph.commit), so a matching version
+# probe means the cached document is current.
+_cache: dict[str, Any] = {"version": None, "graph": None}
+
+
+class GraphConflictError(RuntimeError):
+    """Raised when a graph commit keeps losing to concurrent writers."""
 
 
 class CausalGraph:
@@ -11,16 +24,106 @@ class CausalGraph:
 
     Nodes represent signals/factors and targets.
     Edges represent causal relationships with learned weights.
+
+    Every write goes through ``commit``: a version-checked compare-and-swap
+    that applies only the changed edges and bumps ``version`` atomically.
     """
 
     async def get_graph(self) -> dict[str, Any]:
-        """Load the causal graph from Redis, or create the initial one."""
+        """Load the causal graph from Redis, or create the initial one.
+
+        Probes only ``$.version`` and returns the cached graph when it is
+        unchanged. The returned dict is shared: treat it as read-only.
+        """
+        version = await self._probe_version()
+        if version is not None and version == _cache["version"]:
+            return _cache["graph"]
+
         graph = await get_json(GRAPH_KEY)
         if graph is None:
-            graph = get_initial_graph()
-            await store_json(GRAPH_KEY, graph)
+            # A lagging or unreachable replica reads as missing too, so
+            # only the primary decides whether the graph needs creating
+            graph = await self._load_or_create()
+        self._remember(graph)
         return graph
 
+    async def _load_or_create(self) -> dict[str, Any]:
+        """Read the graph from the primary, creating the initial one if absent."""
+        r = await get_redis()
+        raw = await r.execute_command("JSON.GET", GRAPH_KEY)
+        if raw:
+            return json.loads(raw)
+        graph = get_initial_graph()
+        # NX: a concurrent creator wins and its graph is read back instead
+        if await r.execute_command("JSON.SET", GRAPH_KEY, "$", json.dumps(graph), "NX"):
+            return graph
+        return json.loads(await r.execute_command("JSON.GET", GRAPH_KEY))
+
+    async def _probe_version(self) -> int | None:
+        """Current graph version, or None if the graph doesn't exist."""
+        r = await get_read_redis()
+        try:
+            raw = await r.execute_command("JSON.GET", GRAPH_KEY, "$.version")
+        except Exception:
+            return None
+        if not raw:
+            return None
+        found = json.loads(raw)
+        return found[0] if found else 0
+
+    @staticmethod
+    def _remember(graph: dict[str, Any]) -> None:
+        _cache["version"] = graph.get("version", 0)
+        _cache["graph"] = graph
+
+    async def commit(
+        self,
+        base_version: int,
+        edges: dict[str, dict[str, Any]],
+        pruned: list[str] | None = None,
+        last_updated: str | None = None,
+    ) -> int | None:
+        """Write changed/added ``edges`` and remove ``pruned`` edge keys.
+
+        Succeeds only if the stored graph is still at ``base_version``.
+        Returns the new version, or ``None`` on conflict.
+        """
+        sets: dict[str, Any] = {f"edges['{k}']": edge for k, edge in edges.items()}
+        sets["last_updated"] = last_updated or datetime.now(timezone.utc).isoformat()
+        return await commit_json_changes(
+            GRAPH_KEY,
+            base_version,
+            sets,
+            [f"edges['{k}']" for k in pruned or []],
+        )
+
+    async def apply(
+        self,
+        plan: Callable[[dict[str, Any]], tuple[dict[str, dict[str, Any]], list[str]]],
+    ) -> tuple[dict[str, Any], int]:
+        """Run ``plan`` against a fresh copy of the graph and commit its result.
+
+        ``plan`` mutates the copy and returns ``(changed_edges, pruned_keys)``.
+        It is re-run on a freshly read graph whenever another writer commits
+        first. Returns the updated graph and its new version.
+        """
+        for _ in range(COMMIT_RETRIES):
+            graph = copy.deepcopy(await self.get_graph())
+            base_version = graph.get("version", 0)
+            changed, pruned = plan(graph)
+            graph["last_updated"] = datetime.now(timezone.utc).isoformat()
+            new_version = await self.commit(
+                base_version, changed, pruned, last_updated=graph["last_updated"]
+            )
+            if new_version is not None:
+                # The stored graph is now exactly our planned copy
+                graph["version"] = new_version
+                self._remember(graph)
+                return graph, new_version
+        raise GraphConflictError(
+            f"Causal graph commit lost to concurrent writers {COMMIT_RETRIES} times"
+        )
+
     async def update_edge(
         self,
         from_id: str,
@@ -30,30 +133,28 @@ class CausalGraph:
         new_direction: str | None = None,
     ) -> dict[str, Any]:
         """Update an edge's weight (and optionally confidence/direction)."""
-        graph = await self.get_graph()
         edge_key = f"{from_id}->{to_id}"
 
-        if edge_key in graph["edges"]:
-            edge = graph["edges"][edge_key]
-            edge["weight"] = max(0.0, min(1.0, new_weight))
-            edge["update_count"] += 1
-            edge["last_updated"] = datetime.now(timezone.utc).isoformat()
-            if new_confidence is not None:
-                edge["confidence"] = max(0.0, min(1.0, new_confidence))
-            if new_direction is not None:
-                edge["direction"] = new_direction
-
-        graph["last_updated"] = datetime.now(timezone.utc).isoformat()
-        await store_json(GRAPH_KEY, graph)
+        def plan(graph):
+            edge = graph["edges"].get(edge_key)
+            if edge is None:
+                return {}, []
+            apply_edge_update(edge, new_weight, new_confidence, new_direction)
+            return {edge_key: edge}, []
+
+        graph, _ = await self.apply(plan)
         return graph
 
     async def prune_edge(self, from_id: str, to_id: str) -> dict[str, Any]:
         """Remove an edge that has become irrelevant."""
-        graph = await self.get_graph()
         edge_key = f"{from_id}->{to_id}"
-        graph["edges"].pop(edge_key, None)
-        graph["last_updated"] = datetime.now(timezone.utc).isoformat()
-        await store_json(GRAPH_KEY, graph)
+
+        def plan(graph):
+            if graph["edges"].pop(edge_key, None) is None:
+                return {}, []
+            return {}, [edge_key]
+
+        graph, _ = await self.apply(plan)
         return graph
 
     async def add_edge(
@@ -64,10 +165,11 @@ class CausalGraph:
         direction: str = "positive",
     ) -> dict[str, Any]:
         """Add a new edge (discovered correlation)."""
-        graph = await self.get_graph()
         edge_key = f"{from_id}->{to_id}"
 
-        if edge_key not in graph["edges"]:
+        def plan(graph):
+            if edge_key in graph["edges"]:
+                return {}, []
             graph["edges"][edge_key] = {
                 "from": from_id,
                 "to": to_id,
@@ -77,18 +179,15 @@ class CausalGraph:
                 "update_count": 0,
                 "last_updated": datetime.now(timezone.utc).isoformat(),
             }
+            return {edge_key: graph["edges"][edge_key]}, []
 
-        graph["last_updated"] = datetime.now(timezone.utc).isoformat()
-        await store_json(GRAPH_KEY, graph)
+        graph, _ = await self.apply(plan)
         return graph
 
     async def increment_version(self) -> int:
-        """Increment the graph version (called after learning updates)."""
-        graph = await self.get_graph()
-        graph["version"] = graph.get("version", 0) + 1
-        graph["last_updated"] = datetime.now(timezone.utc).isoformat()
-        await store_json(GRAPH_KEY, graph)
-        return graph["version"]
+        """Increment the graph version without changing any edges."""
+        _, version = await self.apply(lambda graph: ({}, []))
+        return version
 
     async def get_edges_for_target(self, target_id: str) -> list[dict[str, Any]]:
         """Get all edges pointing to a specific target."""
@@ -102,3 +201,19 @@ class CausalGraph:
         """Get the top N factors by weight for a target."""
         edges = await self.get_edges_for_target(target_id)
         return sorted(edges, key=lambda e: e["weight"], reverse=True)[:n]
+
+
+def apply_edge_update(
+    edge: dict[str, Any],
+    new_weight: float,
+    new_confidence: float | None = None,
+    new_direction: str | None = None,
+) -> None:
+    """Apply a weight (and optional confidence/direction) update in place."""
+    edge["weight"] = max(0.0, min(1.0, new_weight))
+    edge["update_count"] = edge.get("update_count", 0) + 1
+    edge["last_updated"] = datetime.now(timezone.utc).isoformat()
+    if new_confidence is not None:
+        edge["confidence"] = max(0.0, min(1.0, new_confidence))
+    if new_direction is not None:
+        edge["direction"] = new_direction
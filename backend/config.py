@@ -5,6 +5,12 @@ from functools import lru_cache
 class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379"
+    # Connect to a Redis Cluster and hash-tag keys (see core/keys.py)
+    redis_cluster: bool = False
+    # Comma-separated replica URLs for read-only dashboard routes
+    redis_read_urls: str = ""
+    # "redis" (Redis Stack) or "memory" (in-process, no persistence)
+    storage_backend: str = "redis"
 
     # LLM (via W&B Inference — OpenAI-compatible API)
     # Uses wandb_api_key for authentication
@@ -27,6 +33,26 @@ class Settings(BaseSettings):
     # W&B
     wandb_api_key: str = ""
 
+    # Run every signal source on its own cadence in the background
+    ingest_scheduler: bool = True
+
+    # Disk cache for ingestion HTTP responses (defaults to backend/data/http_cache)
+    http_cache: bool = True
+    http_cache_dir: str = ""
+    # Entries unused for longer, or the oldest beyond the size cap, are swept
+    http_cache_max_age_s: int = 7 * 86400
+    http_cache_max_mb: int = 512
+
+    # Event logs (learning:log, news:headlines): "list" or "stream"
+    event_log_backend: str = "list"
+
+    # Retention: prediction/eval/cycle docs older than this move to the
+    # on-disk archive (0 disables archival)
+    archive_after_days: int = 30
+    archive_interval_s: int = 3600
+    # Defaults to backend/data/archive
+    archive_dir: str = ""
+
     # App
     app_env: str = "development"
     log_level: str = "INFO"
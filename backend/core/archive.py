@@ -0,0 +1,137 @@
+"""Retention for prediction, evaluation and cycle documents.
+
+Documents older than ``ARCHIVE_AFTER_DAYS`` are moved out of Redis into
+append-only gzip JSONL files, one per UTC day (``YYYY-MM-DD.jsonl.gz``),
+and dropped from ``predictions:index`` / ``evaluations:index``. History
+reads fall through to the archive once Redis runs out of rows.
+"""
+
+import asyncio
+import gzip
+import json
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Any
+
+from config import get_settings
+from core.keys import EVALUATIONS_INDEX, PREDICTIONS_INDEX, cycle_key, eval_key, prediction_key
+from core.redis_client import get_redis, get_json_many
+
+ARCHIVE_BATCH = 500
+DEFAULT_ARCHIVE_DIR = Path(__file__).parent.parent / "data" / "archive"
+
+
+def _archive_dir() -> Path:
+    configured = get_settings().archive_dir
+    return Path(configured) if configured else DEFAULT_ARCHIVE_DIR
+
+
+def _append_records(day: str, records: list[dict[str, Any]]) -> None:
+    """Append records to a day file; each call adds one gzip member."""
+    directory = _archive_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    with gzip.open(directory / f"{day}.jsonl.gz", "at", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+async def archive_old_documents(older_than_days: int | None = None) -> dict[str, int]:
+    """Move documents older than the retention window to the archive.
+
+    Files are written before keys are deleted, so a crash can duplicate a
+    record in the archive but never lose one; readers dedupe by id.
+    """
+    days = older_than_days if older_than_days is not None else get_settings().archive_after_days
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp()
+    r = await get_redis()
+    counts = {"prediction": 0, "eval": 0, "cycle": 0}
+
+    while True:
+        pred_ids = await r.zrangebyscore(PREDICTIONS_INDEX, "-inf", cutoff, start=0, num=ARCHIVE_BATCH)
+        if not pred_ids:
+            break
+
+        preds = await get_json_many([prediction_key(pid) for pid in pred_ids])
+        evals = await get_json_many([eval_key(pid) for pid in pred_ids])
+        cycle_numbers = sorted({p["cycle"] for p in preds if p and p.get("cycle")})
+        cycles = await get_json_many([cycle_key(c) for c in cycle_numbers])
+
+        by_day: dict[str, list[dict[str, Any]]] = {}
+        cycle_day: dict[int, str] = {}
+        for pid, pred, ev in zip(pred_ids, preds, evals):
+            if pred is None:
+                continue
+            day = pred.get("timestamp", "")[:10] or "unknown"
+            by_day.setdefault(day, []).append({"kind": "prediction", "id": pid, "doc": pred})
+            if ev is not None:
+                by_day[day].append({"kind": "eval", "id": pid, "doc": ev})
+            cycle_day.setdefault(pred.get("cycle", 0), day)
+        for number, cycle in zip(cycle_numbers, cycles):
+            if cycle is not None:
+                by_day[cycle_day[number]].append({"kind": "cycle", "id": str(number), "doc": cycle})
+
+        for day, records in by_day.items():
+            await asyncio.to_thread(_append_records, day, records)
+            for record in records:
+                counts[record["kind"]] += 1
+
+        pipe = r.pipeline(transaction=False)
+        # One DEL per key: a multi-key DEL may not cross cluster slots
+        for pid in pred_ids:
+            pipe.delete(prediction_key(pid))
+            pipe.delete(eval_key(pid))
+        for c in cycle_numbers:
+            pipe.delete(cycle_key(c))
+        pipe.zrem(PREDICTIONS_INDEX, *pred_ids)
+        pipe.zrem(EVALUATIONS_INDEX, *pred_ids)
+        await pipe.execute()
+
+    return counts
+
+
+def _read_archive(limit: int, skip: int) -> list[tuple[dict[str, Any], dict[str, Any] | None]]:
+    """Newest-first (prediction, evaluation) pairs from the day files."""
+    directory = _archive_dir()
+    if not directory.exists() or limit <= 0:
+        return []
+
+    pairs: list[tuple[dict[str, Any], dict[str, Any] | None]] = []
+    for path in sorted(directory.glob("*.jsonl.gz"), reverse=True):
+        preds: dict[str, dict[str, Any]] = {}
+        evals: dict[str, dict[str, Any]] = {}
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["kind"] == "prediction":
+                    preds[record["id"]] = record["doc"]
+                elif record["kind"] == "eval":
+                    evals[record["id"]] = record["doc"]
+
+        for pid, pred in sorted(preds.items(), key=lambda x: x[1].get("timestamp", ""), reverse=True):
+            if skip:
+                skip -= 1
+                continue
+            pairs.append((pred, evals.get(pid)))
+            if len(pairs) >= limit:
+                return pairs
+    return pairs
+
+
+async def read_archived_predictions(
+    limit: int, skip: int = 0
+) -> list[tuple[dict[str, Any], dict[str, Any] | None]]:
+    """Archived (prediction, evaluation) pairs, newest first, off the event loop."""
+    return await asyncio.to_thread(_read_archive, limit, skip)
+
+
+async def run_archival_loop() -> None:
+    """Archive on a fixed interval for as long as the app runs."""
+    settings = get_settings()
+    while True:
+        try:
+            counts = await archive_old_documents()
+            if any(counts.values()):
+                print(f"[archive] moved {counts} to {_archive_dir()}")
+        except Exception as e:
+            print(f"[archive] error: {e}")
+        await asyncio.sleep(settings.archive_interval_s)
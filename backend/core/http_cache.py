@@ -0,0 +1,349 @@
+"""Disk-backed conditional HTTP cache for ingestion requests.
+
+Only GET requests that opt in with a ``cache_ttl`` request extension are
+cached (``client.get(url, extensions={"cache_ttl": 900})``), so sources set
+their own freshness and LLM traffic passes straight through.
+
+- not cached yet: fetched, with the body streamed to the caller as it is
+  saved; if the caller stops reading early, the rest is saved in the
+  background
+- younger than ``cache_ttl``: served from disk, no request
+- stale, within the stale-while-revalidate window: served from disk while
+  a background request revalidates with If-None-Match / If-Modified-Since
+- older: revalidated inline, but if upstream errors or takes longer than
+  ``REVALIDATE_TIMEOUT_S`` the stale copy is served (stale-if-error)
+
+Entries are a ``{hash}.json`` metadata file next to a ``{hash}.body`` file
+holding the raw (still content-encoded) body, written atomically. Bodies
+stream from disk in chunks, so large documents never sit in memory.
+
+After writes (at most every ``SWEEP_INTERVAL_S``) entries not stored or
+revalidated within ``max_age_s`` are deleted, then the oldest ones until
+the cache fits in ``max_bytes``. URLs that never repeat (e.g. ones with a
+moving time range) can't hit, so sources shouldn't opt them in.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# Serve stale copies for up to this multiple of the TTL while revalidating
+STALE_WHILE_REVALIDATE_FACTOR = 1.0
+REVALIDATE_TIMEOUT_S = 5.0
+CHUNK_SIZE = 65536
+DEFAULT_MAX_AGE_S = 7 * 86400
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+SWEEP_INTERVAL_S = 300
+# Partial writes and bodies without metadata older than this are removed
+ORPHAN_AGE_S = 3600
+
+
+class _FileStream(httpx.AsyncByteStream):
+    """Cached body read from disk off the event loop.
+
+    The file is opened up front, so a concurrent refresh replacing the
+    body can't change what an already-returned response reads.
+    """
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+
+    async def __aiter__(self):
+        try:
+            while chunk := await asyncio.to_thread(self._file.read, CHUNK_SIZE):
+                yield chunk
+        finally:
+            self._file.close()
+
+    async def aclose(self) -> None:
+        self._file.close()
+
+
+class _TeeStream(httpx.AsyncByteStream):
+    """Upstream body passed through to the caller while written to disk.
+
+    Closing it before the end hands the remaining download to a background
+    task, so an early-stopping reader still leaves a complete entry.
+    """
+
+    def __init__(self, cache: "CachingTransport", key: str, entry: dict[str, Any],
+                 stream: httpx.AsyncByteStream):
+        self._cache = cache
+        self._key = key
+        self._entry = entry
+        self._stream = stream
+        # One iterator, shared by the reader and the background drain
+        self._chunks = stream.__aiter__()
+        fd, self._tmp = tempfile.mkstemp(dir=cache._dir, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+        self._closed = False
+
+    async def __aiter__(self):
+        while (chunk := await self._next()) is not None:
+            yield chunk
+
+    async def _next(self) -> bytes | None:
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            await self._finish()
+            return None
+        except BaseException:
+            await self._discard()
+            raise
+        await asyncio.to_thread(self._file.write, chunk)
+        return chunk
+
+    async def _finish(self) -> None:
+        self._file.close()
+        os.replace(self._tmp, self._cache._dir / f"{self._key}.body")
+        await self._close_upstream()
+        await self._cache._store_meta(self._key, {**self._entry, "stored_at": time.time()})
+
+    async def _discard(self) -> None:
+        self._file.close()
+        try:
+            os.unlink(self._tmp)
+        except FileNotFoundError:
+            pass
+        await self._close_upstream()
+
+    async def _close_upstream(self) -> None:
+        if not self._closed:
+            self._closed = True
+            await self._stream.aclose()
+
+    async def _drain(self) -> None:
+        try:
+            while await self._next() is not None:
+                pass
+        except asyncio.CancelledError:
+            await self._discard()
+            raise
+        except Exception as e:
+            print(f"[http-cache] background download failed for {self._entry['url']}: {e}")
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._cache._background(self)
+
+
+class _Uncacheable(Exception):
+    """Upstream answered with something other than 200/304."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Wraps a transport with the on-disk cache described above."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        cache_dir: Path,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self._transport = transport
+        self._dir = cache_dir
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_age_s = max_age_s
+        self._max_bytes = max_bytes
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Background downloads of early-closed MISS bodies
+        self._drains: dict[asyncio.Task, _TeeStream] = {}
+        self._last_sweep = 0.0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        ttl = request.extensions.get("cache_ttl")
+        if ttl is None or request.method != "GET":
+            return await self._transport.handle_async_request(request)
+
+        key = hashlib.sha256(str(request.url).encode()).hexdigest()
+        entry = await asyncio.to_thread(self._load, key)
+        if entry is None:
+            response = await self._transport.handle_async_request(request)
+            if response.status_code != 200:
+                return response
+            entry = self._entry(request, response)
+            return httpx.Response(
+                200,
+                headers=[*entry["headers"], ["x-cache", "MISS"]],
+                stream=_TeeStream(self, key, entry, response.stream),
+                extensions=response.extensions,
+            )
+
+        age = time.time() - entry["stored_at"]
+        if age < ttl:
+            return self._respond(key, entry, "HIT")
+
+        task = self._revalidate(request, key, entry)
+        if age < ttl * (1 + STALE_WHILE_REVALIDATE_FACTOR):
+            return self._respond(key, entry, "STALE")
+        try:
+            entry = await asyncio.wait_for(asyncio.shield(task), REVALIDATE_TIMEOUT_S)
+        except Exception as e:
+            print(f"[http-cache] serving stale {request.url.host}: {type(e).__name__} {e}")
+            return self._respond(key, entry, "STALE")
+        return self._respond(key, entry, "REVALIDATED")
+
+    def _revalidate(self, request: httpx.Request, key: str, entry: dict[str, Any]) -> asyncio.Task:
+        """One revalidation per entry at a time, shared by all waiters."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(request, key, entry))
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if not t.cancelled() and t.exception() is not None:
+                    print(f"[http-cache] revalidation failed for {request.url.host}: {t.exception()}")
+
+            task.add_done_callback(_done)
+        return task
+
+    async def _refresh(
+        self, request: httpx.Request, key: str, entry: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        """Fetch (conditionally, if cached) and store. Returns the new entry."""
+        headers = httpx.Headers(request.headers)
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        upstream = httpx.Request(
+            "GET", request.url, headers=headers, extensions=request.extensions
+        )
+        response = await self._transport.handle_async_request(upstream)
+
+        try:
+            if response.status_code == 304 and entry:
+                entry = {**entry, "stored_at": time.time()}
+                await asyncio.to_thread(self._write_meta, key, entry)
+                return entry
+            if response.status_code != 200:
+                body = b"".join([chunk async for chunk in response.aiter_raw()])
+                raise _Uncacheable(httpx.Response(
+                    response.status_code, headers=response.headers, content=body
+                ))
+
+            fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    async for chunk in response.aiter_raw():
+                        await asyncio.to_thread(f.write, chunk)
+                os.replace(tmp, self._dir / f"{key}.body")
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        finally:
+            await response.aclose()
+
+        entry = self._entry(request, response)
+        await self._store_meta(key, entry)
+        return entry
+
+    @staticmethod
+    def _entry(request: httpx.Request, response: httpx.Response) -> dict[str, Any]:
+        return {
+            "url": str(request.url.copy_remove_param("api_key").copy_remove_param("appid")),
+            "stored_at": time.time(),
+            "headers": [
+                [k, v] for k, v in response.headers.multi_items()
+                if k.lower() not in ("transfer-encoding", "connection")
+            ],
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+
+    async def _store_meta(self, key: str, entry: dict[str, Any]) -> None:
+        await asyncio.to_thread(self._write_meta, key, entry)
+        if time.monotonic() - self._last_sweep >= SWEEP_INTERVAL_S:
+            self._last_sweep = time.monotonic()
+            await asyncio.to_thread(self.sweep)
+
+    def _background(self, stream: _TeeStream) -> None:
+        task = asyncio.create_task(stream._drain())
+        self._drains[task] = stream
+        task.add_done_callback(lambda t: self._drains.pop(t, None))
+
+    def _respond(self, key: str, entry: dict[str, Any], state: str) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers=[*entry["headers"], ["x-cache", state]],
+            stream=_FileStream(self._dir / f"{key}.body"),
+        )
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        try:
+            entry = json.loads((self._dir / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        return entry if (self._dir / f"{key}.body").exists() else None
+
+    def _write_meta(self, key: str, entry: dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self._dir, suffix=".part")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self._dir / f"{key}.json")
+
+    def sweep(self) -> dict[str, int]:
+        """Delete expired entries, then the oldest until under the size cap.
+
+        Ages go by the metadata file's mtime, which every store and 304
+        revalidation rewrites. Returns counts of removed entries and bytes.
+        """
+        now = time.time()
+        entries = []  # (mtime, key, size)
+        removed = {"entries": 0, "bytes": 0}
+        for path in self._dir.iterdir():
+            try:
+                stat = path.stat()
+                if path.suffix == ".part":
+                    if now - stat.st_mtime > ORPHAN_AGE_S:
+                        path.unlink()
+                elif path.suffix == ".json":
+                    body = path.with_suffix(".body")
+                    size = stat.st_size + (body.stat().st_size if body.exists() else 0)
+                    entries.append((stat.st_mtime, path.stem, size))
+                elif path.suffix == ".body" and not path.with_suffix(".json").exists():
+                    if now - stat.st_mtime > ORPHAN_AGE_S:
+                        path.unlink()
+            except OSError:
+                continue
+
+        entries.sort()
+        total = sum(size for _, _, size in entries)
+        for mtime, key, size in entries:
+            if now - mtime <= self._max_age_s and total <= self._max_bytes:
+                break
+            for suffix in (".json", ".body"):
+                try:
+                    (self._dir / f"{key}{suffix}").unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed["entries"] += 1
+            removed["bytes"] += size
+        if removed["entries"]:
+            print(f"[http-cache] swept {removed['entries']} entries ({removed['bytes']} bytes)")
+        return removed
+
+    async def aclose(self) -> None:
+        drains = dict(self._drains)
+        for task in [*self._inflight.values(), *drains]:
+            task.cancel()
+        await asyncio.gather(*drains, return_exceptions=True)
+        # A drain cancelled before it started never cleaned up after itself
+        for stream in drains.values():
+            await stream._discard()
+        await self._transport.aclose()
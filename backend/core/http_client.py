@@ -0,0 +1,117 @@
+"""Shared HTTP client for ingestion sources and the LLM client.
+
+One keep-alive connection pool for the whole app, so ingests stop paying
+TCP/TLS setup on every fetch. Speaks HTTP/2 when ``h2`` is installed
+(``pip install httpx[http2]``) and caps in-flight requests per host on
+top of the pool-wide limits. Requests that opt in are served through the
+disk cache in ``core/http_cache.py``. Closed by the FastAPI lifespan.
+"""
+
+import asyncio
+from pathlib import Path
+import httpx
+
+from config import get_settings
+from core.http_cache import CachingTransport
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+MAX_REQUESTS_PER_HOST = 8
+# Per-request timeouts passed by callers override this default
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "data" / "http_cache"
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that releases its host slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class PerHostLimitTransport(httpx.AsyncBaseTransport):
+    """Bounds concurrent requests per host; a request holds its slot until
+    the response body is closed."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, per_host: int = MAX_REQUESTS_PER_HOST):
+        self._transport = transport
+        self._per_host = per_host
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slot = self._slots.setdefault(request.url.host, asyncio.Semaphore(self._per_host))
+        await slot.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            slot.release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, slot.release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The app-wide pooled client. Don't close it — the lifespan does."""
+    global _client
+    if _client is None:
+        transport = httpx.AsyncHTTPTransport(
+            http2=_http2_available(),
+            limits=HTTP_LIMITS,
+            retries=1,  # reconnect once if a kept-alive connection was dropped
+        )
+        transport = PerHostLimitTransport(transport)
+        settings = get_settings()
+        if settings.http_cache:
+            # Cache hits are answered before taking a per-host slot
+            cache_dir = Path(settings.http_cache_dir) if settings.http_cache_dir else DEFAULT_CACHE_DIR
+            transport = CachingTransport(
+                transport, cache_dir,
+                max_age_s=settings.http_cache_max_age_s,
+                max_bytes=settings.http_cache_max_mb * 1024 * 1024,
+            )
+        _client = httpx.AsyncClient(
+            transport=transport,
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
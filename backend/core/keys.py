@@ -0,0 +1,52 @@
+"""Redis key schema.
+
+On a single node every key keeps its plain name. With ``REDIS_CLUSTER=true``
+keys carry hash tags so keys written together hash to the same slot:
+
+- a signal series and its rollups share the series tag:
+  ``signal:{aws_spot:p3.2xlarge:us-east-1a}`` / ``...}:1h:avg``
+  (TS.CREATERULE needs source and destination in one slot)
+- a prediction and its evaluation share the prediction id:
+  ``prediction:{pred_x}`` / ``eval:{pred_x}``
+- shared metadata (indexes, counters, the causal graph, logs, metric
+  aggregates) lives under ``{oracle}`` on one shard
+"""
+
+from config import get_settings
+
+_CLUSTER = get_settings().redis_cluster
+
+
+def _tag(value: str) -> str:
+    return f"{{{value}}}" if _CLUSTER else value
+
+
+def meta(name: str) -> str:
+    """Key for shared metadata, e.g. ``meta("causal_graph")``."""
+    return f"{{oracle}}:{name}" if _CLUSTER else name
+
+
+def signal_key(source_id: str, *parts: str) -> str:
+    """Raw series key, e.g. ``signal_key("weather", "temp_nyc")``."""
+    return f"signal:{_tag(':'.join((source_id, *parts)))}"
+
+
+def prediction_key(prediction_id: str) -> str:
+    return f"prediction:{_tag(prediction_id)}"
+
+
+def eval_key(prediction_id: str) -> str:
+    return f"eval:{_tag(prediction_id)}"
+
+
+def cycle_key(cycle: int) -> str:
+    return f"cycle:{_tag(str(cycle))}"
+
+
+PREDICTIONS_INDEX = meta("predictions:index")
+EVALUATIONS_INDEX = meta("evaluations:index")
+CYCLE_COUNT = meta("oracle:cycle_count")
+GRAPH = meta("causal_graph")
+LEARNING_LOG = meta("learning:log")
+NEWS_HEADLINES = meta("news:headlines")
+SCHEDULER_SAVINGS = meta("scheduler:savings")
@@ -5,8 +5,10 @@ Available models: DeepSeek R1, Qwen3, Llama 4, etc.
 See: https://docs.wandb.ai/guides/inference/models/
 """
 
+import httpx
 from openai import AsyncOpenAI
 from config import get_settings
+from core.http_client import get_http_client
 
 WANDB_INFERENCE_BASE_URL = "https://api.inference.wandb.ai/v1"
 
@@ -14,16 +16,30 @@ WANDB_INFERENCE_BASE_URL = "https://api.inference.wandb.ai/v1"
 REASONER_MODEL = "deepseek-ai/DeepSeek-R1-0528"  # Strong analytical reasoning
 PREDICTOR_MODEL = "Qwen/Qwen3-30B-A3B-Instruct-2507"  # Fast structured JSON
 
+# Reasoning calls are slow; keep the OpenAI SDK's default rather than the
+# shared pool's ingest-oriented timeout
+LLM_TIMEOUT_S = 600.0
+
 _client: AsyncOpenAI | None = None
+# The pool _client was built on; the lifespan closes and replaces it
+_client_pool: httpx.AsyncClient | None = None
 
 
 def get_llm_client() -> AsyncOpenAI:
-    """Get the W&B Inference client (OpenAI-compatible)."""
-    global _client
-    if _client is None:
+    """Get the W&B Inference client (OpenAI-compatible), on the shared pool.
+
+    Rebuilt whenever the shared pool has been closed and recreated, so a
+    restarted app never hands out a client on a closed pool.
+    """
+    global _client, _client_pool
+    pool = get_http_client()
+    if _client is None or _client_pool is not pool:
         settings = get_settings()
         _client = AsyncOpenAI(
             base_url=WANDB_INFERENCE_BASE_URL,
             api_key=settings.wandb_api_key,
+            http_client=pool,
+            timeout=LLM_TIMEOUT_S,
         )
+        _client_pool = pool
     return _client
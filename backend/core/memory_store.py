@@ -0,0 +1,736 @@
+"""In-process storage backend — a drop-in for the Redis Stack subset we use.
+
+Selected with ``STORAGE_BACKEND=memory``. ``get_redis()`` then returns a
+``MemoryRedis`` instead of a network client, so replays, benchmarks and
+tests run with zero network hops and no persistence.
+
+Implements the commands the app issues: TimeSeries (TS.CREATE / ALTER /
+INFO / CREATERULE / ADD / MADD / GET / MGET / MRANGE) with array-backed sample buffers,
+RedisJSON (JSON.SET / GET / MGET / DEL) over plain dicts for the simple
+JSONPaths we use, and strings, hashes, lists, sorted sets and streams.
+Pipelines queue calls and run them in order on ``execute()``. Lua scripts
+need a Python twin registered with ``local_script``.
+"""
+
+import bisect
+import json
+import re
+import time
+from array import array
+from typing import Any, Callable
+
+from redis.exceptions import ResponseError
+
+# Lua source -> Python implementation taking (store, keys, args)
+_LOCAL_SCRIPTS: dict[str, Callable[["MemoryRedis", list[str], list[Any]], Any]] = {}
+
+
+def local_script(lua: str):
+    """Register the in-process equivalent of a Lua script."""
+    def decorator(func):
+        _LOCAL_SCRIPTS[lua] = func
+        return func
+    return decorator
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# ---------------------------------------------------------------------------
+# TimeSeries
+# ---------------------------------------------------------------------------
+
+_AGGREGATORS: dict[str, Callable[[list[float]], float]] = {
+    "avg": lambda v: sum(v) / len(v),
+    "sum": sum,
+    "min": min,
+    "max": max,
+    "count": len,
+    "first": lambda v: v[0],
+    "last": lambda v: v[-1],
+}
+
+
+class _Series:
+    """Samples kept sorted in parallel int64 / float64 arrays."""
+
+    def __init__(self, retention: int, duplicate_policy: str, labels: dict[str, str]):
+        self.timestamps = array("q")
+        self.values = array("d")
+        self.retention = retention
+        self.duplicate_policy = duplicate_policy.upper()
+        self.labels = labels
+        self.rules: list["_Rule"] = []
+        self.has_source_rule = False
+
+    def add(self, ts: int, value: float, policy: str | None = None) -> None:
+        policy = (policy or self.duplicate_policy).upper()
+        n = len(self.timestamps)
+        if n == 0 or ts > self.timestamps[-1]:
+            self.timestamps.append(ts)
+            self.values.append(value)
+        else:
+            i = bisect.bisect_left(self.timestamps, ts)
+            if i < n and self.timestamps[i] == ts:
+                self.values[i] = _resolve_duplicate(policy, self.values[i], value)
+            else:
+                self.timestamps.insert(i, ts)
+                self.values.insert(i, value)
+
+        if self.retention:
+            cut = bisect.bisect_left(self.timestamps, self.timestamps[-1] - self.retention)
+            if cut:
+                del self.timestamps[:cut]
+                del self.values[:cut]
+
+    def range(self, start: int, end: int) -> tuple[int, int]:
+        return (
+            bisect.bisect_left(self.timestamps, start),
+            bisect.bisect_right(self.timestamps, end),
+        )
+
+
+def _resolve_duplicate(policy: str, old: float, new: float) -> float:
+    if policy == "BLOCK":
+        raise ResponseError(
+            "ERR TSDB: Error at upsert, update is not supported when "
+            "DUPLICATE_POLICY is set to BLOCK mode"
+        )
+    return {
+        "LAST": new,
+        "FIRST": old,
+        "MIN": min(old, new),
+        "MAX": max(old, new),
+        "SUM": old + new,
+    }[policy]
+
+
+class _Rule:
+    """Compaction rule: emits a bucket to ``dest`` once a later bucket starts."""
+
+    def __init__(self, dest: str, aggregation: str, bucket_ms: int):
+        self.dest = dest
+        self.aggregation = aggregation.lower()
+        self.bucket_ms = bucket_ms
+        self.bucket: int | None = None
+        self.pending: list[float] = []
+
+    def feed(self, store: "MemoryRedis", ts: int, value: float) -> None:
+        bucket = ts - ts % self.bucket_ms
+        if self.bucket is not None and bucket < self.bucket:
+            return  # late sample for an already closed bucket
+        if self.bucket is not None and bucket > self.bucket and self.pending:
+            dest = store._series.get(self.dest)
+            if dest is not None:
+                dest.add(self.bucket, _AGGREGATORS[self.aggregation](self.pending), "LAST")
+            self.pending = []
+        self.bucket = bucket
+        self.pending.append(value)
+
+
+def _parse_filter(expr: str) -> Callable[[dict[str, str]], bool]:
+    """Parse one TS FILTER expression (``l=v``, ``l!=v``, ``l=(a,b)``, ``l=``)."""
+    negate = "!=" in expr
+    label, _, value = expr.partition("!=" if negate else "=")
+    if value.startswith("(") and value.endswith(")"):
+        options = set(value[1:-1].split(","))
+    elif value:
+        options = {value}
+    else:
+        options = set()
+
+    def match(labels: dict[str, str]) -> bool:
+        present = label in labels
+        if not options:  # "l=" means absent, "l!=" means present
+            return present if negate else not present
+        hit = present and labels[label] in options
+        return not hit if negate else hit
+
+    return match
+
+
+def _parse_bound(value: Any, default: int) -> int:
+    return default if value in ("-", "+") else int(value)
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value))
+
+
+# ---------------------------------------------------------------------------
+# JSON paths — just the plain member / index paths the app uses
+# ---------------------------------------------------------------------------
+
+_PATH_TOKEN = re.compile(r"\.([A-Za-z_][\w]*)|\['([^']*)'\]|\[\"([^\"]*)\"\]|\[(\d+)\]")
+
+
+def _parse_path(path: str) -> list[str | int]:
+    if path in ("$", "."):
+        return []
+    if path.startswith("$"):
+        rest = path[1:]
+    else:
+        rest = path if path.startswith(".") else f".{path}"
+    steps: list[str | int] = []
+    pos = 0
+    while pos < len(rest):
+        m = _PATH_TOKEN.match(rest, pos)
+        if m is None:
+            raise ResponseError(f"ERR unsupported JSONPath in memory backend: {path}")
+        name, quoted, dquoted, index = m.groups()
+        steps.append(int(index) if index is not None else (name or quoted or dquoted))
+        pos = m.end()
+    return steps
+
+
+def _resolve(doc: Any, steps: list[str | int]) -> list[Any]:
+    """Values matched by ``steps`` (zero or one, since there are no wildcards)."""
+    node = doc
+    for step in steps:
+        if isinstance(step, int):
+            if not isinstance(node, list) or not -len(node) <= step < len(node):
+                return []
+        elif not isinstance(node, dict) or step not in node:
+            return []
+        node = node[step]
+    return [node]
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class MemoryRedis:
+    """Async, single-process stand-in for ``redis.asyncio.Redis``."""
+
+    def __init__(self):
+        self._series: dict[str, _Series] = {}
+        self._json: dict[str, Any] = {}
+        self._strings: dict[str, str] = {}
+        self._hashes: dict[str, dict[str, str]] = {}
+        self._lists: dict[str, list[str]] = {}
+        self._zsets: dict[str, tuple[dict[str, float], list[tuple[float, str]]]] = {}
+        self._streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self._expires: dict[str, float] = {}
+
+    # -- plumbing ----------------------------------------------------------
+
+    def __getattr__(self, name: str):
+        impl = getattr(type(self), f"_cmd_{name}", None)
+        if impl is None:
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return impl(self, *args, **kwargs)
+        return call
+
+    def pipeline(self, transaction: bool = True) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+    def register_script(self, script: str) -> "_MemoryScript":
+        return _MemoryScript(self, script)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        return None
+
+    def _expire_check(self, key: str) -> None:
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.time():
+            self._cmd_delete(key)
+
+    def _keyspaces(self) -> tuple[dict, ...]:
+        return (
+            self._series, self._json, self._strings, self._hashes,
+            self._lists, self._zsets, self._streams,
+        )
+
+    # -- generic -----------------------------------------------------------
+
+    def _cmd_delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            self._expires.pop(key, None)
+            if key in self._series:
+                self._drop_rules(key)
+            for space in self._keyspaces():
+                if space.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def _drop_rules(self, key: str) -> None:
+        """Detach compaction rules from or into a series being deleted."""
+        for rule in self._series[key].rules:
+            dest = self._series.get(rule.dest)
+            if dest is not None:
+                dest.has_source_rule = False
+        for series in self._series.values():
+            series.rules = [rule for rule in series.rules if rule.dest != key]
+
+    def _cmd_exists(self, *keys: str) -> int:
+        count = 0
+        for key in keys:
+            self._expire_check(key)
+            count += any(key in space for space in self._keyspaces())
+        return count
+
+    def _cmd_expire(self, key: str, seconds: int) -> bool:
+        if not self._cmd_exists(key):
+            return False
+        self._expires[key] = time.time() + seconds
+        return True
+
+    def _cmd_keys(self, pattern: str = "*") -> list[str]:
+        regex = re.compile(
+            "^" + re.escape(pattern).replace(r"\*", ".*").replace(r"\?", ".") + "$"
+        )
+        found = []
+        for space in self._keyspaces():
+            found.extend(k for k in list(space) if regex.match(k))
+        return [k for k in found if self._cmd_exists(k)]
+
+    # -- strings -----------------------------------------------------------
+
+    def _cmd_get(self, key: str) -> str | None:
+        self._expire_check(key)
+        return self._strings.get(key)
+
+    def _cmd_set(self, key: str, value: Any, ex: int | None = None, nx: bool = False) -> bool | None:
+        self._expire_check(key)
+        if nx and key in self._strings:
+            return None
+        self._strings[key] = str(value)
+        self._expires.pop(key, None)
+        if ex:
+            self._expires[key] = time.time() + ex
+        return True
+
+    def _cmd_incrby(self, key: str, amount: int = 1) -> int:
+        value = int(self._cmd_get(key) or 0) + amount
+        self._strings[key] = str(value)
+        return value
+
+    def _cmd_incr(self, key: str, amount: int = 1) -> int:
+        return self._cmd_incrby(key, amount)
+
+    # -- hashes ------------------------------------------------------------
+
+    def _cmd_hset(self, name: str, key: str | None = None, value: Any = None,
+                  mapping: dict[str, Any] | None = None) -> int:
+        h = self._hashes.setdefault(name, {})
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        added = sum(1 for k in items if k not in h)
+        h.update({k: str(v) for k, v in items.items()})
+        return added
+
+    def _cmd_hget(self, name: str, key: str) -> str | None:
+        return self._hashes.get(name, {}).get(key)
+
+    def _cmd_hgetall(self, name: str) -> dict[str, str]:
+        return dict(self._hashes.get(name, {}))
+
+    def _cmd_hdel(self, name: str, *keys: str) -> int:
+        h = self._hashes.get(name, {})
+        return sum(1 for k in keys if h.pop(k, None) is not None)
+
+    def _cmd_hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        h = self._hashes.setdefault(name, {})
+        value = int(h.get(key, 0)) + amount
+        h[key] = str(value)
+        return value
+
+    def _cmd_hincrbyfloat(self, name: str, key: str, amount: float = 1.0) -> float:
+        h = self._hashes.setdefault(name, {})
+        value = float(h.get(key, 0)) + amount
+        h[key] = repr(value)
+        return value
+
+    # -- lists -------------------------------------------------------------
+
+    def _cmd_lpush(self, name: str, *values: Any) -> int:
+        lst = self._lists.setdefault(name, [])
+        lst[:0] = [str(v) for v in reversed(values)]
+        return len(lst)
+
+    def _cmd_rpush(self, name: str, *values: Any) -> int:
+        lst = self._lists.setdefault(name, [])
+        lst.extend(str(v) for v in values)
+        return len(lst)
+
+    def _cmd_rpop(self, name: str) -> str | None:
+        lst = self._lists.get(name)
+        return lst.pop() if lst else None
+
+    def _cmd_lrange(self, name: str, start: int, end: int) -> list[str]:
+        lst = self._lists.get(name, [])
+        return lst[start:None if end == -1 else end + 1]
+
+    def _cmd_ltrim(self, name: str, start: int, end: int) -> bool:
+        if name in self._lists:
+            self._lists[name] = self._cmd_lrange(name, start, end)
+        return True
+
+    def _cmd_llen(self, name: str) -> int:
+        return len(self._lists.get(name, []))
+
+    # -- sorted sets -------------------------------------------------------
+
+    def _zset(self, name: str) -> tuple[dict[str, float], list[tuple[float, str]]]:
+        return self._zsets.setdefault(name, ({}, []))
+
+    def _cmd_zadd(self, name: str, mapping: dict[str, float], nx: bool = False, **_: Any) -> int:
+        scores, ordered = self._zset(name)
+        added = 0
+        for member, score in mapping.items():
+            score = float(score)
+            if member in scores:
+                if nx:
+                    continue
+                ordered.remove((scores[member], member))
+            else:
+                added += 1
+            scores[member] = score
+            bisect.insort(ordered, (score, member))
+        return added
+
+    def _cmd_zrem(self, name: str, *members: str) -> int:
+        scores, ordered = self._zset(name)
+        removed = 0
+        for member in members:
+            if member in scores:
+                ordered.remove((scores.pop(member), member))
+                removed += 1
+        return removed
+
+    def _cmd_zcard(self, name: str) -> int:
+        return len(self._zset(name)[0])
+
+    def _cmd_zscore(self, name: str, member: str) -> float | None:
+        return self._zset(name)[0].get(member)
+
+    def _cmd_zrange(self, name: str, start: int, end: int, desc: bool = False,
+                    withscores: bool = False) -> list[Any]:
+        ordered = self._zset(name)[1]
+        if desc:
+            ordered = ordered[::-1]
+        picked = ordered[start:None if end == -1 else end + 1]
+        if withscores:
+            return [(m, s) for s, m in picked]
+        return [m for _, m in picked]
+
+    def _cmd_zrevrange(self, name: str, start: int, end: int, withscores: bool = False) -> list[Any]:
+        return self._cmd_zrange(name, start, end, desc=True, withscores=withscores)
+
+    def _score_slice(self, name: str, min: Any, max: Any) -> list[tuple[float, str]]:
+        lo = float("-inf") if min == "-inf" else float(min)
+        hi = float("inf") if max == "+inf" else float(max)
+        ordered = self._zset(name)[1]
+        return ordered[bisect.bisect_left(ordered, (lo, "")):bisect.bisect_right(ordered, (hi, "￿"))]
+
+    def _cmd_zrangebyscore(self, name: str, min: Any, max: Any, start: int | None = None,
+                           num: int | None = None, withscores: bool = False) -> list[Any]:
+        picked = self._score_slice(name, min, max)
+        if start is not None and num is not None:
+            picked = picked[start:start + num]
+        if withscores:
+            return [(m, s) for s, m in picked]
+        return [m for _, m in picked]
+
+    def _cmd_zremrangebyscore(self, name: str, min: Any, max: Any) -> int:
+        return self._cmd_zrem(name, *[m for _, m in self._score_slice(name, min, max)])
+
+    # -- streams -----------------------------------------------------------
+
+    def _cmd_xadd(self, name: str, fields: dict[str, Any], id: str = "*",
+                  maxlen: int | None = None, approximate: bool = True) -> str:
+        entries = self._streams.setdefault(name, [])
+        ms = _now_ms()
+        seq = 0
+        if entries:
+            last_ms, last_seq = (int(x) for x in entries[-1][0].split("-"))
+            if ms <= last_ms:
+                ms, seq = last_ms, last_seq + 1
+        entry_id = f"{ms}-{seq}"
+        entries.append((entry_id, {k: str(v) for k, v in fields.items()}))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[:len(entries) - maxlen]
+        return entry_id
+
+    @staticmethod
+    def _stream_id(entry_id: str, default_seq: int) -> tuple[int, int]:
+        ms, _, seq = entry_id.partition("-")
+        return int(ms), int(seq) if seq else default_seq
+
+    def _stream_slice(self, name: str, min: str, max: str) -> list[tuple[str, dict[str, str]]]:
+        exclusive = min.startswith("(")
+        lo = (-1, -1) if min == "-" else self._stream_id(min.lstrip("("), 0)
+        hi = (1 << 63, 0) if max == "+" else self._stream_id(max, 1 << 63)
+        picked = []
+        for entry_id, fields in self._streams.get(name, []):
+            key = self._stream_id(entry_id, 0)
+            if (key > lo if exclusive else key >= lo) and key <= hi:
+                picked.append((entry_id, dict(fields)))
+        return picked
+
+    def _cmd_xrange(self, name: str, min: str = "-", max: str = "+", count: int | None = None):
+        return self._stream_slice(name, min, max)[:count]
+
+    def _cmd_xrevrange(self, name: str, max: str = "+", min: str = "-", count: int | None = None):
+        return self._stream_slice(name, min, max)[::-1][:count]
+
+    def _cmd_xlen(self, name: str) -> int:
+        return len(self._streams.get(name, []))
+
+    # -- raw commands (TimeSeries + JSON) ----------------------------------
+
+    def _cmd_execute_command(self, command: str, *args: Any, **_: Any) -> Any:
+        handler = getattr(self, "_" + command.lower().replace(".", "_"), None)
+        if handler is None:
+            raise ResponseError(f"ERR unknown command '{command}' in memory backend")
+        return handler(*args)
+
+    @staticmethod
+    def _options(args: tuple[Any, ...]) -> tuple[dict[str, Any], dict[str, str]]:
+        """Split TS.CREATE / TS.ADD style options into (options, labels)."""
+        opts: dict[str, Any] = {}
+        labels: dict[str, str] = {}
+        i = 0
+        while i < len(args):
+            word = str(args[i]).upper()
+            if word == "LABELS":
+                rest = args[i + 1:]
+                labels = {str(rest[j]): str(rest[j + 1]) for j in range(0, len(rest) - 1, 2)}
+                break
+            opts[word] = args[i + 1] if i + 1 < len(args) else None
+            i += 2
+        return opts, labels
+
+    def _ts_create(self, key: str, *args: Any) -> str:
+        if key in self._series:
+            raise ResponseError("ERR TSDB: key already exists")
+        opts, labels = self._options(args)
+        self._series[key] = _Series(
+            int(opts.get("RETENTION", 0)),
+            str(opts.get("DUPLICATE_POLICY", "BLOCK")),
+            labels,
+        )
+        return "OK"
+
+    def _ts_alter(self, key: str, *args: Any) -> str:
+        series = self._series.get(key)
+        if series is None:
+            raise ResponseError("ERR TSDB: the key does not exist")
+        opts, labels = self._options(args)
+        if "RETENTION" in opts:
+            series.retention = int(opts["RETENTION"])
+        if "DUPLICATE_POLICY" in opts:
+            series.duplicate_policy = str(opts["DUPLICATE_POLICY"]).upper()
+        if labels:
+            series.labels = labels
+        return "OK"
+
+    def _ts_info(self, key: str) -> list[Any]:
+        series = self._series.get(key)
+        if series is None:
+            raise ResponseError("ERR TSDB: the key does not exist")
+        return [
+            "totalSamples", len(series.timestamps),
+            "retentionTime", series.retention,
+            "lastTimestamp", series.timestamps[-1] if series.timestamps else 0,
+            "duplicatePolicy", series.duplicate_policy.lower(),
+            "labels", [[k, v] for k, v in series.labels.items()],
+            "rules", [[r.dest, r.bucket_ms, r.aggregation.upper(), 0] for r in series.rules],
+        ]
+
+    def _ts_createrule(self, source: str, dest: str, _agg_kw: str, aggregation: str,
+                       bucket_ms: Any, *_: Any) -> str:
+        src, dst = self._series.get(source), self._series.get(dest)
+        if src is None or dst is None:
+            raise ResponseError("ERR TSDB: the key does not exist")
+        if dst.has_source_rule:
+            raise ResponseError("ERR TSDB: the destination key already has a src rule")
+        src.rules.append(_Rule(dest, aggregation, int(bucket_ms)))
+        dst.has_source_rule = True
+        return "OK"
+
+    def _ts_append(self, key: str, ts: Any, value: Any, policy: str | None = None) -> int:
+        series = self._series.get(key)
+        if series is None:
+            raise ResponseError("ERR TSDB: the key does not exist")
+        ts = _now_ms() if ts == "*" else int(ts)
+        series.add(ts, float(value), policy)
+        for rule in series.rules:
+            rule.feed(self, ts, float(value))
+        return ts
+
+    def _ts_add(self, key: str, ts: Any, value: Any, *args: Any) -> int:
+        opts, labels = self._options(args)
+        if key not in self._series:
+            self._ts_create(key, "RETENTION", opts.get("RETENTION", 0),
+                            "DUPLICATE_POLICY", opts.get("DUPLICATE_POLICY", "BLOCK"),
+                            "LABELS", *[x for pair in labels.items() for x in pair])
+        return self._ts_append(key, ts, value, opts.get("ON_DUPLICATE"))
+
+    def _ts_madd(self, *args: Any) -> list[Any]:
+        replies: list[Any] = []
+        for i in range(0, len(args), 3):
+            try:
+                replies.append(self._ts_append(*args[i:i + 3]))
+            except ResponseError as e:
+                replies.append(e)
+        return replies
+
+    def _ts_get(self, key: str) -> list[Any]:
+        series = self._series.get(key)
+        if series is None:
+            raise ResponseError("ERR TSDB: the key does not exist")
+        if not series.timestamps:
+            return []
+        return [series.timestamps[-1], _fmt(series.values[-1])]
+
+    def _matching(self, args: tuple[Any, ...]) -> list[tuple[str, _Series]]:
+        exprs = [str(a) for a in args[[str(a).upper() for a in args].index("FILTER") + 1:]]
+        matchers = [_parse_filter(e) for e in exprs]
+        return [
+            (key, series) for key, series in sorted(self._series.items())
+            if all(m(series.labels) for m in matchers)
+        ]
+
+    def _ts_mget(self, *args: Any) -> list[Any]:
+        with_labels = "WITHLABELS" in [str(a).upper() for a in args]
+        out = []
+        for key, series in self._matching(args):
+            labels = [[k, v] for k, v in series.labels.items()] if with_labels else []
+            last = [series.timestamps[-1], _fmt(series.values[-1])] if series.timestamps else []
+            out.append([key, labels, last])
+        return out
+
+    def _ts_mrange(self, start: Any, end: Any, *args: Any) -> list[Any]:
+        words = [str(a).upper() for a in args]
+        with_labels = "WITHLABELS" in words
+        count = int(args[words.index("COUNT") + 1]) if "COUNT" in words else None
+        aggregation = None
+        if "AGGREGATION" in words:
+            i = words.index("AGGREGATION")
+            aggregation = (str(args[i + 1]).lower(), int(args[i + 2]))
+
+        lo, hi = _parse_bound(start, 0), _parse_bound(end, 1 << 62)
+        out = []
+        for key, series in self._matching(args):
+            i, j = series.range(lo, hi)
+            samples = list(zip(series.timestamps[i:j], series.values[i:j]))
+            if aggregation:
+                agg, bucket_ms = aggregation
+                buckets: dict[int, list[float]] = {}
+                for ts, value in samples:
+                    buckets.setdefault(ts - ts % bucket_ms, []).append(value)
+                samples = [(b, _AGGREGATORS[agg](v)) for b, v in buckets.items()]
+            labels = [[k, v] for k, v in series.labels.items()] if with_labels else []
+            out.append([key, labels, [[ts, _fmt(v)] for ts, v in samples[:count]]])
+        return out
+
+    def _json_set(self, key: str, path: str, value: str, *flags: Any) -> str | None:
+        steps = _parse_path(path)
+        data = json.loads(value)
+        if not steps:
+            if "NX" in (str(f).upper() for f in flags) and key in self._json:
+                return None
+            self._json[key] = data
+            return "OK"
+        if key not in self._json:
+            raise ResponseError("ERR new objects must be created at the root")
+        parent = _resolve(self._json[key], steps[:-1])
+        if not parent or not isinstance(parent[0], (dict, list)):
+            return None
+        container, last = parent[0], steps[-1]
+        if isinstance(container, list):
+            if not isinstance(last, int) or not -len(container) <= last < len(container):
+                return None
+        elif isinstance(last, int):
+            return None
+        container[last] = data
+        return "OK"
+
+    def _json_get(self, key: str, *paths: str) -> str | None:
+        if key not in self._json:
+            return None
+        doc = self._json[key]
+        if not paths:
+            return json.dumps(doc)
+        if len(paths) == 1:
+            return json.dumps(_resolve(doc, _parse_path(paths[0])))
+        return json.dumps({p: _resolve(doc, _parse_path(p)) for p in paths})
+
+    def _json_mget(self, *args: str) -> list[str | None]:
+        *keys, path = args
+        return [self._json_get(key, path) for key in keys]
+
+    def _json_del(self, key: str, path: str = "$") -> int:
+        if key not in self._json:
+            return 0
+        steps = _parse_path(path)
+        if not steps:
+            del self._json[key]
+            return 1
+        parent = _resolve(self._json[key], steps[:-1])
+        if not parent:
+            return 0
+        container, last = parent[0], steps[-1]
+        try:
+            del container[last]
+        except (KeyError, IndexError, TypeError):
+            return 0
+        return 1
+
+
+class MemoryPipeline:
+    """Queues calls and runs them back to back on ``execute()``."""
+
+    def __init__(self, store: MemoryRedis):
+        self._store = store
+        self._queue: list[tuple[Callable[..., Any], tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        impl = getattr(MemoryRedis, f"_cmd_{name}", None)
+        if impl is None:
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            self._queue.append((impl, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        results: list[Any] = []
+        for impl, args, kwargs in self._queue:
+            try:
+                results.append(impl(self._store, *args, **kwargs))
+            except ResponseError as e:
+                results.append(e)
+        self._queue = []
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ResponseError):
+                    raise result
+        return results
+
+
+class _MemoryScript:
+    """Callers cache these across reconnects, so ``client`` wins over the
+    store the script was registered on."""
+
+    def __init__(self, store: MemoryRedis, script: str):
+        if script not in _LOCAL_SCRIPTS:
+            raise ResponseError("ERR script has no in-process implementation")
+        self._store = store
+        self._impl = _LOCAL_SCRIPTS[script]
+
+    async def __call__(self, keys: list[str] | None = None, args: list[Any] | None = None,
+                       client: Any = None) -> Any:
+        store = client if isinstance(client, MemoryRedis) else self._store
+        return self._impl(store, list(keys or []), list(args or []))
@@ -1,23 +1,115 @@
+import itertools
 import json
+import time
+from contextvars import ContextVar
 import redis.asyncio as aioredis
+from redis.asyncio.cluster import RedisCluster
+from redis.cluster import LoadBalancingStrategy
+from redis.crc import key_slot
 from datetime import datetime, timezone
 from typing import Any
 from config import get_settings
+from core.memory_store import MemoryRedis, local_script
 
-_redis: aioredis.Redis | None = None
+_redis: aioredis.Redis | RedisCluster | MemoryRedis | None = None
 
 
-async def get_redis() -> aioredis.Redis:
+async def get_redis() -> aioredis.Redis | RedisCluster | MemoryRedis:
+    """Shared client: Redis Stack (a single node, or a cluster when
+    ``REDIS_CLUSTER=true``), or the in-process store when
+    ``STORAGE_BACKEND=memory``."""
     global _redis
     if _redis is None:
         settings = get_settings()
-        _redis = aioredis.from_url(
-            settings.redis_url,
-            decode_responses=True,
-        )
+        if settings.storage_backend == "memory":
+            _redis = MemoryRedis()
+        elif settings.redis_cluster:
+            _redis = RedisCluster.from_url(
+                settings.redis_url,
+                decode_responses=True,
+            )
+        else:
+            _redis = aioredis.from_url(
+                settings.redis_url,
+                decode_responses=True,
+            )
     return _redis
 
 
+# --- Read replicas ---
+
+# Set by the ``prefer_replica`` dependency on read-only API routes
+_prefer_replica: ContextVar[bool] = ContextVar("prefer_replica", default=False)
+_replicas: list[dict[str, Any]] = []
+_replica_cursor = itertools.count()
+_read_cluster: RedisCluster | None = None
+# Replicas are pinged at most this often; an unreachable one is skipped
+# until its next check
+REPLICA_CHECK_INTERVAL_S = 5.0
+
+
+async def prefer_replica() -> None:
+    """FastAPI dependency: serve this request's reads from a replica.
+
+    For dashboard routes that tolerate slightly stale data. Must stay
+    async so the context variable is set in the request's own context.
+    """
+    _prefer_replica.set(True)
+
+
+async def get_read_redis() -> aioredis.Redis | RedisCluster | MemoryRedis:
+    """Client for reads: a replica inside ``prefer_replica`` routes when
+    ``REDIS_READ_URLS`` (or cluster mode) provides one, else the primary.
+
+    Replicas are picked round-robin; if none answers, reads fall back to
+    the primary. Writes must always use ``get_redis()``.
+    """
+    global _read_cluster
+    primary = await get_redis()
+    settings = get_settings()
+    if not _prefer_replica.get() or settings.storage_backend == "memory":
+        return primary
+
+    if settings.redis_cluster:
+        if _read_cluster is None:
+            _read_cluster = RedisCluster.from_url(
+                settings.redis_url,
+                decode_responses=True,
+                load_balancing_strategy=LoadBalancingStrategy.ROUND_ROBIN_REPLICAS,
+            )
+        return _read_cluster
+
+    if not _replicas:
+        for url in filter(None, (u.strip() for u in settings.redis_read_urls.split(","))):
+            _replicas.append({
+                "client": aioredis.from_url(
+                    url,
+                    decode_responses=True,
+                    socket_connect_timeout=1,
+                ),
+                "checked": 0.0,
+                "ok": False,
+            })
+    for _ in range(len(_replicas)):
+        replica = _replicas[next(_replica_cursor) % len(_replicas)]
+        if await _replica_ok(replica):
+            return replica["client"]
+    return primary
+
+
+async def _replica_ok(replica: dict[str, Any]) -> bool:
+    now = time.monotonic()
+    if now - replica["checked"] >= REPLICA_CHECK_INTERVAL_S:
+        replica["checked"] = now
+        try:
+            replica["ok"] = bool(await replica["client"].ping())
+        except Exception as e:
+            if replica["ok"]:
+                print(f"Read replica unreachable, using primary: {e}")
+            replica["ok"] = False
+    return replica["ok"]
+
+
 async def check_redis() -> bool:
     try:
         r = await get_redis()
@@ -27,24 +119,65 @@ async def check_redis() -> bool:
 
 
 async def close_redis():
-    global _redis
+    global _redis, _read_cluster
     if _redis is not None:
         await _redis.aclose()
         _redis = None
+    if _read_cluster is not None:
+        await _read_cluster.aclose()
+        _read_cluster = None
+    for replica in _replicas:
+        await replica["client"].aclose()
+    _replicas.clear()
+    # The next connection may reach a different (or flushed) store
+    _known_series.clear()
+    _last_values.clear()
+
+
+# --- Cluster helpers ---
+
+def _slot_groups(items: list[Any], key_of: Any) -> list[list[Any]]:
+    """Split ``items`` so each group's keys share a cluster slot.
+
+    Multi-key commands (TS.MADD, JSON.MGET) may not cross slots. Off-cluster
+    everything stays in one group.
+    """
+    if not get_settings().redis_cluster:
+        return [items]
+    groups: dict[int, list[Any]] = {}
+    for item in items:
+        groups.setdefault(key_slot(key_of(item).encode()), []).append(item)
+    return list(groups.values())
+
+
+async def _query_shards(r: Any, *args: Any) -> list[Any]:
+    """Run a label-filtered query (TS.MGET / TS.MRANGE) across all shards.
+
+    A FILTER only sees the series on the node it runs on, so in cluster
+    mode the query goes to every primary and the replies are concatenated.
+    """
+    if not isinstance(r, RedisCluster):
+        return await r.execute_command(*args)
+    replies = await r.execute_command(*args, target_nodes=RedisCluster.PRIMARIES)
+    if isinstance(replies, dict):
+        return [item for reply in replies.values() for item in reply]
+    return replies
 
 
 # --- TimeSeries helpers ---
 
 async def get_latest_signals() -> list[dict[str, Any]]:
     """Get the most recent value from all signal TimeSeries keys."""
-    r = await get_redis()
+    r = await get_read_redis()
     results = []
 
     try:
         # Get all TS keys with labels included
-        raw = await r.execute_command(
-            "TS.MGET", "WITHLABELS", "FILTER",
+        raw = await _query_shards(
+            r, "TS.MGET", "WITHLABELS", "FILTER",
             "source=(aws_spot,eia_electricity,weather,gpu_pricing,news)",
+            "bucket=",  # raw series only, not rollups
+            "kind=",  # not forecasts (their last sample is days ahead)
         )
         for item in raw:
             key = item[0]
@@ -53,7 +186,7 @@ async def get_latest_signals() -> list[dict[str, Any]]:
             ts_ms, value = item[2]
 
             # Parse key: signal:{source}:{name}:{qualifier}
-            parts = key.split(":")
+            parts = key.replace("{", "").replace("}", "").split(":")
             source = labels.get("source", parts[1] if len(parts) > 1 else "unknown")
 
             # Build a human-readable name from labels
@@ -62,7 +195,7 @@ async def get_latest_signals() -> list[dict[str, Any]]:
                 unit = "USD/hr"
             elif source == "eia_electricity":
                 name = f"{labels.get('respondent', '')} {labels.get('metric', '')}"
-                unit = "MWh"
+                unit = "USD/MWh" if labels.get("metric") == "price" else "MWh"
             elif source == "weather":
                 name = f"Temperature ({labels.get('location', '')})"
                 unit = "F"
@@ -87,11 +220,25 @@ async def get_latest_signals() -> list[dict[str, Any]]:
 
 
 async def get_signal_history(
-    source: str, name: str, hours: int = 168
+    source: str,
+    name: str,
+    hours: int = 168,
+    bucket: str | None = None,
+    aggregation: str = "avg",
 ) -> list[dict[str, Any]]:
-    """Get time-series history for a specific signal."""
-    r = await get_redis()
-    results = []
+    """Get time-series history for a specific signal.
+
+    With ``bucket`` ("1h" or "1d") the points come from the server-side
+    rollup series for ``aggregation`` ("avg", "min" or "max") instead of
+    the raw samples.
+    """
+    if bucket is not None and bucket not in ROLLUP_BUCKETS:
+        raise ValueError(f"Unknown bucket {bucket!r}")
+    if aggregation not in ROLLUP_AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {aggregation!r}")
+
+    r = await get_read_redis()
+    samples: list[tuple[int, float]] = []
 
     try:
         # Find matching keys
@@ -108,29 +255,355 @@ async def get_signal_history(
             parts = name.split()
             if len(parts) >= 1:
                 filter_parts.append(f"respondent={parts[0]}")
+            if len(parts) >= 2:
+                filter_parts.append(f"metric={parts[1]}")
+
+        if bucket:
+            filter_parts += [f"bucket={bucket}", f"agg={aggregation}"]
+        else:
+            filter_parts.append("bucket=")
+        filter_parts.append("kind=")
 
         # Query with filter
         now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
         start_ms = now_ms - (hours * 3600 * 1000)
 
-        raw = await r.execute_command(
-            "TS.MRANGE", start_ms, now_ms,
+        raw = await _query_shards(
+            r, "TS.MRANGE", start_ms, now_ms,
             "FILTER", *filter_parts,
         )
 
         for item in raw:
-            for ts_ms, value in item[2]:
-                results.append({
-                    "timestamp": datetime.fromtimestamp(
-                        int(ts_ms) / 1000, tz=timezone.utc
-                    ).isoformat(),
-                    "value": float(value),
-                })
+            samples.extend((int(ts_ms), float(value)) for ts_ms, value in item[2])
 
     except Exception as e:
         print(f"Error fetching signal history: {e}")
 
-    return sorted(results, key=lambda x: x["timestamp"])
+    samples.sort(key=lambda x: x[0])
+    return [
+        {
+            "timestamp": datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).isoformat(),
+            "value": value,
+        }
+        for ts_ms, value in samples
+    ]
+
+
+async def get_forecast_values(
+    horizons_h: list[int], source: str = "weather", tolerance_h: float = 3.0
+) -> list[dict[str, Any]]:
+    """Forecast samples nearest to now + each horizon, as signal dicts.
+
+    Reads the ``kind=forecast`` series (keyed by target time) in one
+    TS.MRANGE. A horizon is skipped for a series when no forecast lies
+    within ``tolerance_h`` of its target time.
+    """
+    if not horizons_h:
+        return []
+    r = await get_read_redis()
+    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    tolerance_ms = int(tolerance_h * 3600 * 1000)
+    end_ms = now_ms + max(horizons_h) * 3600 * 1000 + tolerance_ms
+
+    results = []
+    try:
+        raw = await _query_shards(
+            r, "TS.MRANGE", now_ms - tolerance_ms, end_ms, "WITHLABELS",
+            "FILTER", f"source={source}", "kind=forecast",
+        )
+    except Exception as e:
+        print(f"Error fetching forecasts: {e}")
+        return results
+
+    for key, label_pairs, samples in raw:
+        labels = {pair[0]: pair[1] for pair in label_pairs}
+        samples = [(int(ts), float(v)) for ts, v in samples]
+        for h in horizons_h:
+            target_ms = now_ms + h * 3600 * 1000
+            nearest = min(samples, key=lambda x: abs(x[0] - target_ms), default=None)
+            if nearest is None or abs(nearest[0] - target_ms) > tolerance_ms:
+                continue
+            results.append({
+                "source": source,
+                "name": f"{labels.get('name', key)} (+{h}h)",
+                "value": nearest[1],
+                "unit": "F" if source == "weather" else "",
+                "timestamp": datetime.fromtimestamp(nearest[0] / 1000, tz=timezone.utc).isoformat(),
+                "horizon": f"{h}h",
+            })
+    return results
+
+
+# --- Series registry ---
+
+SIGNAL_RETENTION_MS = 2592000000  # 30 days
+DEFAULT_DUPLICATE_POLICY = "LAST"
+
+# Compaction rollups kept next to every raw signal series:
+# {key}:{bucket}:{agg}, labelled bucket=<bucket> agg=<agg>
+ROLLUP_BUCKETS = {"1h": 3600000, "1d": 86400000}
+ROLLUP_RETENTION_MS = {"1h": 7776000000, "1d": 63072000000}  # 90 days, 2 years
+ROLLUP_AGGREGATIONS = ("avg", "min", "max")
+
+# Series this process has already created (or found existing and upgraded),
+# and the last value per series for change-only writes, read with TS.GET
+# before a sample is skipped on it. close_redis() clears both.
+_known_series: set[str] = set()
+_last_values: dict[str, float] = {}
+
+
+async def ensure_series(points: list[dict[str, Any]]) -> None:
+    """TS.CREATE every series in ``points`` not yet known to this process.
+
+    Labels, retention and duplicate policy are sent once at creation instead
+    of with every sample. Unless a point sets ``rollups`` to False, the
+    hourly and daily avg/min/max rollup series and their TS.CREATERULE
+    compactions are created alongside. Series that already exist are
+    brought up to date by ``_upgrade_series``.
+    """
+    specs: dict[str, dict[str, Any]] = {}
+    for p in points:
+        if p["key"] not in _known_series and p["key"] not in specs:
+            specs[p["key"]] = p
+    if not specs:
+        return
+
+    r = await get_redis()
+    pipe = r.pipeline(transaction=False)
+    # Raw series key per queued command, None for rollup commands
+    queued: list[str | None] = []
+    for key, p in specs.items():
+        labels = p.get("labels", {})
+        _queue_create(
+            pipe, key, labels,
+            p.get("retention", SIGNAL_RETENTION_MS),
+            p.get("duplicate_policy", DEFAULT_DUPLICATE_POLICY),
+        )
+        queued.append(key)
+        if not p.get("rollups", True):
+            continue
+        for bucket, bucket_ms in ROLLUP_BUCKETS.items():
+            for agg in ROLLUP_AGGREGATIONS:
+                dest = f"{key}:{bucket}:{agg}"
+                _queue_create(
+                    pipe, dest, {**labels, "bucket": bucket, "agg": agg},
+                    ROLLUP_RETENTION_MS[bucket], "LAST",
+                )
+                pipe.execute_command("TS.CREATERULE", key, dest, "AGGREGATION", agg, bucket_ms)
+                queued += [None, None]
+
+    existing = []
+    for key, res in zip(queued, await pipe.execute(raise_on_error=False)):
+        if key is None:
+            continue
+        if not isinstance(res, Exception):
+            _known_series.add(key)
+            # Freshly created, so any cached last value is stale
+            _last_values.pop(key, None)
+        elif "already exists" in str(res).lower():
+            existing.append(specs[key])
+        else:
+            print(f"Error creating series {key}: {res}")
+    if existing:
+        await _upgrade_series(existing)
+
+
+def _parse_info(reply: Any) -> dict[str, Any]:
+    """TS.INFO reply (flat RESP2 list or RESP3 map) as a dict."""
+    if isinstance(reply, dict):
+        return reply
+    return dict(zip(reply[::2], reply[1::2]))
+
+
+async def _upgrade_series(specs: list[dict[str, Any]]) -> None:
+    """Bring series created by older code in line with ``ensure_series``.
+
+    One TS.INFO per series, then TS.ALTER where the duplicate policy
+    differs (series created without one default to BLOCK and reject
+    re-ingested timestamps) and TS.CREATERULE for any missing rollup.
+    The series' latest samples seed the change-only cache.
+    """
+    r = await get_redis()
+    pipe = r.pipeline(transaction=False)
+    for p in specs:
+        pipe.execute_command("TS.INFO", p["key"])
+        pipe.execute_command("TS.GET", p["key"])
+    replies = await pipe.execute(raise_on_error=False)
+
+    pipe = r.pipeline(transaction=False)
+    # Series key per queued command, None for rollup TS.CREATEs
+    queued: list[str | None] = []
+    for p, info, last in zip(specs, replies[::2], replies[1::2]):
+        key = p["key"]
+        if isinstance(info, Exception):
+            print(f"Error inspecting series {key}: {info}")
+            continue
+        info = _parse_info(info)
+        if last and not isinstance(last, Exception):
+            _last_values[key] = float(last[1])
+
+        policy = p.get("duplicate_policy", DEFAULT_DUPLICATE_POLICY)
+        if str(info.get("duplicatePolicy") or "BLOCK").upper() != policy.upper():
+            pipe.execute_command("TS.ALTER", key, "DUPLICATE_POLICY", policy)
+            queued.append(key)
+        if p.get("rollups", True):
+            rules = {rule[0] for rule in info.get("rules") or []}
+            labels = p.get("labels", {})
+            for bucket, bucket_ms in ROLLUP_BUCKETS.items():
+                for agg in ROLLUP_AGGREGATIONS:
+                    dest = f"{key}:{bucket}:{agg}"
+                    if dest in rules:
+                        continue
+                    _queue_create(
+                        pipe, dest, {**labels, "bucket": bucket, "agg": agg},
+                        ROLLUP_RETENTION_MS[bucket], "LAST",
+                    )
+                    pipe.execute_command("TS.CREATERULE", key, dest, "AGGREGATION", agg, bucket_ms)
+                    # The rollup may exist from an earlier partial upgrade
+                    queued += [None, key]
+        _known_series.add(key)
+
+    if not queued:
+        return
+    for key, res in zip(queued, await pipe.execute(raise_on_error=False)):
+        if key is not None and isinstance(res, Exception):
+            print(f"Error upgrading series {key}: {res}")
+
+
+def _queue_create(
+    pipe: Any, key: str, labels: dict[str, str], retention: int, duplicate_policy: str
+) -> None:
+    label_args = [x for pair in labels.items() for x in pair]
+    pipe.execute_command(
+        "TS.CREATE", key,
+        "RETENTION", retention,
+        "DUPLICATE_POLICY", duplicate_policy,
+        *(["LABELS", *label_args] if label_args else []),
+    )
+
+
+async def _load_last_values(keys: list[str]) -> None:
+    """Set the change-only cache for ``keys`` to their latest stored samples.
+
+    Series that are empty or gone (e.g. FLUSHDB) are dropped from the cache,
+    so their next sample is written and a missing series recreated.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return
+    r = await get_redis()
+    pipe = r.pipeline(transaction=False)
+    for key in keys:
+        pipe.execute_command("TS.GET", key)
+    for key, res in zip(keys, await pipe.execute(raise_on_error=False)):
+        if res and not isinstance(res, Exception):
+            _last_values[key] = float(res[1])
+        else:
+            _last_values.pop(key, None)
+
+
+# --- TimeSeries bulk writer ---
+
+TS_MADD_CHUNK_SIZE = 500
+
+
+def _is_missing_series(err: Exception) -> bool:
+    return "key does not exist" in str(err).lower()
+
+
+async def _madd(
+    points: list[dict[str, Any]], chunk_size: int
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    """Send chunked TS.MADD over one pipeline. Returns (written, missing, failed)."""
+    if not points:
+        return [], [], []
+    r = await get_redis()
+    chunks = [
+        group[i:i + chunk_size]
+        for group in _slot_groups(points, lambda p: p["key"])
+        for i in range(0, len(group), chunk_size)
+    ]
+    pipe = r.pipeline(transaction=False)
+    for chunk in chunks:
+        args: list[Any] = []
+        for p in chunk:
+            args.extend((p["key"], p["timestamp"], p["value"]))
+        pipe.execute_command("TS.MADD", *args)
+
+    written, missing, failed = [], [], []
+    for chunk, reply in zip(chunks, await pipe.execute(raise_on_error=False)):
+        if isinstance(reply, Exception):
+            reply = [reply] * len(chunk)
+        for p, res in zip(chunk, reply):
+            if not isinstance(res, Exception):
+                written.append(p)
+            elif _is_missing_series(res):
+                missing.append(p)
+            else:
+                failed.append({"key": p["key"], "timestamp": p["timestamp"], "error": str(res)})
+    return written, missing, failed
+
+
+async def ts_add_many(
+    points: list[dict[str, Any]],
+    chunk_size: int = TS_MADD_CHUNK_SIZE,
+    only_changed: bool = False,
+) -> dict[str, Any]:
+    """Write TimeSeries samples in chunked TS.MADD calls over one pipeline.
+
+    Each point is ``{"key", "timestamp" (epoch ms), "value", "labels"}`` and
+    may carry ``retention`` / ``duplicate_policy`` used when the series is
+    first created. With ``only_changed``, samples equal to the last value
+    written to their series are skipped. Returns counts of written and
+    skipped samples plus the points Redis rejected.
+    """
+    if not points:
+        return {"written": 0, "skipped": 0, "failed": []}
+
+    await ensure_series(points)
+
+    skipped = 0
+    if only_changed:
+        # Read the series not cached yet, and confirm cached values before
+        # skipping on them; differing samples are written without a read
+        await _load_last_values([
+            p["key"] for p in points
+            if _last_values.get(p["key"], float(p["value"])) == float(p["value"])
+        ])
+        pending: dict[str, float] = {}
+        changed = []
+        for p in points:
+            last = pending.get(p["key"], _last_values.get(p["key"]))
+            if last is not None and float(p["value"]) == last:
+                skipped += 1
+                continue
+            pending[p["key"]] = float(p["value"])
+            changed.append(p)
+        points = changed
+
+    written, missing, failed = await _madd(points, chunk_size)
+    if missing:
+        # Series deleted behind our back (e.g. FLUSHDB) — recreate and retry once
+        for p in missing:
+            _known_series.discard(p["key"])
+            _last_values.pop(p["key"], None)
+        await ensure_series(missing)
+        retried, missing, retry_failed = await _madd(missing, chunk_size)
+        written.extend(retried)
+        failed.extend(retry_failed)
+        failed.extend(
+            {"key": p["key"], "timestamp": p["timestamp"], "error": "series does not exist"}
+            for p in missing
+        )
+
+    for p in written:
+        _last_values[p["key"]] = float(p["value"])
+    # A rejected sample leaves the stored last value unknown; forget it so
+    # the next change-only write re-reads it with TS.GET
+    for f in failed:
+        _last_values.pop(f["key"], None)
+
+    return {"written": len(written), "skipped": skipped, "failed": failed}
 
 
 # --- JSON helpers ---
@@ -141,7 +614,7 @@ async def store_json(key: str, data: dict[str, Any]) -> None:
 
 
 async def get_json(key: str) -> dict[str, Any] | None:
-    r = await get_redis()
+    r = await get_read_redis()
     try:
         raw = await r.execute_command("JSON.GET", key)
         if raw:
@@ -151,13 +624,207 @@ async def get_json(key: str) -> dict[str, Any] | None:
     return None
 
 
+JSON_MGET_CHUNK_SIZE = 500
+
+
+async def get_json_many(
+    keys: list[str],
+    fields: list[str] | dict[str, str] | None = None,
+) -> list[dict[str, Any] | None]:
+    """Fetch many JSON documents in one round trip, aligned with ``keys``.
+
+    Without ``fields`` whole documents are read with chunked JSON.MGET.
+    ``fields`` projects each document to just those JSONPaths (relative to
+    the root, e.g. ``"predictions[0].predicted_price"``); pass a dict to
+    rename them as ``{name: path}``. Missing keys yield ``None``, missing
+    fields yield ``None`` values.
+    """
+    if not keys:
+        return []
+    if isinstance(fields, list):
+        fields = {f: f for f in fields}
+
+    r = await get_read_redis()
+    pipe = r.pipeline(transaction=False)
+    use_mget = not fields or len(fields) == 1
+    if use_mget:
+        path = f"$.{next(iter(fields.values()))}" if fields else "$"
+        # Chunks of positions into ``keys``, each within one cluster slot
+        chunks = [
+            group[i:i + JSON_MGET_CHUNK_SIZE]
+            for group in _slot_groups(list(range(len(keys))), lambda i: keys[i])
+            for i in range(0, len(group), JSON_MGET_CHUNK_SIZE)
+        ]
+        for chunk in chunks:
+            pipe.execute_command("JSON.MGET", *[keys[i] for i in chunk], path)
+    else:
+        # JSON.MGET takes a single path, so multi-field projections use one
+        # multi-path JSON.GET per key, still sent as a single pipeline
+        paths = [f"$.{p}" for p in fields.values()]
+        for key in keys:
+            pipe.execute_command("JSON.GET", key, *paths)
+
+    replies = await pipe.execute(raise_on_error=False)
+    if use_mget:
+        ordered: list[Any] = [None] * len(keys)
+        for chunk, reply in zip(chunks, replies):
+            if not isinstance(reply, Exception):
+                for i, raw in zip(chunk, reply):
+                    ordered[i] = raw
+        replies = ordered
+
+    results: list[dict[str, Any] | None] = []
+    for raw in replies:
+        if not raw or isinstance(raw, Exception):
+            results.append(None)
+            continue
+        decoded = json.loads(raw)
+        if not fields:
+            results.append(decoded[0] if decoded else None)
+        elif use_mget:
+            name = next(iter(fields))
+            results.append({name: decoded[0] if decoded else None})
+        else:
+            results.append({
+                name: (decoded.get(f"$.{path}") or [None])[0]
+                for name, path in fields.items()
+            })
+    return results
+
+
+# --- Versioned JSON commits ---
+
+# Compare-and-swap on a document's $.version: apply partial JSONPath writes
+# and deletes, then bump the version, all in one server-side step.
+# ARGV: expected version, number of sets, (path, json) pairs, paths to delete.
+_VERSIONED_COMMIT_LUA = """
+local raw = redis.call('JSON.GET', KEYS[1], '$.version')
+if not raw then return -1 end
+local current = cjson.decode(raw)[1] or 0
+if current ~= tonumber(ARGV[1]) then return -1 end
+local n = tonumber(ARGV[2])
+for i = 3, 2 + 2 * n, 2 do
+  redis.call('JSON.SET', KEYS[1], '$.' .. ARGV[i], ARGV[i + 1])
+end
+for i = 3 + 2 * n, #ARGV do
+  redis.call('JSON.DEL', KEYS[1], '$.' .. ARGV[i])
+end
+redis.call('JSON.SET', KEYS[1], '$.version', current + 1)
+return current + 1
+"""
+
+_versioned_commit = None
+
+
+@local_script(_VERSIONED_COMMIT_LUA)
+def _versioned_commit_local(store: MemoryRedis, keys: list[str], args: list[Any]) -> int:
+    """In-process twin of the Lua script above."""
+    key = keys[0]
+    raw = store._cmd_execute_command("JSON.GET", key, "$.version")
+    if not raw:
+        return -1
+    found = json.loads(raw)
+    current = found[0] if found else 0
+    if current != int(args[0]):
+        return -1
+    n = int(args[1])
+    for i in range(2, 2 + 2 * n, 2):
+        store._cmd_execute_command("JSON.SET", key, f"$.{args[i]}", args[i + 1])
+    for path in args[2 + 2 * n:]:
+        store._cmd_execute_command("JSON.DEL", key, f"$.{path}")
+    store._cmd_execute_command("JSON.SET", key, "$.version", json.dumps(current + 1))
+    return current + 1
+
+
+async def commit_json_changes(
+    key: str,
+    expected_version: int,
+    sets: dict[str, Any],
+    deletes: list[str] | None = None,
+) -> int | None:
+    """Atomically apply ``sets`` / ``deletes`` if ``$.version`` is unchanged.
+
+    Paths are relative to the document root (e.g. ``"edges['a->b']"``).
+    Returns the new version, or ``None`` if the document is missing or
+    another writer committed first — the caller should re-read and retry.
+    """
+    global _versioned_commit
+    r = await get_redis()
+    if _versioned_commit is None:
+        _versioned_commit = r.register_script(_VERSIONED_COMMIT_LUA)
+
+    args: list[Any] = [expected_version, len(sets)]
+    for path, value in sets.items():
+        args.extend((path, json.dumps(value)))
+    args.extend(deletes or [])
+
+    new_version = await _versioned_commit(keys=[key], args=args, client=r)
+    return None if int(new_version) < 0 else int(new_version)
+
+
 async def push_to_list(key: str, data: dict[str, Any], max_len: int = 1000) -> None:
     r = await get_redis()
-    await r.lpush(key, json.dumps(data))
-    await r.ltrim(key, 0, max_len - 1)
+    pipe = r.pipeline(transaction=False)
+    pipe.lpush(key, json.dumps(data))
+    pipe.ltrim(key, 0, max_len - 1)
+    await pipe.execute()
 
 
 async def get_list(key: str, limit: int = 50) -> list[dict[str, Any]]:
-    r = await get_redis()
+    r = await get_read_redis()
     raw = await r.lrange(key, 0, limit - 1)
     return [json.loads(item) for item in raw]
+
+
+# --- Event logs ---
+
+def _stream_key(key: str) -> str | None:
+    """Stream backing ``key``, or None when event logs are plain lists."""
+    if get_settings().event_log_backend == "stream":
+        # Separate key so switching backends never hits WRONGTYPE
+        return f"{key}:stream"
+    return None
+
+
+async def append_events(
+    key: str, events: list[dict[str, Any]], max_len: int = 1000
+) -> None:
+    """Append events (oldest first) to an event log in one pipelined call.
+
+    The list backend does one LPUSH + LTRIM; the stream backend one
+    ``XADD MAXLEN ~`` per event, all in a single round trip.
+    """
+    if not events:
+        return
+    r = await get_redis()
+    pipe = r.pipeline(transaction=False)
+    stream = _stream_key(key)
+    if stream:
+        for event in events:
+            pipe.xadd(stream, {"data": json.dumps(event)}, maxlen=max_len, approximate=True)
+    else:
+        pipe.lpush(key, *[json.dumps(event) for event in events])
+        pipe.ltrim(key, 0, max_len - 1)
+    await pipe.execute()
+
+
+async def read_events(
+    key: str, limit: int = 50, after: str | None = None
+) -> list[dict[str, Any]]:
+    """Read an event log, newest first.
+
+    With the stream backend every event carries its stream ``id``, and
+    passing ``after`` returns up to ``limit`` events newer than that id,
+    oldest first, so consumers can tail from a cursor. The list backend
+    has no ids and ignores ``after``.
+    """
+    stream = _stream_key(key)
+    if not stream:
+        return await get_list(key, limit=limit)
+
+    r = await get_read_redis()
+    if after:
+        raw = await r.xrange(stream, min=f"({after}", count=limit)
+    else:
+        raw = await r.xrevrange(stream, count=limit)
+    return [{**json.loads(fields["data"]), "id": entry_id} for entry_id, fields in raw]
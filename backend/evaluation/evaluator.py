@@ -1,8 +1,70 @@
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 import weave
 
-from core.redis_client import get_json, store_json, get_redis
+from core.redis_client import get_json, get_json_many, store_json, get_redis, get_read_redis, read_events
+from core.keys import EVALUATIONS_INDEX, LEARNING_LOG, eval_key, meta, prediction_key
+
+# Running totals maintained at write time so metrics reads stay O(1)
+AGGREGATES_KEY = meta("metrics:aggregates")
+MAE_HISTORY_KEY = meta("metrics:mae_history")
+DA_HISTORY_KEY = meta("metrics:da_history")
+HISTORY_LEN = 100
+REBUILD_LOCK_KEY = meta("metrics:aggregates:rebuild")
+REBUILD_LOCK_TTL_S = 60
+REBUILD_WAIT_STEPS = 100  # x 0.1s
+
+_INT_FIELDS = ("evaluations", "direction_hits", "workloads_optimized")
+_FLOAT_FIELDS = ("error_sum", "savings_usd", "naive_usd")
+
+
+def _contribution(ev: dict[str, Any] | None) -> dict[str, float]:
+    """What a single evaluation adds to the running aggregates."""
+    if ev is None:
+        return {f: 0 for f in _INT_FIELDS + _FLOAT_FIELDS}
+
+    correct = bool(ev.get("direction_correct"))
+    savings = naive = 0.0
+    workloads = 0
+    if correct:
+        actual = ev.get("actual_price", 0)
+        base = ev.get("current_price", actual)
+        if ev.get("predicted_price", 0) < base:
+            savings = abs(base - actual)
+            workloads = 1
+        naive = base
+
+    return {
+        "evaluations": 1,
+        "direction_hits": 1 if correct else 0,
+        "workloads_optimized": workloads,
+        "error_sum": ev["absolute_error"],
+        "savings_usd": savings,
+        "naive_usd": naive,
+    }
+
+
+def _summarize(evals: list[dict[str, Any]]) -> dict[str, Any]:
+    """Running MAE / directional accuracy over evaluations in cycle order."""
+    mae_history = []
+    da_history = []
+    error_sum = 0.0
+    hits = 0
+
+    for n, ev in enumerate(sorted(evals, key=lambda e: e.get("cycle", 0)), 1):
+        error_sum += ev["absolute_error"]
+        hits += 1 if ev["direction_correct"] else 0
+        mae_history.append(round(error_sum / n, 6))
+        da_history.append(round(hits / n, 4))
+
+    return {
+        "total_cycles": len(evals),
+        "overall_mae": mae_history[-1] if mae_history else 0.0,
+        "directional_accuracy": da_history[-1] if da_history else 0.0,
+        "mae_history": mae_history,
+        "directional_accuracy_history": da_history,
+    }
 
 
 class PredictionEvaluator:
@@ -15,7 +77,7 @@ class PredictionEvaluator:
         actual_price: float,
     ) -> dict[str, Any]:
         """Compare a prediction against the actual price."""
-        prediction = await get_json(f"prediction:{prediction_id}")
+        prediction = await get_json(prediction_key(prediction_id))
         if prediction is None:
             return {"error": f"Prediction {prediction_id} not found"}
 
@@ -58,62 +120,137 @@ class PredictionEvaluator:
             "contributing_factors": prediction.get("contributing_factors", []),
         }
 
-        # Store evaluation
-        await store_json(f"eval:{prediction_id}", evaluation)
+        # Store evaluation (re-evaluations replace their earlier contribution)
+        previous = await get_json(eval_key(prediction_id))
+        await store_json(eval_key(prediction_id), evaluation)
+        await self._record(prediction_id, evaluation, previous)
+
+        return evaluation
+
+    async def _record(
+        self,
+        prediction_id: str,
+        evaluation: dict[str, Any],
+        previous: dict[str, Any] | None,
+    ) -> None:
+        """Index the evaluation and fold it into the running aggregates."""
+        new, old = _contribution(evaluation), _contribution(previous)
+
+        await self.ensure_aggregates()
+        r = await get_redis()
+        pipe = r.pipeline(transaction=False)
+        pipe.zadd(EVALUATIONS_INDEX, {prediction_id: evaluation["cycle"]})
+        for field in _INT_FIELDS:
+            pipe.hincrby(AGGREGATES_KEY, field, int(new[field] - old[field]))
+        for field in _FLOAT_FIELDS:
+            pipe.hincrbyfloat(AGGREGATES_KEY, field, new[field] - old[field])
+        replies = await pipe.execute()
+
+        count, hits, error_sum = int(replies[1]), int(replies[2]), float(replies[4])
+        pipe = r.pipeline(transaction=False)
+        if previous is not None:
+            # A re-evaluation corrects the latest running values, not adds one
+            pipe.rpop(MAE_HISTORY_KEY)
+            pipe.rpop(DA_HISTORY_KEY)
+        pipe.rpush(MAE_HISTORY_KEY, round(error_sum / count, 6))
+        pipe.rpush(DA_HISTORY_KEY, round(hits / count, 4))
+        pipe.ltrim(MAE_HISTORY_KEY, -HISTORY_LEN, -1)
+        pipe.ltrim(DA_HISTORY_KEY, -HISTORY_LEN, -1)
+        await pipe.execute()
+
+    async def get_aggregates(self) -> dict[str, float]:
+        """Running totals across every evaluation."""
+        r = await get_read_redis()
+        raw = await r.hgetall(AGGREGATES_KEY)
 
-        # Update prediction history
+        aggregates: dict[str, float] = {f: 0 for f in _INT_FIELDS + ("graph_versions",)}
+        aggregates.update({f: 0.0 for f in _FLOAT_FIELDS})
+        for field, value in raw.items():
+            aggregates[field] = float(value) if field in _FLOAT_FIELDS else int(value)
+        return aggregates
+
+    async def ensure_aggregates(self) -> None:
+        """Rebuild the aggregates if evaluations predate them.
+
+        Checked against the primary from the write path. One writer rebuilds
+        under a lock while the others wait, so no increment from ``_record``
+        lands between the rebuild's delete and rewrite.
+        """
         r = await get_redis()
-        await r.zadd("evaluations:index", {prediction_id: evaluation["cycle"]})
+        for _ in range(REBUILD_WAIT_STEPS):
+            if await r.hget(AGGREGATES_KEY, "evaluations") is not None:
+                return
+            if not await r.zcard(EVALUATIONS_INDEX):
+                return
+            if await r.set(REBUILD_LOCK_KEY, 1, nx=True, ex=REBUILD_LOCK_TTL_S):
+                try:
+                    await self.rebuild_aggregates()
+                finally:
+                    await r.delete(REBUILD_LOCK_KEY)
+                return
+            await asyncio.sleep(0.1)
+        print("[evaluator] timed out waiting for the aggregates rebuild")
 
-        return evaluation
+    async def rebuild_aggregates(self) -> None:
+        """Recompute the aggregates from stored evaluations.
 
-    async def get_all_evaluations(self, limit: int = 100) -> list[dict[str, Any]]:
-        """Get all evaluations ordered by cycle."""
+        A one-off migration, run by ``ensure_aggregates`` or by hand; it
+        replaces the hash outright, so don't run it alongside evaluations.
+        """
         r = await get_redis()
-        pred_ids = await r.zrevrange("evaluations:index", 0, limit - 1)
+        pred_ids = await r.zrange(EVALUATIONS_INDEX, 0, -1)
+        evals = [ev for ev in await get_json_many([eval_key(pid) for pid in pred_ids]) if ev]
+
+        totals = _contribution(None)
+        for ev in evals:
+            for field, value in _contribution(ev).items():
+                totals[field] += value
+        summary = _summarize(evals)
 
-        evals = []
-        for pid in pred_ids:
-            ev = await get_json(f"eval:{pid}")
-            if ev:
-                evals.append(ev)
+        # Graph versions were previously counted as distinct learning cycles
+        log = await read_events(LEARNING_LOG, limit=1000)
+        totals["graph_versions"] = len({e.get("cycle", 0) for e in log})
 
-        return evals
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(AGGREGATES_KEY, MAE_HISTORY_KEY, DA_HISTORY_KEY)
+        pipe.hset(AGGREGATES_KEY, mapping=totals)
+        if evals:
+            pipe.rpush(MAE_HISTORY_KEY, *summary["mae_history"][-HISTORY_LEN:])
+            pipe.rpush(DA_HISTORY_KEY, *summary["directional_accuracy_history"][-HISTORY_LEN:])
+        await pipe.execute()
+
+    async def get_all_evaluations(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Get all evaluations ordered by cycle."""
+        r = await get_read_redis()
+        pred_ids = await r.zrevrange(EVALUATIONS_INDEX, 0, limit - 1)
+        evals = await get_json_many([eval_key(pid) for pid in pred_ids])
+        return [ev for ev in evals if ev]
 
     async def compute_metrics(self, window: int | None = None) -> dict[str, Any]:
-        """Compute aggregate metrics over all (or recent N) evaluations."""
-        all_evals = await self.get_all_evaluations()
+        """Aggregate metrics over all evaluations, or recompute over the recent N.
 
+        The unwindowed path reads the write-time aggregates, so its cost does
+        not grow with history. Histories hold the last ``HISTORY_LEN`` running
+        values.
+        """
         if window:
-            all_evals = all_evals[:window]
-
-        if not all_evals:
-            return {
-                "total_cycles": 0,
-                "overall_mae": 0.0,
-                "directional_accuracy": 0.0,
-                "mae_history": [],
-                "directional_accuracy_history": [],
-            }
-
-        # Sort by cycle
-        all_evals.sort(key=lambda e: e.get("cycle", 0))
-
-        mae_history = []
-        da_history = []
-        running_errors = []
-        running_correct = []
-
-        for ev in all_evals:
-            running_errors.append(ev["absolute_error"])
-            running_correct.append(1 if ev["direction_correct"] else 0)
-            mae_history.append(round(sum(running_errors) / len(running_errors), 6))
-            da_history.append(round(sum(running_correct) / len(running_correct), 4))
+            return _summarize(await self.get_all_evaluations(limit=window))
+
+        aggregates = await self.get_aggregates()
+        count = aggregates["evaluations"]
+        if not count:
+            return _summarize([])
+
+        r = await get_read_redis()
+        pipe = r.pipeline(transaction=False)
+        pipe.lrange(MAE_HISTORY_KEY, 0, -1)
+        pipe.lrange(DA_HISTORY_KEY, 0, -1)
+        mae_history, da_history = await pipe.execute()
 
         return {
-            "total_cycles": len(all_evals),
-            "overall_mae": mae_history[-1] if mae_history else 0.0,
-            "directional_accuracy": da_history[-1] if da_history else 0.0,
-            "mae_history": mae_history,
-            "directional_accuracy_history": da_history,
+            "total_cycles": count,
+            "overall_mae": round(aggregates["error_sum"] / count, 6),
+            "directional_accuracy": round(aggregates["direction_hits"] / count, 4),
+            "mae_history": [float(v) for v in mae_history],
+            "directional_accuracy_history": [float(v) for v in da_history],
         }
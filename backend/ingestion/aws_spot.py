@@ -1,11 +1,14 @@
-import httpx
+import asyncio
 import json
 from datetime import datetime, timezone, timedelta
 from typing import Any
 import weave
 
-from ingestion.base_source import BaseSignalSource
-from core.redis_client import get_redis
+from core.keys import signal_key
+from ingestion.base_source import BaseSignalSource, timestamp_ms
+from ingestion.datasets import first_per_hour, iter_rows
+from ingestion.health import guard
+from ingestion.json_stream import JSONArrayScanner
 
 # GPU instance types relevant to ML workloads
 TARGET_INSTANCES = [
@@ -22,11 +25,16 @@ REGIONS = {
 
 # Vantage.sh public spot pricing API
 VANTAGE_URL = "https://instances.vantage.sh/aws/ec2/instances.json"
+VANTAGE_CHUNK_SIZE = 262144
 
 
 class AWSSpotSource(BaseSignalSource):
     source_id = "aws_spot"
     source_name = "AWS Spot Pricing"
+    interval_s = 300
+    timeout_s = 30
+    cache_ttl_s = 3600  # instances.json is regenerated a few times a day
+    history_dataset = "spot"
 
     @weave.op()
     async def fetch_latest(self) -> list[dict[str, Any]]:
@@ -42,53 +50,32 @@ class AWSSpotSource(BaseSignalSource):
         Source: ericpauley/aws-spot-price-history (Zenodo DOI 10.5281/zenodo.17016048)
         Data: Real AWS EC2 spot pricing for p3.2xlarge, g4dn.xlarge, g5.xlarge
               in us-east-1a, us-east-1b, us-west-2a — August 2025.
+
+        Returns the first price per instance+az per hour across every spot
+        file in data/manifest.json, read off the event loop.
         """
-        import csv
-        from pathlib import Path
-
-        data_path = Path(__file__).parent.parent / "data" / "spot_history_2025_08.csv"
-        if not data_path.exists():
-            raise FileNotFoundError(
-                f"Historical spot data not found at {data_path}. "
-                "Run the data download script first."
+        def load() -> list[tuple[int, tuple[str, ...], float]]:
+            rows = iter_rows(
+                "spot", int(start.timestamp() * 1000), int(end.timestamp() * 1000)
             )
-
-        results = []
-        with open(data_path) as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                ts = datetime.fromisoformat(row["timestamp"].replace("Z", "+00:00"))
-                if start <= ts < end:
-                    results.append({
-                        "source": self.source_id,
-                        "name": f"{row['instance_type']} {row['az_name']}",
-                        "instance_type": row["instance_type"],
-                        "az": row["az_name"],
-                        "value": float(row["price"]),
-                        "unit": "USD/hr",
-                        "timestamp": ts.isoformat(),
-                    })
-
-        # Group by timestamp hour and pick nearest price per instance/az combo
-        time_buckets: dict[str, list[dict[str, Any]]] = {}
-        for item in results:
-            ts = datetime.fromisoformat(item["timestamp"])
-            bucket = ts.strftime("%Y-%m-%dT%H:00:00+00:00")
-            if bucket not in time_buckets:
-                time_buckets[bucket] = []
-            # Deduplicate: keep first price per instance+az per hour
-            key = f"{item['instance_type']}:{item['az']}"
-            if not any(f"{x['instance_type']}:{x['az']}" == key for x in time_buckets[bucket]):
-                item["timestamp"] = bucket
-                time_buckets[bucket].append(item)
-
-        # Flatten back and sort
-        results = []
-        for bucket_items in time_buckets.values():
-            results.extend(bucket_items)
-        results.sort(key=lambda x: x["timestamp"])
-
-        return results
+            return list(first_per_hour(rows))
+
+        return [self.history_item(*row) for row in await asyncio.to_thread(load)]
+
+    def history_item(
+        self, hour_ms: int, key: tuple[str, ...], price: float
+    ) -> dict[str, Any]:
+        """A signal for one hourly spot price row from the datasets."""
+        instance_type, az = key
+        return {
+            "source": self.source_id,
+            "name": f"{instance_type} {az}",
+            "instance_type": instance_type,
+            "az": az,
+            "value": price,
+            "unit": "USD/hr",
+            "timestamp": datetime.fromtimestamp(hour_ms / 1000, tz=timezone.utc).isoformat(),
+        }
 
     async def _fetch_public_pricing(self) -> list[dict[str, Any]]:
         """Fetch current spot pricing from public sources."""
@@ -96,35 +83,28 @@ class AWSSpotSource(BaseSignalSource):
         now = datetime.now(timezone.utc)
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(VANTAGE_URL)
-                resp.raise_for_status()
-                instances = resp.json()
-
-                for inst in instances:
-                    name = inst.get("instance_type", "")
-                    if name not in TARGET_INSTANCES:
-                        continue
-
-                    # Get spot pricing from the pricing field
-                    pricing = inst.get("pricing", {})
-                    for region, azs in REGIONS.items():
-                        region_pricing = pricing.get(region, {})
-                        linux_pricing = region_pricing.get("linux", {})
-                        spot_price = linux_pricing.get("spot", None)
-
-                        if spot_price:
-                            price = float(spot_price)
-                            for az in azs:
-                                results.append({
-                                    "source": self.source_id,
-                                    "name": f"{name} {az}",
-                                    "instance_type": name,
-                                    "az": az,
-                                    "value": price,
-                                    "unit": "USD/hr",
-                                    "timestamp": now.isoformat(),
-                                })
+            for inst in await self._fetch_target_instances():
+                name = inst["instance_type"]
+
+                # Get spot pricing from the pricing field
+                pricing = inst.get("pricing", {})
+                for region, azs in REGIONS.items():
+                    region_pricing = pricing.get(region, {})
+                    linux_pricing = region_pricing.get("linux", {})
+                    spot_price = linux_pricing.get("spot", None)
+
+                    if spot_price:
+                        price = float(spot_price)
+                        for az in azs:
+                            results.append({
+                                "source": self.source_id,
+                                "name": f"{name} {az}",
+                                "instance_type": name,
+                                "az": az,
+                                "value": price,
+                                "unit": "USD/hr",
+                                "timestamp": now.isoformat(),
+                            })
         except Exception as e:
             print(f"Error fetching public pricing: {e}")
 
@@ -154,23 +134,41 @@ class AWSSpotSource(BaseSignalSource):
 
         return results
 
-    async def store(self, data: list[dict[str, Any]]) -> None:
-        r = await get_redis()
+    async def _fetch_target_instances(self) -> list[dict[str, Any]]:
+        """Stream instances.json and return only the TARGET_INSTANCES entries.
+
+        The multi-megabyte catalogue is scanned chunk by chunk off the event
+        loop as it arrives; other instances are never parsed, and reading
+        stops once every target has been seen (on a cache miss the HTTP
+        cache finishes saving the rest in the background).
+        """
+        scanner = JSONArrayScanner("instance_type", set(TARGET_INSTANCES))
+        instances: list[dict[str, Any]] = []
+        async with guard(self), self.http.stream(
+            "GET", VANTAGE_URL, timeout=15.0, extensions={"cache_ttl": self.cache_ttl_s}
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes(VANTAGE_CHUNK_SIZE):
+                instances.extend(await asyncio.to_thread(scanner.feed, chunk))
+                if scanner.done:
+                    break
+        return instances
+
+    def to_points(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        points = []
         for item in data:
-            key = f"signal:{self.source_id}:{item['instance_type']}:{item['az']}"
-            ts_ms = int(
-                datetime.fromisoformat(item["timestamp"]).timestamp() * 1000
-            )
             try:
-                await r.execute_command(
-                    "TS.ADD", key, ts_ms, item["value"],
-                    "RETENTION", 2592000000,  # 30 days in ms
-                    "LABELS", "source", self.source_id,
-                    "instance", item["instance_type"],
-                    "az", item["az"],
-                )
-            except Exception:
-                try:
-                    await r.execute_command("TS.ADD", key, ts_ms, item["value"])
-                except Exception:
-                    pass  # Duplicate timestamp, skip
+                ts_ms = timestamp_ms(item["timestamp"])
+            except (ValueError, KeyError):
+                continue
+            points.append({
+                "key": signal_key(self.source_id, item["instance_type"], item["az"]),
+                "timestamp": ts_ms,
+                "value": item["value"],
+                "labels": {
+                    "source": self.source_id,
+                    "instance": item["instance_type"],
+                    "az": item["az"],
+                },
+            })
+        return points
@@ -1,12 +1,43 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any
+import httpx
 import weave
 
+from core.http_client import get_http_client
+from core.redis_client import ts_add_many
+
+
+def timestamp_ms(value: str) -> int:
+    """Convert an ISO-8601 timestamp to epoch milliseconds."""
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
 
 class BaseSignalSource(ABC):
     source_id: str
     source_name: str
+    # Skip samples whose value equals the last one stored for the series
+    write_on_change: bool = False
+    # Background ingestion cadence and per-run deadline (ingestion/scheduler.py)
+    interval_s: float = 3600
+    timeout_s: float = 60
+    # Freshness of cached upstream responses (core/http_cache.py); None = no cache
+    cache_ttl_s: float | None = None
+    # Upstream API quota shared by all workers (ingestion/health.py); None = unmetered
+    quota_per_minute: float | None = None
+    quota_burst: int = 1
+    # fetch_history() simulates data instead of reading a real record
+    synthetic_history: bool = False
+    # data/manifest.json dataset whose rows history_item() turns into signals
+    history_dataset: str | None = None
+
+    def __init__(self, http_client: httpx.AsyncClient | None = None):
+        self._http_client = http_client
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Client for upstream calls: the injected one, else the app-wide pool."""
+        return self._http_client or get_http_client()
 
     @weave.op()
     async def ingest(self) -> list[dict[str, Any]]:
@@ -28,6 +59,12 @@ class BaseSignalSource(ABC):
         ...
 
     @abstractmethod
-    async def store(self, data: list[dict[str, Any]]) -> None:
-        """Store fetched data to Redis."""
+    def to_points(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Map fetched items to TimeSeries points (key, timestamp, value, labels)."""
         ...
+
+    async def store(self, data: list[dict[str, Any]]) -> dict[str, Any]:
+        """Store fetched data to Redis in bulk. Returns the writer's report."""
+        return await ts_add_many(
+            self.to_points(data), only_changed=self.write_on_change
+        )
@@ -0,0 +1,303 @@
+"""Historical datasets: manifest, columnar cache and streaming readers.
+
+``data/manifest.json`` lists each dataset's key / value columns and the
+files covering it, by date range:
+
+    {"datasets": {"spot": {"key_columns": ["instance_type", "az_name"],
+                           "value_column": "price",
+                           "files": [{"start": "2025-08-01T00:00:00Z",
+                                      "end": "2025-09-01T00:00:00Z",
+                                      "path": "spot_history_2025_08.csv"}]}}}
+
+``iter_rows`` streams ``(ts_ms, key, value)`` rows across every file that
+overlaps a range, so months of history never have to sit in memory.
+Files must be sorted by timestamp.
+
+- Plain ``.csv`` files are converted once into typed column files under
+  ``data/columnar/{name}/`` (int64 epoch ms ``ts.bin``, uint16 ``key.bin``
+  codes into ``meta.json``'s ``keys``, float64 ``value.bin``) and
+  memory-mapped on later loads; ranges are found by binary search. The
+  cache is rebuilt when the CSV's size or mtime changes.
+- ``.csv.gz`` and ``.csv.zst`` files (zstd needs ``pip install zstandard``)
+  are decompressed and parsed as they're read.
+
+Everything here is blocking — call it via ``asyncio.to_thread``.
+"""
+
+import bisect
+import csv
+import gzip
+import io
+import json
+import mmap
+import os
+import tempfile
+import threading
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from itertools import groupby
+from typing import Any, Iterable, Iterator
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+COLUMNAR_DIR = DATA_DIR / "columnar"
+MANIFEST = DATA_DIR / "manifest.json"
+
+HOUR_MS = 3600 * 1000
+_COLUMNS = {"ts": "q", "key": "H", "value": "d"}
+
+
+def parse_timestamp_ms(value: str) -> int:
+    """Epoch ms of an ISO-8601 timestamp (``Z`` suffix ok, naive = UTC)."""
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() * 1000)
+
+
+class ColumnarDataset:
+    """Read-only, memory-mapped view of one converted dataset."""
+
+    def __init__(self, directory: Path, meta: dict[str, Any]):
+        self.meta = meta
+        self.key_columns: tuple[str, ...] = tuple(meta["key_columns"])
+        self.keys: list[tuple[str, ...]] = [tuple(k) for k in meta["keys"]]
+        columns = {}
+        for name, typecode in _COLUMNS.items():
+            columns[name] = self._map(directory / f"{name}.bin", typecode)
+        self.ts = columns["ts"]
+        self.key = columns["key"]
+        self.value = columns["value"]
+
+    def _map(self, path: Path, typecode: str) -> memoryview:
+        if self.meta["rows"] == 0:
+            return memoryview(array(typecode))
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mm).cast(typecode)
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def span(self, start_ms: int, end_ms: int) -> tuple[int, int]:
+        """Row indexes ``[lo, hi)`` with ``start_ms <= ts < end_ms``."""
+        return (
+            bisect.bisect_left(self.ts, start_ms),
+            bisect.bisect_left(self.ts, end_ms),
+        )
+
+    def hours(self, start_ms: int, end_ms: int) -> Iterator[int]:
+        """Start of each hour in the range that has rows, one bisect per hour."""
+        lo, hi = self.span(start_ms, end_ms)
+        while lo < hi:
+            hour = self.ts[lo] - self.ts[lo] % HOUR_MS
+            yield hour
+            lo = bisect.bisect_left(self.ts, hour + HOUR_MS, lo, hi)
+
+    def rows(self, start_ms: int, end_ms: int) -> Iterator[tuple[int, tuple[str, ...], float]]:
+        """``(ts_ms, key, value)`` for each row in the range, oldest first."""
+        lo, hi = self.span(start_ms, end_ms)
+        keys = self.keys
+        for ts, code, value in zip(self.ts[lo:hi], self.key[lo:hi], self.value[lo:hi]):
+            yield ts, keys[code], value
+
+
+def first_per_hour(
+    rows: Iterable[tuple[int, tuple[str, ...], float]],
+) -> Iterator[tuple[int, tuple[str, ...], float]]:
+    """The first row per key per hour of time-sorted ``rows``, as
+    ``(hour_ms, key, value)``, in one pass."""
+    hour = None
+    seen: set[tuple[str, ...]] = set()
+    for ts, key, value in rows:
+        bucket = ts - ts % HOUR_MS
+        if bucket != hour:
+            hour = bucket
+            seen.clear()
+        if key not in seen:
+            seen.add(key)
+            yield bucket, key, value
+
+
+def by_hour(
+    rows: Iterable[tuple[int, tuple[str, ...], float]],
+) -> Iterator[tuple[int, list[tuple[int, tuple[str, ...], float]]]]:
+    """Group time-sorted ``rows`` into ``(hour_ms, rows)``, one hour at a time."""
+    for hour, group in groupby(rows, key=lambda row: row[0] - row[0] % HOUR_MS):
+        yield hour, list(group)
+
+
+def _signature(csv_path: Path) -> dict[str, int]:
+    stat = csv_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def convert_csv(
+    csv_path: Path,
+    directory: Path,
+    key_columns: tuple[str, ...],
+    value_column: str,
+    ts_column: str = "timestamp",
+) -> dict[str, Any]:
+    """Convert ``csv_path`` into column files in ``directory``. Returns meta."""
+    codes: dict[tuple[str, ...], int] = {}
+    rows: list[tuple[int, int, float]] = []
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            key = tuple(row[c] for c in key_columns)
+            code = codes.setdefault(key, len(codes))
+            rows.append((parse_timestamp_ms(row[ts_column]), code, float(row[value_column])))
+    if len(codes) > 65535:
+        raise ValueError(f"{csv_path.name}: too many distinct keys for a uint16 code")
+    # Stable: rows sharing a timestamp keep their file order
+    rows.sort(key=lambda r: r[0])
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for i, (name, typecode) in enumerate(_COLUMNS.items()):
+        _write_atomic(directory / f"{name}.bin", array(typecode, (r[i] for r in rows)).tobytes())
+
+    meta = {
+        "source": csv_path.name,
+        **_signature(csv_path),
+        "rows": len(rows),
+        "key_columns": list(key_columns),
+        "value_column": value_column,
+        "keys": [list(k) for k in codes],
+    }
+    # Written last: a dataset is only valid once its meta is in place
+    _write_atomic(directory / "meta.json", json.dumps(meta).encode())
+    return meta
+
+
+_open: dict[Path, ColumnarDataset] = {}
+# Conversions run in worker threads; one at a time
+_lock = threading.Lock()
+
+
+def load_dataset(
+    csv_path: Path,
+    key_columns: tuple[str, ...],
+    value_column: str,
+    ts_column: str = "timestamp",
+) -> ColumnarDataset:
+    """The columnar view of ``csv_path``, converting it first if needed."""
+    if not csv_path.exists():
+        raise FileNotFoundError(
+            f"Historical data not found at {csv_path}. "
+            "Run the data download script first."
+        )
+    directory = COLUMNAR_DIR / csv_path.stem
+    with _lock:
+        signature = _signature(csv_path)
+        dataset = _open.get(csv_path)
+        if dataset is not None and all(dataset.meta[k] == v for k, v in signature.items()):
+            return dataset
+
+        try:
+            meta = json.loads((directory / "meta.json").read_text())
+        except (OSError, ValueError):
+            meta = None
+        if (
+            meta is None
+            or any(meta.get(k) != v for k, v in signature.items())
+            or meta.get("key_columns") != list(key_columns)
+            or meta.get("value_column") != value_column
+        ):
+            meta = convert_csv(csv_path, directory, key_columns, value_column, ts_column)
+
+        # A replaced dataset's maps are freed once no reader holds them
+        dataset = _open[csv_path] = ColumnarDataset(directory, meta)
+        return dataset
+
+
+# --- Manifest and streaming ---
+
+def load_manifest() -> dict[str, Any]:
+    return json.loads(MANIFEST.read_text())["datasets"]
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", newline="")
+    if path.suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(
+                f"{path.name} is zstd-compressed; install zstandard to read it"
+            ) from None
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    return open(path, newline="")
+
+
+def _stream_csv(
+    path: Path,
+    key_columns: tuple[str, ...],
+    value_column: str,
+    start_ms: int,
+    end_ms: int,
+    ts_column: str = "timestamp",
+) -> Iterator[tuple[int, tuple[str, ...], float]]:
+    """Rows of a (compressed) time-sorted CSV within the range, read lazily."""
+    with _open_text(path) as f:
+        for row in csv.DictReader(f):
+            ts = parse_timestamp_ms(row[ts_column])
+            if ts >= end_ms:
+                break
+            if ts >= start_ms:
+                yield ts, tuple(row[c] for c in key_columns), float(row[value_column])
+
+
+def iter_rows(name: str, start_ms: int, end_ms: int) -> Iterator[tuple[int, tuple[str, ...], float]]:
+    """``(ts_ms, key, value)`` rows of dataset ``name`` in ``[start_ms, end_ms)``,
+    oldest first, across all of its files in the manifest."""
+    spec = load_manifest()[name]
+    key_columns = tuple(spec["key_columns"])
+    value_column = spec["value_column"]
+    files = sorted(spec["files"], key=lambda entry: parse_timestamp_ms(entry["start"]))
+    for entry in files:
+        lo = max(start_ms, parse_timestamp_ms(entry["start"]))
+        hi = min(end_ms, parse_timestamp_ms(entry["end"]))
+        if lo >= hi:
+            continue
+        path = DATA_DIR / entry["path"]
+        if path.suffix == ".csv":
+            yield from load_dataset(path, key_columns, value_column).rows(lo, hi)
+        else:
+            yield from _stream_csv(path, key_columns, value_column, lo, hi)
+
+
+def count_hours(name: str, start_ms: int, end_ms: int) -> int:
+    """Distinct hours of ``[start_ms, end_ms)`` with rows in dataset ``name``.
+
+    Columnar files answer from their mapped timestamps; compressed files
+    are read through once.
+    """
+    spec = load_manifest()[name]
+    key_columns = tuple(spec["key_columns"])
+    value_column = spec["value_column"]
+    hours: set[int] = set()
+    for entry in spec["files"]:
+        lo = max(start_ms, parse_timestamp_ms(entry["start"]))
+        hi = min(end_ms, parse_timestamp_ms(entry["end"]))
+        if lo >= hi:
+            continue
+        path = DATA_DIR / entry["path"]
+        if path.suffix == ".csv":
+            hours.update(load_dataset(path, key_columns, value_column).hours(lo, hi))
+        else:
+            rows = _stream_csv(path, key_columns, value_column, lo, hi)
+            hours.update(hour for hour, _ in by_hour(rows))
+    return len(hours)
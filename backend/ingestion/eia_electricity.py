@@ -1,10 +1,12 @@
-import httpx
+import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Any
 import weave
 
-from ingestion.base_source import BaseSignalSource
+from core.keys import meta, signal_key
 from core.redis_client import get_redis
+from ingestion.base_source import BaseSignalSource, timestamp_ms
+from ingestion.health import guard
 from config import get_settings
 
 # EIA API v2 base
@@ -17,96 +19,197 @@ RESPONDENTS = {
     "CISO": "CAISO (California)",
 }
 
+# Respondent codes for the regions in the bundled electricity price dataset
+DATASET_RESPONDENTS = {"caiso": "CISO"}
+
+# API v2 returns at most 5000 rows per request
+EIA_PAGE_SIZE = 5000
+# Latest stored period per respondent (epoch ms); live ingests fetch only newer hours
+WATERMARK_KEY = meta("eia:watermark")
+# Lookback without a watermark, and the furthest a live ingest catches up
+INITIAL_LOOKBACK = timedelta(hours=24)
+MAX_CATCHUP = timedelta(days=30)
+
 
 class EIAElectricitySource(BaseSignalSource):
     source_id = "eia_electricity"
     source_name = "EIA Electricity"
+    interval_s = 3600
+    timeout_s = 120
+    quota_per_minute = 60  # EIA throttles bursts well below its hourly cap
+    quota_burst = 10
+    history_dataset = "electricity"
 
-    def __init__(self):
+    def __init__(self, http_client=None):
+        super().__init__(http_client)
         self.api_key = get_settings().eia_api_key
 
     @weave.op()
     async def fetch_latest(self) -> list[dict[str, Any]]:
-        """Fetch recent electricity demand data."""
+        """Fetch demand for the hours after each respondent's watermark."""
         end = datetime.now(timezone.utc)
-        start = end - timedelta(hours=24)
-        return await self._fetch_demand(start, end)
+        watermarks = await self.get_watermarks()
+        starts = {}
+        for respondent in RESPONDENTS:
+            last = watermarks.get(respondent)
+            if last is None:
+                starts[respondent] = end - INITIAL_LOOKBACK
+            else:
+                starts[respondent] = max(last + timedelta(hours=1), end - MAX_CATCHUP)
+        return await self._fetch_demand(starts, end)
 
     @weave.op()
     async def fetch_history(
         self, start: datetime, end: datetime
     ) -> list[dict[str, Any]]:
-        """Fetch historical electricity demand."""
-        return await self._fetch_demand(start, end)
+        """Fetch historical electricity demand (all pages, every respondent).
+
+        Raises if any request fails: unlike a live ingest there is no
+        watermark to resume from, so a partial window must not pass as done.
+        """
+        return await self._fetch_demand({r: start for r in RESPONDENTS}, end, strict=True)
+
+    def history_item(
+        self, hour_ms: int, key: tuple[str, ...], price: float
+    ) -> dict[str, Any]:
+        """A signal for one hourly electricity price row from the datasets."""
+        region, _, unit = key
+        respondent = DATASET_RESPONDENTS.get(region, region.upper())
+        return {
+            "source": self.source_id,
+            "name": f"{respondent} price",
+            "respondent": respondent,
+            "metric": "price",
+            "value": price,
+            "unit": unit,
+            "timestamp": datetime.fromtimestamp(hour_ms / 1000, tz=timezone.utc).isoformat(),
+        }
 
     async def _fetch_demand(
-        self, start: datetime, end: datetime
+        self, starts: dict[str, datetime], end: datetime, strict: bool = False
     ) -> list[dict[str, Any]]:
+        """Fetch each respondent from its own start time, concurrently.
+
+        With ``strict``, the first failed respondent's error is raised
+        instead of keeping whatever pages were fetched.
+        """
+        per_respondent = await asyncio.gather(*(
+            self._fetch_respondent(respondent, start, end, strict)
+            for respondent, start in starts.items()
+            if start <= end
+        ), return_exceptions=True)
+        for items in per_respondent:
+            if isinstance(items, BaseException):
+                raise items
+        return [item for items in per_respondent for item in items]
+
+    async def _fetch_respondent(
+        self, respondent: str, start: datetime, end: datetime, strict: bool = False
+    ) -> list[dict[str, Any]]:
+        """Page through one respondent's demand rows, oldest first."""
         results = []
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for respondent, label in RESPONDENTS.items():
-                try:
-                    params = {
-                        "api_key": self.api_key,
-                        "frequency": "hourly",
-                        "data[0]": "value",
-                        "facets[respondent][]": respondent,
-                        "facets[type][]": "D",  # D = Demand
-                        "start": start.strftime("%Y-%m-%dT%H"),
-                        "end": end.strftime("%Y-%m-%dT%H"),
-                        "sort[0][column]": "period",
-                        "sort[0][direction]": "desc",
-                        "length": 100,
-                    }
+        client = self.http
+        offset = 0
+        try:
+            while True:
+                params = {
+                    "api_key": self.api_key,
+                    "frequency": "hourly",
+                    "data[0]": "value",
+                    "facets[respondent][]": respondent,
+                    "facets[type][]": "D",  # D = Demand
+                    "start": start.strftime("%Y-%m-%dT%H"),
+                    "end": end.strftime("%Y-%m-%dT%H"),
+                    # Ascending keeps offsets stable while new hours are published
+                    "sort[0][column]": "period",
+                    "sort[0][direction]": "asc",
+                    "offset": offset,
+                    "length": EIA_PAGE_SIZE,
+                }
 
+                async with guard(self):
                     resp = await client.get(
                         f"{EIA_BASE}/electricity/rto/region-data/data/",
                         params=params,
+                        timeout=30.0,
                     )
                     resp.raise_for_status()
-                    data = resp.json()
-
-                    for row in data.get("response", {}).get("data", []):
-                        value = row.get("value")
-                        if value is None:
-                            continue
-                        period = row.get("period", "")
-                        results.append({
-                            "source": self.source_id,
-                            "name": f"{respondent} demand",
-                            "respondent": respondent,
-                            "metric": "demand",
-                            "value": float(value),
-                            "unit": "MWh",
-                            "timestamp": f"{period}:00:00+00:00" if "T" in period else period,
-                        })
-                except Exception as e:
-                    print(f"Error fetching EIA data for {respondent}: {e}")
-                    continue
+                body = resp.json().get("response", {})
+                rows = body.get("data", [])
+
+                for row in rows:
+                    value = row.get("value")
+                    if value is None:
+                        continue
+                    period = row.get("period", "")
+                    results.append({
+                        "source": self.source_id,
+                        "name": f"{respondent} demand",
+                        "respondent": respondent,
+                        "metric": "demand",
+                        "value": float(value),
+                        "unit": "MWh",
+                        "timestamp": f"{period}:00:00+00:00" if "T" in period else period,
+                    })
+
+                offset += len(rows)
+                if len(rows) < EIA_PAGE_SIZE or offset >= int(body.get("total") or 0):
+                    break
+        except Exception as e:
+            print(f"Error fetching EIA data for {respondent}: {e}")
+            if strict:
+                raise
+            # Keep the pages we got; the watermark resumes from there next run
 
         return results
 
-    async def store(self, data: list[dict[str, Any]]) -> None:
+    async def get_watermarks(self) -> dict[str, datetime]:
+        """Latest stored period per respondent."""
         r = await get_redis()
+        raw = await r.hgetall(WATERMARK_KEY)
+        return {
+            respondent: datetime.fromtimestamp(int(ms) / 1000, tz=timezone.utc)
+            for respondent, ms in raw.items()
+        }
+
+    async def store(self, data: list[dict[str, Any]]) -> dict[str, Any]:
+        """Store samples, then advance each respondent's watermark past them."""
+        report = await super().store(data)
+        failed = {(f["key"], f["timestamp"]) for f in report["failed"]}
+
+        latest: dict[str, int] = {}
+        for point in self.to_points(data):
+            if (point["key"], point["timestamp"]) in failed:
+                continue
+            respondent = point["labels"]["respondent"]
+            latest[respondent] = max(latest.get(respondent, 0), point["timestamp"])
+
+        if latest:
+            r = await get_redis()
+            current = await r.hgetall(WATERMARK_KEY)
+            advanced = {
+                respondent: ms for respondent, ms in latest.items()
+                if ms > int(current.get(respondent, 0))
+            }
+            if advanced:
+                await r.hset(WATERMARK_KEY, mapping=advanced)
+        return report
+
+    def to_points(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        points = []
         for item in data:
-            key = f"signal:{self.source_id}:{item['respondent']}:{item['metric']}"
             try:
-                ts_str = item["timestamp"]
-                ts = datetime.fromisoformat(ts_str)
-                ts_ms = int(ts.timestamp() * 1000)
+                ts_ms = timestamp_ms(item["timestamp"])
             except (ValueError, KeyError):
                 continue
-
-            try:
-                await r.execute_command(
-                    "TS.ADD", key, ts_ms, item["value"],
-                    "RETENTION", 2592000000,
-                    "LABELS", "source", self.source_id,
-                    "respondent", item["respondent"],
-                    "metric", item["metric"],
-                )
-            except Exception:
-                try:
-                    await r.execute_command("TS.ADD", key, ts_ms, item["value"])
-                except Exception:
-                    pass
+            points.append({
+                "key": signal_key(self.source_id, item["respondent"], item["metric"]),
+                "timestamp": ts_ms,
+                "value": item["value"],
+                "labels": {
+                    "source": self.source_id,
+                    "respondent": item["respondent"],
+                    "metric": item["metric"],
+                },
+            })
+        return points
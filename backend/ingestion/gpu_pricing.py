@@ -13,8 +13,8 @@ from datetime import datetime, timezone, timedelta
 from typing import Any
 import weave
 
-from ingestion.base_source import BaseSignalSource
-from core.redis_client import get_redis
+from core.keys import signal_key
+from ingestion.base_source import BaseSignalSource, timestamp_ms
 
 # ---------------------------------------------------------------------------
 # Current GPU cloud pricing — realistic data from provider listings
@@ -180,6 +180,10 @@ class GPUPricingSource(BaseSignalSource):
 
     source_id = "gpu_pricing"
     source_name = "GPU Cloud Pricing"
+    write_on_change = True  # listed prices rarely move between ingests
+    interval_s = 21600
+    timeout_s = 60
+    synthetic_history = True
 
     @weave.op()
     async def fetch_latest(self) -> list[dict[str, Any]]:
@@ -257,35 +261,28 @@ class GPUPricingSource(BaseSignalSource):
 
         return results
 
-    async def store(self, data: list[dict[str, Any]]) -> None:
-        """Store GPU pricing data to Redis TimeSeries."""
-        r = await get_redis()
-
+    def to_points(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Map GPU pricing items to Redis TimeSeries points."""
+        points = []
         for item in data:
             provider = item["provider"]
             gpu = item["gpu"].lower().replace(" ", "_").replace("-", "_")
             count = item["gpu_count"]
-            key = f"signal:{self.source_id}:{provider}:{gpu}_x{count}"
 
             try:
-                ts_str = item["timestamp"]
-                ts = datetime.fromisoformat(ts_str)
-                ts_ms = int(ts.timestamp() * 1000)
+                ts_ms = timestamp_ms(item["timestamp"])
             except (ValueError, KeyError):
                 continue
 
-            try:
-                await r.execute_command(
-                    "TS.ADD", key, ts_ms, item["value"],
-                    "RETENTION", 2592000000,  # 30 days
-                    "LABELS",
-                    "source", self.source_id,
-                    "provider", provider,
-                    "gpu", item["gpu"],
-                    "gpu_count", str(count),
-                )
-            except Exception:
-                try:
-                    await r.execute_command("TS.ADD", key, ts_ms, item["value"])
-                except Exception:
-                    pass  # duplicate timestamp
+            points.append({
+                "key": signal_key(self.source_id, provider, f"{gpu}_x{count}"),
+                "timestamp": ts_ms,
+                "value": item["value"],
+                "labels": {
+                    "source": self.source_id,
+                    "provider": provider,
+                    "gpu": item["gpu"],
+                    "gpu_count": str(count),
+                },
+            })
+        return points
@@ -0,0 +1,203 @@
+"""Upstream health for signal sources: circuit breaker, backoff, quotas.
+
+Sources wrap each upstream call in ``guard``:
+
+    async with guard(self):
+        resp = await self.http.get(...)
+        resp.raise_for_status()
+
+- After ``FAILURE_THRESHOLD`` consecutive failures the breaker opens and
+  calls fail fast with ``SourceUnavailable`` (sources already fall back on
+  errors), so a dead upstream costs nothing per cycle. Once the cooldown
+  passes calls go through again, but the next failure re-opens it with
+  double the cooldown (up to ``MAX_COOLDOWN_S``) until one succeeds.
+- Sources with ``quota_per_minute`` take a token from a Redis token bucket
+  first, so the API quota is shared by every worker.
+
+State and counters live in a ``health:{source_id}`` hash, which also
+backs ``/signals/sources``.
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any
+
+from core.keys import meta
+from core.memory_store import MemoryRedis, local_script
+from core.redis_client import get_redis
+
+FAILURE_THRESHOLD = 3
+BASE_COOLDOWN_S = 30
+MAX_COOLDOWN_S = 1800
+# Longest a call waits for a quota token before giving up
+MAX_QUOTA_WAIT_S = 10.0
+
+
+class SourceUnavailable(Exception):
+    """The breaker is open or the quota is exhausted; no request was made."""
+
+
+def health_key(source_id: str) -> str:
+    return meta(f"health:{source_id}")
+
+
+def bucket_key(source_id: str) -> str:
+    return meta(f"ratelimit:{source_id}")
+
+
+# --- Token bucket ---
+
+# KEYS[1]: bucket hash. ARGV: refill rate (tokens/s), burst, tokens wanted.
+# Takes the tokens and returns 0, or returns the ms to wait for them.
+# Uses the server clock so every worker agrees on the refill.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or burst
+local ts = tonumber(b[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  wait = math.ceil((cost - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return wait
+"""
+
+_token_bucket = None
+
+
+@local_script(_TOKEN_BUCKET_LUA)
+def _token_bucket_local(store: MemoryRedis, keys: list[str], args: list[Any]) -> int:
+    """In-process twin of the Lua script above."""
+    rate, burst, cost = float(args[0]), float(args[1]), float(args[2])
+    now = time.time()
+    state = store._cmd_hgetall(keys[0])
+    tokens = float(state.get("tokens", burst))
+    ts = float(state.get("ts", now))
+    tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+    wait = 0
+    if tokens >= cost:
+        tokens -= cost
+    else:
+        wait = math.ceil((cost - tokens) / rate * 1000)
+    store._cmd_hset(keys[0], mapping={"tokens": tokens, "ts": now})
+    store._cmd_expire(keys[0], math.ceil(burst / rate) + 60)
+    return wait
+
+
+async def acquire_quota(source: Any, cost: int = 1) -> None:
+    """Take ``cost`` tokens from the source's shared bucket, waiting if needed."""
+    global _token_bucket
+    per_minute = getattr(source, "quota_per_minute", None)
+    if not per_minute:
+        return
+    r = await get_redis()
+    if _token_bucket is None:
+        _token_bucket = r.register_script(_TOKEN_BUCKET_LUA)
+
+    rate = per_minute / 60.0
+    deadline = time.monotonic() + MAX_QUOTA_WAIT_S
+    while True:
+        wait_ms = int(await _token_bucket(
+            keys=[bucket_key(source.source_id)],
+            args=[rate, source.quota_burst, cost],
+            client=r,
+        ))
+        if wait_ms <= 0:
+            return
+        if time.monotonic() + wait_ms / 1000 > deadline:
+            await r.hincrby(health_key(source.source_id), "rejected", 1)
+            raise SourceUnavailable(f"{source.source_id} quota exhausted")
+        await asyncio.sleep(wait_ms / 1000)
+
+
+# --- Circuit breaker ---
+
+def _cooldown_s(trips: int) -> float:
+    return min(MAX_COOLDOWN_S, BASE_COOLDOWN_S * 2 ** max(0, trips - 1))
+
+
+@asynccontextmanager
+async def guard(source: Any, cost: int = 1):
+    """Run one upstream call under the source's breaker and quota.
+
+    Failures of the wrapped block are recorded and re-raised.
+    """
+    source_id = source.source_id
+    key = health_key(source_id)
+    r = await get_redis()
+
+    open_until = float(await r.hget(key, "open_until") or 0)
+    if open_until > time.time():
+        await r.hincrby(key, "rejected", 1)
+        raise SourceUnavailable(
+            f"{source_id} circuit open for {open_until - time.time():.0f}s more"
+        )
+    await acquire_quota(source, cost)
+
+    started = time.monotonic()
+    try:
+        yield
+    except SourceUnavailable:
+        raise
+    except Exception as e:
+        latency_ms = int((time.monotonic() - started) * 1000)
+        pipe = r.pipeline(transaction=False)
+        pipe.hincrby(key, "errors", 1)
+        pipe.hincrby(key, "consecutive_failures", 1)
+        pipe.hset(key, mapping={
+            "last_error": str(e) or type(e).__name__,
+            "last_error_at": datetime.now(timezone.utc).isoformat(),
+            "last_latency_ms": latency_ms,
+        })
+        _, failures, _ = await pipe.execute()
+        if int(failures) >= FAILURE_THRESHOLD:
+            trips = await r.hincrby(key, "trips", 1)
+            cooldown = _cooldown_s(int(trips))
+            await r.hset(key, "open_until", time.time() + cooldown)
+            print(f"[health] {source_id} circuit open for {cooldown:.0f}s after {failures} failures")
+        raise
+    else:
+        pipe = r.pipeline(transaction=False)
+        pipe.hset(key, mapping={
+            "last_success": datetime.now(timezone.utc).isoformat(),
+            "last_latency_ms": int((time.monotonic() - started) * 1000),
+            "consecutive_failures": 0,
+            "trips": 0,
+            "open_until": 0,
+        })
+        pipe.hincrby(key, "successes", 1)
+        await pipe.execute()
+
+
+async def get_health(source_id: str) -> dict[str, Any]:
+    """Breaker state and call counters for one source."""
+    r = await get_redis()
+    raw = await r.hgetall(health_key(source_id))
+    open_until = float(raw.get("open_until") or 0)
+    return {
+        "circuit": "open" if open_until > time.time() else "closed",
+        "open_until": (
+            datetime.fromtimestamp(open_until, tz=timezone.utc).isoformat()
+            if open_until > time.time() else None
+        ),
+        "last_success": raw.get("last_success"),
+        "last_error": raw.get("last_error") or None,
+        "last_error_at": raw.get("last_error_at"),
+        "last_latency_ms": int(raw["last_latency_ms"]) if raw.get("last_latency_ms") else None,
+        "successes": int(raw.get("successes") or 0),
+        "errors": int(raw.get("errors") or 0),
+        "rejected": int(raw.get("rejected") or 0),
+        "consecutive_failures": int(raw.get("consecutive_failures") or 0),
+    }
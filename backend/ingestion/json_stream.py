@@ -0,0 +1,84 @@
+"""Incremental scanner for large top-level JSON arrays of objects.
+
+Feeds raw body chunks through a small tokenizer that only tracks strings
+and braces, so elements are located without building Python objects for
+them. Only elements whose top-level ``key`` field is in ``wanted`` are
+handed to ``json.loads``; the rest are dropped as soon as their ``key``
+is seen, without buffering the remainder. ``feed`` is CPU-bound — call
+it via ``asyncio.to_thread``.
+"""
+
+import codecs
+import json
+import re
+from typing import Any
+
+# A complete string, an unterminated string (need more input), or a brace
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|"|[{}\[\]]')
+_COLON = re.compile(r"\s*:\s*")
+
+
+class JSONArrayScanner:
+    def __init__(self, key: str, wanted: set[str]):
+        self._key_token = json.dumps(key)
+        self.wanted = set(wanted)
+        self.found: set[str] = set()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        # Offset of the element being kept, or None outside / when skipping
+        self._start: int | None = None
+        self._value: str | None = None  # the current element's ``key`` value
+        self._key_end: int | None = None  # end of a just-seen ``key`` token
+
+    @property
+    def done(self) -> bool:
+        """True once every wanted element has been seen."""
+        return self.found >= self.wanted
+
+    def feed(self, chunk: bytes) -> list[dict[str, Any]]:
+        """Consume a chunk; return the wanted elements it completed."""
+        self._buf += self._decoder.decode(chunk)
+        matches: list[dict[str, Any]] = []
+        resume = len(self._buf)
+        for m in _TOKEN.finditer(self._buf, self._pos):
+            token = m.group()
+            if token == '"':
+                # String continues in the next chunk
+                resume = m.start()
+                break
+            key_end, self._key_end = self._key_end, None
+            if token[0] == '"':
+                if self._depth != 2:
+                    continue
+                if token == self._key_token:
+                    self._key_end = m.end()
+                elif key_end is not None and _COLON.fullmatch(self._buf, key_end, m.start()):
+                    self._value = json.loads(token)
+                    if self._value not in self.wanted:
+                        self._start = None  # stop buffering this element
+                continue
+            if token in "{[":
+                self._depth += 1
+                if self._depth == 2 and token == "{":
+                    self._start = m.start()
+                    self._value = None
+            else:
+                if self._depth == 2 and token == "}":
+                    if self._start is not None and self._value in self.wanted:
+                        self.found.add(self._value)
+                        matches.append(json.loads(self._buf[self._start:m.end()]))
+                    self._start = None
+                self._depth -= 1
+
+        # Keep only what's still needed: the open element or an unfinished token
+        keep = self._start if self._start is not None else resume
+        if self._key_end is not None:
+            keep = min(keep, self._key_end)
+            self._key_end -= keep
+        self._buf = self._buf[keep:]
+        self._pos = resume - keep
+        if self._start is not None:
+            self._start -= keep
+        return matches
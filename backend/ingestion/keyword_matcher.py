@@ -0,0 +1,66 @@
+"""Aho-Corasick keyword matcher for headline classification.
+
+Compiles several keyword dictionaries into one automaton, so a headline is
+scanned once for every keyword in every category — cost is linear in the
+text length regardless of how many keywords there are. Matching is plain
+lowercase substring matching, the same as ``kw in title.lower()``.
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """Multi-category substring matcher built once from keyword lists."""
+
+    def __init__(self, categories: dict[str, list[str]]):
+        self.categories = list(categories)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Per state: (category, keyword) pairs ending there, incl. via fail links
+        self._out: list[list[tuple[str, str]]] = [[]]
+
+        for category, keywords in categories.items():
+            for kw in keywords:
+                kw = kw.lower()
+                if not kw:
+                    continue
+                state = 0
+                for ch in kw:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append([])
+                    state = nxt
+                self._out[state].append((category, kw))
+
+        # Breadth-first so a state's fail target is finished before it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def match(self, text: str) -> dict[str, set[str]]:
+        """Distinct keywords found in ``text``, by category."""
+        found: dict[str, set[str]] = {c: set() for c in self.categories}
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for category, kw in out[state]:
+                found[category].add(kw)
+        return found
+
+    def match_many(self, texts: list[str]) -> list[dict[str, set[str]]]:
+        return [self.match(t) for t in texts]
@@ -0,0 +1,138 @@
+"""Near-duplicate headline detection with MinHash + LSH.
+
+The same wire story is syndicated under slightly different titles. Each
+headline gets a MinHash signature over its word set; signatures are split
+into ``BANDS`` bands and two headlines are compared only if they share a
+band, then kept apart unless their estimated Jaccard similarity reaches
+``SIMILARITY_THRESHOLD``.
+
+Signatures of headlines already stored live in the ``news:fingerprints``
+sorted set (scored by epoch ms), trimmed to a rolling ``window_s`` so a
+story recurring days later counts again. Checking and recording are
+separate steps: a headline is only recorded once it has been stored, so a
+failed write doesn't suppress it for the whole window.
+"""
+
+import hashlib
+import re
+import time
+from typing import Any
+
+from core.keys import meta
+from core.redis_client import get_redis
+
+FINGERPRINTS = meta("news:fingerprints")
+
+NUM_PERM = 64
+BANDS = 16  # 4 rows each: pairs at J=0.7 share a band with p≈0.99
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.7
+DEDUPE_WINDOW_S = 48 * 3600
+
+_PRIME = (1 << 61) - 1
+# Fixed universal-hash permutations so signatures stay comparable across runs
+_PERMS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _PRIME or 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _PRIME,
+    )
+    for i in range(NUM_PERM)
+]
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def signature(text: str) -> tuple[int, ...] | None:
+    """16-bit MinHash signature of the words in ``text``; None if it has none."""
+    words = set(_WORD.findall(text.lower()))
+    if not words:
+        return None
+    hashes = [
+        int.from_bytes(hashlib.blake2b(w.encode(), digest_size=8).digest(), "big")
+        for w in words
+    ]
+    return tuple(
+        min((a * h + b) % _PRIME for h in hashes) & 0xFFFF for a, b in _PERMS
+    )
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def encode(sig: tuple[int, ...]) -> str:
+    return "".join(f"{v:04x}" for v in sig)
+
+
+def decode(member: str) -> tuple[int, ...]:
+    return tuple(int(member[i:i + 4], 16) for i in range(0, len(member), 4))
+
+
+class LSHIndex:
+    """In-memory band index over signatures."""
+
+    def __init__(self):
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[tuple[int, ...]]] = {}
+
+    def add(self, sig: tuple[int, ...]) -> None:
+        for band in range(BANDS):
+            key = (band, sig[band * ROWS:(band + 1) * ROWS])
+            self._buckets.setdefault(key, []).append(sig)
+
+    def contains_similar(self, sig: tuple[int, ...]) -> bool:
+        for band in range(BANDS):
+            for other in self._buckets.get((band, sig[band * ROWS:(band + 1) * ROWS]), ()):
+                if similarity(sig, other) >= SIMILARITY_THRESHOLD:
+                    return True
+        return False
+
+
+async def drop_near_duplicates(
+    items: list[dict[str, Any]],
+    window_s: int = DEDUPE_WINDOW_S,
+    use_index: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Keep the first of each group of near-duplicate ``title``s, checked
+    against each other and, with ``use_index``, against headlines recorded
+    within ``window_s``. With ``use_index`` kept items are copies carrying
+    their encoded signature as ``fingerprint``, for ``record_fingerprints``
+    once they're stored. If Redis is unavailable, only duplicates within
+    ``items`` are dropped.
+    """
+    now_ms = int(time.time() * 1000)
+    index = LSHIndex()
+    seen: list[str] = []
+    if use_index:
+        try:
+            r = await get_redis()
+            await r.zremrangebyscore(FINGERPRINTS, "-inf", now_ms - window_s * 1000)
+            seen = await r.zrangebyscore(FINGERPRINTS, now_ms - window_s * 1000, "+inf")
+        except Exception as e:
+            print(f"[news] fingerprint index unavailable: {e}")
+    for member in seen:
+        index.add(decode(member))
+
+    kept = []
+    for item in items:
+        sig = signature(item.get("title", ""))
+        if sig is None:
+            kept.append(item)
+            continue
+        if index.contains_similar(sig):
+            continue
+        index.add(sig)
+        kept.append({**item, "fingerprint": encode(sig)} if use_index else item)
+    return kept
+
+
+async def record_fingerprints(fingerprints: list[str]) -> None:
+    """Add stored headlines' signatures to the rolling index."""
+    if not fingerprints:
+        return
+    now_ms = int(time.time() * 1000)
+    try:
+        r = await get_redis()
+        await r.zadd(FINGERPRINTS, {fp: now_ms for fp in fingerprints})
+    except Exception as e:
+        print(f"[news] could not record fingerprints: {e}")
@@ -13,8 +13,12 @@ from datetime import datetime, timezone, timedelta
 from typing import Any
 import weave
 
-from ingestion.base_source import BaseSignalSource
-from core.redis_client import get_redis
+from ingestion.base_source import BaseSignalSource, timestamp_ms
+from ingestion.health import guard
+from ingestion.keyword_matcher import KeywordMatcher
+from ingestion.near_duplicates import drop_near_duplicates, record_fingerprints
+from core.redis_client import append_events, get_redis, ts_add_many
+from core.keys import NEWS_HEADLINES, signal_key
 from config import get_settings
 
 # ---------------------------------------------------------------------------
@@ -90,6 +94,17 @@ HEADLINES_SCHEMA = {
     "required": ["headlines"],
 }
 
+# Concurrent Browserbase sessions while scraping NEWS_TARGETS
+STAGEHAND_MAX_SESSIONS = 3
+# navigate() returns once the network has gone idle (bounded), so the
+# client-rendered lists are in place; extract() (a paid LLM call) runs once
+NAVIGATE_TIMEOUT_MS = 15000
+
+# Sentiment is stored as per-outlet statistics over this interval, one
+# sample per interval stamped with its start
+SENTIMENT_INTERVAL_S = 3600
+SENTIMENT_METRICS = ("sentiment", "sentiment_count", "sentiment_max")
+
 # ---------------------------------------------------------------------------
 # Relevance filter — keep only headlines related to compute/energy
 # ---------------------------------------------------------------------------
@@ -106,10 +121,50 @@ RELEVANCE_KEYWORDS = [
 ]
 
 
+_MATCHER = KeywordMatcher({
+    "relevance": RELEVANCE_KEYWORDS,
+    "bullish": BULLISH_KEYWORDS,
+    "bearish": BEARISH_KEYWORDS,
+})
+
+
+def _score(bull_hits: int, bear_hits: int) -> tuple[str, float]:
+    if bull_hits > bear_hits:
+        score = min(1.0, 0.3 + 0.2 * bull_hits)
+        return "bullish", round(score, 2)
+    elif bear_hits > bull_hits:
+        score = max(-1.0, -0.3 - 0.2 * bear_hits)
+        return "bearish", round(score, 2)
+    else:
+        return "neutral", 0.0
+
+
+def classify_headlines(titles: list[str]) -> list[dict[str, Any]]:
+    """
+    Classify a batch of headlines in one pass over their text.
+
+    Each result has ``relevant``, ``bullish_hits`` / ``bearish_hits``
+    (distinct keywords matched), ``keywords`` (sorted matched terms),
+    and the ``sentiment`` label and ``score`` in [-1.0, 1.0].
+    """
+    results = []
+    for found in _MATCHER.match_many(titles):
+        bull_hits, bear_hits = len(found["bullish"]), len(found["bearish"])
+        label, score = _score(bull_hits, bear_hits)
+        results.append({
+            "relevant": bool(found["relevance"]),
+            "bullish_hits": bull_hits,
+            "bearish_hits": bear_hits,
+            "keywords": sorted(found["relevance"] | found["bullish"] | found["bearish"]),
+            "sentiment": label,
+            "score": score,
+        })
+    return results
+
+
 def _is_relevant(title: str) -> bool:
     """Check if a headline is relevant to compute pricing signals."""
-    lower = title.lower()
-    return any(kw in lower for kw in RELEVANCE_KEYWORDS)
+    return classify_headlines([title])[0]["relevant"]
 
 
 def _classify_sentiment(title: str) -> tuple[str, float]:
@@ -120,18 +175,8 @@ def _classify_sentiment(title: str) -> tuple[str, float]:
     Positive = bullish (prices likely to rise).
     Negative = bearish (prices likely to fall).
     """
-    lower = title.lower()
-    bull_hits = sum(1 for kw in BULLISH_KEYWORDS if kw in lower)
-    bear_hits = sum(1 for kw in BEARISH_KEYWORDS if kw in lower)
-
-    if bull_hits > bear_hits:
-        score = min(1.0, 0.3 + 0.2 * bull_hits)
-        return "bullish", round(score, 2)
-    elif bear_hits > bull_hits:
-        score = max(-1.0, -0.3 - 0.2 * bear_hits)
-        return "bearish", round(score, 2)
-    else:
-        return "neutral", 0.0
+    result = classify_headlines([title])[0]
+    return result["sentiment"], result["score"]
 
 
 # ---------------------------------------------------------------------------
@@ -157,6 +202,60 @@ FALLBACK_HEADLINES = [
 ]
 
 
+def _parse_extracted(result: Any) -> list[dict[str, Any]]:
+    """Pull ``{title, source}`` dicts out of a Stagehand extract() result."""
+    if not result or not hasattr(result, "data"):
+        return []
+    # The extract result contains a data attribute
+    extracted = result.data
+    if hasattr(extracted, "result"):
+        extracted = extracted.result
+    if isinstance(extracted, dict):
+        headlines = extracted.get("headlines", [])
+    elif isinstance(extracted, list):
+        headlines = extracted
+    else:
+        headlines = []
+    return [
+        {"title": h["title"], "source": h.get("source", "unknown")}
+        for h in headlines
+        if isinstance(h, dict) and h.get("title")
+    ]
+
+
+def aggregate_sentiment(
+    data: list[dict[str, Any]], interval_s: int = SENTIMENT_INTERVAL_S
+) -> list[dict[str, Any]]:
+    """
+    Collapse scored headlines into per-outlet, per-interval statistics.
+
+    Returns one item per (outlet, interval) with the ``mean``, ``count``
+    and ``max`` sentiment, stamped with the interval's start.
+    """
+    interval_ms = interval_s * 1000
+    groups: dict[tuple[str, int], list[float]] = {}
+    for item in data:
+        news_src = item.get("news_source", "unknown").lower().replace(" ", "_")
+        try:
+            ts_ms = timestamp_ms(item["timestamp"])
+        except (ValueError, KeyError):
+            continue
+        groups.setdefault((news_src, ts_ms - ts_ms % interval_ms), []).append(
+            float(item["value"])
+        )
+
+    stats = []
+    for (news_src, interval_start), values in groups.items():
+        stats.append({
+            "news_source": news_src,
+            "timestamp": interval_start,
+            "mean": round(sum(values) / len(values), 4),
+            "count": len(values),
+            "max": max(values),
+        })
+    return stats
+
+
 class NewsSource(BaseSignalSource):
     """
     Scrapes tech / energy news headlines via Browserbase Stagehand,
@@ -165,8 +264,12 @@ class NewsSource(BaseSignalSource):
 
     source_id = "news"
     source_name = "News Sentiment"
+    interval_s = 1800
+    timeout_s = 180  # Stagehand sessions are slow
+    synthetic_history = True
 
-    def __init__(self):
+    def __init__(self, http_client=None):
+        super().__init__(http_client)
         settings = get_settings()
         self.bb_api_key = settings.browserbase_api_key
         self.bb_project_id = settings.browserbase_project_id
@@ -180,31 +283,36 @@ class NewsSource(BaseSignalSource):
     @weave.op()
     async def fetch_latest(self) -> list[dict[str, Any]]:
         """Fetch and classify recent news headlines."""
-        if self._has_browserbase:
-            raw_headlines = await self._scrape_with_stagehand()
-        else:
-            raw_headlines = self._get_fallback_headlines()
+        scraped = await self._scrape_with_stagehand() if self._has_browserbase else []
+        # Fall back to sample headlines if scraping is off or failed entirely
+        raw_headlines = scraped or self._get_fallback_headlines()
+
+        # Collapse syndicated copies of a story before they're scored. The
+        # sample headlines repeat by design, so they skip the rolling index;
+        # scraped ones are recorded in it by store().
+        raw_headlines = await drop_near_duplicates(raw_headlines, use_index=bool(scraped))
 
         # Filter to relevant headlines and classify sentiment
         now = datetime.now(timezone.utc)
+        titles = [item.get("title", "") for item in raw_headlines]
         results = []
-        for item in raw_headlines:
-            title = item.get("title", "")
-            source = item.get("source", "unknown")
-
-            if not _is_relevant(title):
+        for item, title, c in zip(raw_headlines, titles, classify_headlines(titles)):
+            if not c["relevant"]:
                 continue
 
-            label, score = _classify_sentiment(title)
-            results.append({
+            result = {
                 "source": self.source_id,
                 "name": title[:120],  # truncate long headlines
-                "news_source": source,
-                "sentiment": label,
-                "value": score,
+                "news_source": item.get("source", "unknown"),
+                "sentiment": c["sentiment"],
+                "value": c["score"],
                 "unit": "sentiment",
+                "keywords": c["keywords"],
                 "timestamp": now.isoformat(),
-            })
+            }
+            if "fingerprint" in item:
+                result["fingerprint"] = item["fingerprint"]
+            results.append(result)
 
         return results
 
@@ -219,6 +327,7 @@ class NewsSource(BaseSignalSource):
         plausible sentiment over the requested range.
         """
         random.seed(42)
+        classified = classify_headlines([h["title"] for h in FALLBACK_HEADLINES])
         results = []
         current = start
 
@@ -226,9 +335,10 @@ class NewsSource(BaseSignalSource):
             # 2-4 headlines per hour block
             n_headlines = random.randint(2, 4)
             for _ in range(n_headlines):
-                headline = random.choice(FALLBACK_HEADLINES)
+                i = random.randrange(len(FALLBACK_HEADLINES))
+                headline = FALLBACK_HEADLINES[i]
                 title = headline["title"]
-                label, score = _classify_sentiment(title)
+                label, score = classified[i]["sentiment"], classified[i]["score"]
 
                 # Add some temporal noise
                 noise = random.gauss(0, 0.1)
@@ -249,52 +359,98 @@ class NewsSource(BaseSignalSource):
 
         return results
 
-    async def store(self, data: list[dict[str, Any]]) -> None:
-        """Store sentiment scores to Redis TimeSeries."""
-        r = await get_redis()
+    def to_points(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Map sentiment scores to per-outlet mean / count / max series.
 
-        for item in data:
-            # Aggregate key: one series per news source
-            news_src = item.get("news_source", "unknown").lower().replace(" ", "_")
-            key = f"signal:{self.source_id}:{news_src}:sentiment"
+        Headlines sharing a timestamp would collide in a single series, so
+        they're aggregated per interval first (see ``aggregate_sentiment``).
+        """
+        return self._stat_points(aggregate_sentiment(data))
+
+    def _stat_points(self, stats: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        points = []
+        for stat in stats:
+            news_src = stat["news_source"]
+            for metric, value in zip(
+                SENTIMENT_METRICS, (stat["mean"], stat["count"], stat["max"])
+            ):
+                points.append({
+                    "key": signal_key(self.source_id, news_src, metric),
+                    "timestamp": stat["timestamp"],
+                    "value": value,
+                    "labels": {
+                        "source": self.source_id,
+                        "news_source": news_src,
+                        "metric": metric,
+                    },
+                })
+        return points
 
-            try:
-                ts_str = item["timestamp"]
-                ts = datetime.fromisoformat(ts_str)
-                ts_ms = int(ts.timestamp() * 1000)
-            except (ValueError, KeyError):
-                continue
+    async def store(self, data: list[dict[str, Any]]) -> dict[str, Any]:
+        """Store per-outlet sentiment statistics to Redis TimeSeries.
 
-            try:
-                await r.execute_command(
-                    "TS.ADD", key, ts_ms, item["value"],
-                    "RETENTION", 2592000000,  # 30 days
-                    "LABELS",
-                    "source", self.source_id,
-                    "news_source", news_src,
-                    "metric", "sentiment",
-                )
-            except Exception:
-                try:
-                    await r.execute_command("TS.ADD", key, ts_ms, item["value"])
-                except Exception:
-                    pass  # duplicate timestamp
+        Several ingests fall in each interval; each rewrites the interval's
+        sample with its headlines merged into the statistics already stored.
+        Headlines' near-duplicate fingerprints are recorded only once their
+        statistics are written, so a failed write leaves them unsuppressed.
+        """
+        stats = await self._merge_stored(aggregate_sentiment(data))
+        report = await ts_add_many(self._stat_points(stats), only_changed=self.write_on_change)
+        if not report["failed"]:
+            await record_fingerprints([d["fingerprint"] for d in data if "fingerprint" in d])
 
         # Also store the latest batch of headlines as a JSON list for the UI
+        headlines = [{k: v for k, v in d.items() if k != "fingerprint"} for d in data]
         try:
-            from core.redis_client import push_to_list
-            for item in data:
-                await push_to_list("news:headlines", item, max_len=200)
+            await append_events(NEWS_HEADLINES, headlines, max_len=200)
         except Exception:
             pass
 
+        return report
+
+    async def _merge_stored(self, stats: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Combine ``stats`` with the statistics stored for the same intervals."""
+        if not stats:
+            return stats
+        r = await get_redis()
+        pipe = r.pipeline(transaction=False)
+        for stat in stats:
+            for metric in SENTIMENT_METRICS:
+                pipe.execute_command(
+                    "TS.GET", signal_key(self.source_id, stat["news_source"], metric)
+                )
+        replies = await pipe.execute(raise_on_error=False)
+
+        merged = []
+        for i, stat in enumerate(stats):
+            stored = replies[i * 3:i * 3 + 3]
+            if not all(
+                res and not isinstance(res, Exception) and int(res[0]) == stat["timestamp"]
+                for res in stored
+            ):
+                merged.append(stat)
+                continue
+            mean, count, top = (float(res[1]) for res in stored)
+            total = stat["count"] + int(count)
+            merged.append({
+                **stat,
+                "mean": round((stat["mean"] * stat["count"] + mean * count) / total, 4),
+                "count": total,
+                "max": max(stat["max"], top),
+            })
+        return merged
+
     # ------------------------------------------------------------------
     # Stagehand browser scraping
     # ------------------------------------------------------------------
 
     @weave.op()
     async def _scrape_with_stagehand(self) -> list[dict[str, Any]]:
-        """Use Browserbase Stagehand to scrape headlines from news sites."""
+        """Use Browserbase Stagehand to scrape headlines from news sites.
+
+        Targets are scraped concurrently, one browser session each, with at
+        most ``STAGEHAND_MAX_SESSIONS`` sessions open at a time.
+        """
         from stagehand import AsyncStagehand
 
         all_headlines: list[dict[str, Any]] = []
@@ -305,56 +461,51 @@ class NewsSource(BaseSignalSource):
                 browserbase_project_id=self.bb_project_id,
                 model_api_key=self.model_api_key,
             )
-
-            session = await client.sessions.start(
-                model_name="openai/gpt-4o-mini",
-            )
-
-            try:
-                for url, instruction in NEWS_TARGETS:
-                    try:
-                        await session.navigate(url=url)
-
-                        # Give the page a moment to fully render
-                        await asyncio.sleep(2)
-
-                        result = await session.extract(
-                            instruction=instruction,
-                            schema=HEADLINES_SCHEMA,
-                        )
-
-                        # The extract result contains a data attribute
-                        if result and hasattr(result, "data"):
-                            extracted = result.data
-                            if hasattr(extracted, "result"):
-                                extracted = extracted.result
-                            if isinstance(extracted, dict):
-                                headlines = extracted.get("headlines", [])
-                            elif isinstance(extracted, list):
-                                headlines = extracted
-                            else:
-                                headlines = []
-
-                            for h in headlines:
-                                if isinstance(h, dict) and h.get("title"):
-                                    all_headlines.append({
-                                        "title": h["title"],
-                                        "source": h.get("source", "unknown"),
-                                    })
-                    except Exception as e:
-                        print(f"[NewsSource] Error scraping {url}: {e}")
-                        continue
-            finally:
-                await session.end()
-
+            pool = asyncio.Semaphore(STAGEHAND_MAX_SESSIONS)
+            per_target = await asyncio.gather(*(
+                self._scrape_target(client, pool, url, instruction)
+                for url, instruction in NEWS_TARGETS
+            ))
+            for headlines in per_target:
+                all_headlines.extend(headlines)
         except Exception as e:
             print(f"[NewsSource] Stagehand session error: {e}")
-            # Fall back to sample headlines if scraping fails entirely
-            if not all_headlines:
-                all_headlines = self._get_fallback_headlines()
 
         return all_headlines
 
+    async def _scrape_target(
+        self, client: Any, pool: asyncio.Semaphore, url: str, instruction: str
+    ) -> list[dict[str, Any]]:
+        """Scrape one site in its own session; errors yield no headlines."""
+        async with pool:
+            try:
+                async with guard(self):
+                    session = await client.sessions.start(
+                        model_name="openai/gpt-4o-mini",
+                    )
+            except Exception as e:
+                print(f"[NewsSource] Could not start session for {url}: {e}")
+                return []
+
+            try:
+                await session.navigate(
+                    url=url,
+                    options={"wait_until": "networkidle", "timeout": NAVIGATE_TIMEOUT_MS},
+                )
+                result = await session.extract(
+                    instruction=instruction,
+                    schema=HEADLINES_SCHEMA,
+                )
+                return _parse_extracted(result)
+            except Exception as e:
+                print(f"[NewsSource] Error scraping {url}: {e}")
+                return []
+            finally:
+                try:
+                    await session.end()
+                except Exception:
+                    pass
+
     # ------------------------------------------------------------------
     # Fallback
     # ------------------------------------------------------------------
@@ -5,50 +5,60 @@ Uses real AWS spot pricing from Zenodo dataset and real CAISO electricity prices
 """
 
 import asyncio
-import csv
 import uuid
 from datetime import datetime, timezone, timedelta
-from pathlib import Path
-from typing import Any
+from itertools import groupby
+from typing import Any, Iterator
 import weave
 
 from core.redis_client import store_json, get_json, get_redis
+from core.keys import CYCLE_COUNT
 from ingestion.aws_spot import AWSSpotSource
+from ingestion.datasets import by_hour, count_hours, first_per_hour, iter_rows, load_manifest
 from prediction.predictor import PricePredictor
 from evaluation.evaluator import PredictionEvaluator
 from learning.learner import CausalLearner
 
 
-DATA_DIR = Path(__file__).parent.parent / "data"
-
-
-def _load_electricity_data(start: datetime, end: datetime) -> dict[str, list[dict[str, Any]]]:
-    """Load real CAISO electricity prices, bucketed by hour."""
-    csv_path = DATA_DIR / "electricity_caiso_2025_08.csv"
-    if not csv_path.exists():
-        return {}
-
-    buckets: dict[str, list[dict[str, Any]]] = {}
-    with open(csv_path) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            ts_str = row["timestamp"]
-            # Parse CAISO timestamp format: 2025-08-01T08:00:00-00:00
-            ts = datetime.fromisoformat(ts_str)
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            if start <= ts < end:
-                bucket = ts.strftime("%Y-%m-%dT%H:00:00+00:00")
-                if bucket not in buckets:
-                    buckets[bucket] = []
-                buckets[bucket].append({
-                    "source": row["source"],
-                    "name": row["name"],
-                    "value": float(row["value"]),
-                    "unit": row["unit"],
+def _hour_iso(hour_ms: int) -> str:
+    return datetime.fromtimestamp(hour_ms / 1000, tz=timezone.utc).isoformat()
+
+
+def _replay_buckets(
+    spot_source: AWSSpotSource, start: datetime, end: datetime
+) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """Yield ``(hour, signals)`` one hour at a time: the first spot price per
+    instance+az, plus that hour's electricity prices.
+
+    Rows stream from the dataset files, so memory stays bounded by a single
+    hour however long the range. Hours without spot prices are skipped.
+    Blocking — advance it from a worker thread.
+    """
+    start_ms, end_ms = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+    spot = groupby(
+        first_per_hour(iter_rows("spot", start_ms, end_ms)), key=lambda row: row[0]
+    )
+    electricity = (
+        by_hour(iter_rows("electricity", start_ms, end_ms))
+        if "electricity" in load_manifest() else iter(())
+    )
+    elec_hour, elec_rows = next(electricity, (None, []))
+
+    for hour_ms, rows in spot:
+        signals = [spot_source.history_item(*row) for row in rows]
+        while elec_hour is not None and elec_hour < hour_ms:
+            elec_hour, elec_rows = next(electricity, (None, []))
+        bucket = _hour_iso(hour_ms)
+        if elec_hour == hour_ms:
+            for _, (source, name, unit), value in elec_rows:
+                signals.append({
+                    "source": source,
+                    "name": name,
+                    "value": value,
+                    "unit": unit,
                     "timestamp": bucket,
                 })
-    return buckets
+        yield bucket, signals
 
 
 class ReplayEngine:
@@ -74,28 +84,11 @@ class ReplayEngine:
         start = datetime.fromisoformat(start_date).replace(tzinfo=timezone.utc)
         end = datetime.fromisoformat(end_date).replace(tzinfo=timezone.utc)
 
-        # Load real historical spot prices
-        historical_data = await self.aws_source.fetch_history(start, end)
-
-        # Load real electricity prices
-        electricity_buckets = _load_electricity_data(start, end)
-
-        # Group spot data by timestamp hour
-        time_buckets: dict[str, list[dict[str, Any]]] = {}
-        for item in historical_data:
-            ts = datetime.fromisoformat(item["timestamp"])
-            bucket_key = ts.strftime("%Y-%m-%dT%H:00:00+00:00")
-            if bucket_key not in time_buckets:
-                time_buckets[bucket_key] = []
-            time_buckets[bucket_key].append(item)
-
-        # Merge electricity data into spot buckets
-        for bucket_key, elec_signals in electricity_buckets.items():
-            if bucket_key in time_buckets:
-                time_buckets[bucket_key].extend(elec_signals)
-
-        sorted_times = sorted(time_buckets.keys())
-        total_steps = len(sorted_times)
+        # Hour buckets are read lazily; size the progress bar by the hours
+        # that have spot prices, which is one step each
+        start_ms, end_ms = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+        total_steps = await asyncio.to_thread(count_hours, "spot", start_ms, end_ms)
+        buckets = _replay_buckets(self.aws_source, start, end)
 
         # Store initial replay status
         status = {
@@ -114,12 +107,14 @@ class ReplayEngine:
         previous_prediction_id = None
 
         r = await get_redis()
-        base_cycle = int(await r.get("oracle:cycle_count") or 0)
+        base_cycle = int(await r.get(CYCLE_COUNT) or 0)
 
-        for step_idx, time_key in enumerate(sorted_times):
-            signals = time_buckets[time_key]
+        step_idx = -1
+        while (bucket := await asyncio.to_thread(next, buckets, None)) is not None:
+            time_key, signals = bucket
+            step_idx += 1
             cycle = base_cycle + step_idx + 1
-            await r.set("oracle:cycle_count", cycle)
+            await r.set(CYCLE_COUNT, cycle)
 
             # Get the p3.2xlarge us-east-1a price as ground truth
             actual_price = None
@@ -153,10 +148,10 @@ class ReplayEngine:
             previous_prediction_id = prediction["prediction_id"]
 
             # Update replay status every 5 steps
-            if step_idx % 5 == 0 or step_idx == total_steps - 1:
+            if step_idx % 5 == 0:
                 metrics = await self.evaluator.compute_metrics()
                 status.update({
-                    "progress_pct": round((step_idx + 1) / total_steps * 100, 1),
+                    "progress_pct": min(99.9, round((step_idx + 1) / max(total_steps, 1) * 100, 1)),
                     "current_date": time_key,
                     "cycles_completed": step_idx + 1,
                     "current_mae": metrics.get("overall_mae", 0.0),
@@ -169,7 +164,8 @@ class ReplayEngine:
         status.update({
             "status": "completed",
             "progress_pct": 100.0,
-            "cycles_completed": total_steps,
+            "cycles_completed": step_idx + 1,
+            "total_steps": step_idx + 1,
             "current_mae": metrics.get("overall_mae", 0.0),
             "current_directional_accuracy": metrics.get("directional_accuracy", 0.0),
         })
@@ -0,0 +1,147 @@
+"""Background ingestion scheduler.
+
+Runs every signal source on its own cadence (``interval_s``), concurrently
+and with a per-source deadline (``timeout_s``), so a slow upstream never
+holds up another source or a prediction cycle. Each run is recorded in an
+``ingest:{source_id}`` hash (last attempt / success / error / count), which
+also lets a restarted process resume the cadence instead of re-fetching.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from core.keys import meta
+from core.redis_client import get_redis
+from ingestion.base_source import BaseSignalSource
+from ingestion.aws_spot import AWSSpotSource
+from ingestion.eia_electricity import EIAElectricitySource
+from ingestion.weather import WeatherSource
+from ingestion.gpu_pricing import GPUPricingSource
+from ingestion.news import NewsSource
+
+
+def status_key(source_id: str) -> str:
+    return meta(f"ingest:{source_id}")
+
+
+class IngestionScheduler:
+    """Runs signal sources on independent cadences with deadlines."""
+
+    def __init__(self, sources: list[BaseSignalSource] | None = None):
+        if sources is None:
+            sources = [
+                AWSSpotSource(),
+                EIAElectricitySource(),
+                WeatherSource(),
+                GPUPricingSource(),
+                NewsSource(),
+            ]
+        self.sources = {s.source_id: s for s in sources}
+        # One run per source at a time, whoever triggers it
+        self._locks = {source_id: asyncio.Lock() for source_id in self.sources}
+        self._tasks: list[asyncio.Task] = []
+
+    async def run_source(self, source_id: str) -> dict[str, Any]:
+        """Ingest one source within its deadline and record the outcome.
+
+        If a run of the same source is already in flight, waits for it
+        instead of starting another.
+        """
+        source = self.sources[source_id]
+        lock = self._locks[source_id]
+        if lock.locked():
+            async with lock:
+                return await self.get_status(source_id)
+
+        async with lock:
+            started = time.monotonic()
+            status: dict[str, Any] = {"last_attempt": datetime.now(timezone.utc).isoformat()}
+            try:
+                data = await asyncio.wait_for(source.ingest(), timeout=source.timeout_s)
+                status.update(
+                    last_success=status["last_attempt"],
+                    last_count=len(data),
+                    last_error="",
+                )
+            except asyncio.TimeoutError:
+                status["last_error"] = f"timed out after {source.timeout_s}s"
+            except Exception as e:
+                status["last_error"] = str(e) or type(e).__name__
+            status["last_duration_ms"] = int((time.monotonic() - started) * 1000)
+
+            if status["last_error"]:
+                print(f"[ingest] {source_id} failed: {status['last_error']}")
+            r = await get_redis()
+            await r.hset(status_key(source_id), mapping=status)
+            return await self.get_status(source_id)
+
+    async def run_all(self, source_ids: list[str] | None = None) -> dict[str, dict[str, Any]]:
+        """Run the given sources (default: all) concurrently."""
+        ids = [s for s in (source_ids or self.sources) if s in self.sources]
+        results = await asyncio.gather(*(self.run_source(s) for s in ids))
+        return dict(zip(ids, results))
+
+    async def get_status(self, source_id: str) -> dict[str, Any]:
+        r = await get_redis()
+        return await r.hgetall(status_key(source_id))
+
+    async def seconds_since_success(self, source_id: str) -> float | None:
+        last = (await self.get_status(source_id)).get("last_success")
+        if not last:
+            return None
+        return (datetime.now(timezone.utc) - datetime.fromisoformat(last)).total_seconds()
+
+    async def is_fresh(self, source_id: str) -> bool:
+        """True if the source succeeded within its own cadence."""
+        age = await self.seconds_since_success(source_id)
+        return age is not None and age < self.sources[source_id].interval_s
+
+    async def ensure_fresh(self, source_id: str) -> None:
+        """Ingest ``source_id`` now unless its data is already fresh."""
+        if not await self.is_fresh(source_id):
+            await self.run_source(source_id)
+
+    async def _loop(self, source_id: str) -> None:
+        interval = self.sources[source_id].interval_s
+        # Resume the cadence across restarts
+        try:
+            age = await self.seconds_since_success(source_id)
+        except Exception:
+            age = None
+        if age is not None and age < interval:
+            await asyncio.sleep(interval - age)
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_source(source_id)
+            except Exception as e:
+                print(f"[ingest] {source_id} loop error: {e}")
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Start one background loop per source."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._loop(s)) for s in self.sources]
+
+    async def stop(self) -> None:
+        pending = set(self._tasks)
+        while pending:
+            for task in pending:
+                task.cancel()
+            # Before 3.12, asyncio.wait_for drops a cancel that lands as the
+            # run finishes and the loop sleeps on; cancel again until done
+            _, pending = await asyncio.wait(pending, timeout=1.0)
+        self._tasks = []
+
+
+_scheduler: IngestionScheduler | None = None
+
+
+def get_scheduler() -> IngestionScheduler:
+    """Process-wide scheduler shared by the lifespan, API and orchestrator."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = IngestionScheduler()
+    return _scheduler
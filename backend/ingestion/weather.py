@@ -4,13 +4,14 @@ Temperature affects cooling costs at data centers, which affects
 electricity demand, which affects spot pricing.
 """
 
-import httpx
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 import weave
 
-from ingestion.base_source import BaseSignalSource
-from core.redis_client import get_redis
+from core.keys import signal_key
+from ingestion.base_source import BaseSignalSource, timestamp_ms
+from ingestion.health import guard
 from config import get_settings
 
 # Data center locations (approximate)
@@ -20,18 +21,26 @@ DC_LOCATIONS = {
 }
 
 OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+# 5-day forecast in 3-hour steps (the hourly endpoint needs a paid plan)
+OPENWEATHER_FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
 
 
 class WeatherSource(BaseSignalSource):
     source_id = "weather"
     source_name = "OpenWeatherMap"
+    interval_s = 900
+    timeout_s = 30
+    cache_ttl_s = 600  # OpenWeather updates current conditions every ~10 min
+    quota_per_minute = 60  # free plan limit
+    quota_burst = 10
+    synthetic_history = True
 
     @weave.op()
     async def fetch_latest(self) -> list[dict[str, Any]]:
-        """Fetch current weather for data center locations."""
+        """Fetch current weather and the temperature forecast for every
+        data center location, all locations concurrently."""
         settings = get_settings()
         api_key = settings.openweather_api_key
-        results = []
         now = datetime.now(timezone.utc)
 
         if not api_key:
@@ -39,42 +48,86 @@ class WeatherSource(BaseSignalSource):
             return self._fallback_data(now)
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                for region_id, loc in DC_LOCATIONS.items():
-                    resp = await client.get(OPENWEATHER_URL, params={
-                        "lat": loc["lat"],
-                        "lon": loc["lon"],
-                        "appid": api_key,
-                        "units": "imperial",
-                    })
-                    resp.raise_for_status()
-                    data = resp.json()
-
-                    temp = data["main"]["temp"]
-                    humidity = data["main"]["humidity"]
-
-                    results.append({
-                        "source": self.source_id,
-                        "name": f"temperature_{region_id}",
-                        "value": round(temp, 1),
-                        "unit": "F",
-                        "timestamp": now.isoformat(),
-                        "region": region_id,
-                        "location": loc["name"],
-                    })
-                    results.append({
-                        "source": self.source_id,
-                        "name": f"humidity_{region_id}",
-                        "value": humidity,
-                        "unit": "%",
-                        "timestamp": now.isoformat(),
-                        "region": region_id,
-                        "location": loc["name"],
-                    })
+            per_location = await asyncio.gather(*(
+                self._fetch_location(region_id, loc, api_key, now)
+                for region_id, loc in DC_LOCATIONS.items()
+            ))
         except Exception as e:
             print(f"Weather API error: {e}")
             return self._fallback_data(now)
 
+        return [item for items in per_location for item in items]
+
+    async def _fetch_location(
+        self, region_id: str, loc: dict[str, Any], api_key: str, now: datetime
+    ) -> list[dict[str, Any]]:
+        params = {
+            "lat": loc["lat"],
+            "lon": loc["lon"],
+            "appid": api_key,
+            "units": "imperial",
+        }
+        async with guard(self, cost=2):
+            # A failed forecast shouldn't cost us current conditions
+            current_resp, forecast_resp = await asyncio.gather(
+                self.http.get(
+                    OPENWEATHER_URL, params=params, timeout=10.0,
+                    extensions={"cache_ttl": self.cache_ttl_s},
+                ),
+                self.http.get(
+                    OPENWEATHER_FORECAST_URL, params=params, timeout=10.0,
+                    extensions={"cache_ttl": self.cache_ttl_s},
+                ),
+                return_exceptions=True,
+            )
+            if isinstance(current_resp, Exception):
+                raise current_resp
+            current_resp.raise_for_status()
+        data = current_resp.json()
+
+        temp = data["main"]["temp"]
+        humidity = data["main"]["humidity"]
+
+        results = [
+            {
+                "source": self.source_id,
+                "name": f"temperature_{region_id}",
+                "value": round(temp, 1),
+                "unit": "F",
+                "timestamp": now.isoformat(),
+                "region": region_id,
+                "location": loc["name"],
+            },
+            {
+                "source": self.source_id,
+                "name": f"humidity_{region_id}",
+                "value": humidity,
+                "unit": "%",
+                "timestamp": now.isoformat(),
+                "region": region_id,
+                "location": loc["name"],
+            },
+        ]
+
+        try:
+            if isinstance(forecast_resp, Exception):
+                raise forecast_resp
+            forecast_resp.raise_for_status()
+            for step in forecast_resp.json().get("list", []):
+                results.append({
+                    "source": self.source_id,
+                    "name": f"temperature_forecast_{region_id}",
+                    "kind": "forecast",
+                    "value": round(step["main"]["temp"], 1),
+                    "unit": "F",
+                    # Forecast samples are keyed by the time they forecast
+                    "timestamp": datetime.fromtimestamp(step["dt"], tz=timezone.utc).isoformat(),
+                    "region": region_id,
+                    "location": loc["name"],
+                })
+        except Exception as e:
+            print(f"Weather forecast error for {region_id}: {e}")
+
         return results
 
     def _fallback_data(self, now: datetime) -> list[dict[str, Any]]:
@@ -138,21 +191,27 @@ class WeatherSource(BaseSignalSource):
 
         return results
 
-    async def store(self, data: list[dict[str, Any]]) -> None:
-        r = await get_redis()
+    def to_points(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        points = []
         for item in data:
-            key = f"signal:{self.source_id}:{item['name']}"
-            ts_ms = int(datetime.fromisoformat(item["timestamp"]).timestamp() * 1000)
             try:
-                await r.execute_command(
-                    "TS.ADD", key, ts_ms, item["value"],
-                    "RETENTION", 2592000000,
-                    "LABELS", "source", self.source_id,
-                    "name", item["name"],
-                    "region", item.get("region", ""),
-                )
-            except Exception:
-                try:
-                    await r.execute_command("TS.ADD", key, ts_ms, item["value"])
-                except Exception:
-                    pass
+                ts_ms = timestamp_ms(item["timestamp"])
+            except (ValueError, KeyError):
+                continue
+            point = {
+                "key": signal_key(self.source_id, item["name"]),
+                "timestamp": ts_ms,
+                "value": item["value"],
+                "labels": {
+                    "source": self.source_id,
+                    "name": item["name"],
+                    "region": item.get("region", ""),
+                },
+            }
+            if item.get("kind") == "forecast":
+                # Later forecast runs overwrite the same target time; rollups
+                # of forecasts aren't meaningful
+                point["labels"]["kind"] = "forecast"
+                point["rollups"] = False
+            points.append(point)
+        return points
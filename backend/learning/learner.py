@@ -2,8 +2,10 @@ from datetime import datetime, timezone
 from typing import Any
 import weave
 
-from causal.graph import CausalGraph
-from core.redis_client import push_to_list
+from causal.graph import CausalGraph, apply_edge_update
+from core.redis_client import append_events, get_redis
+from core.keys import LEARNING_LOG
+from evaluation.evaluator import AGGREGATES_KEY
 from learning.strategies import exponential_weight_update, adaptive_alpha
 
 
@@ -24,21 +26,60 @@ class CausalLearner:
         evaluation: dict[str, Any],
         cycle: int,
     ) -> dict[str, Any]:
-        """Update causal graph edge weights based on evaluation results."""
-        graph_data = await self.graph.get_graph()
+        """Update causal graph edge weights based on evaluation results.
+
+        All edge changes are planned in memory and committed to Redis in a
+        single version-checked step, so overlapping cycles can't lose updates.
+        """
+        direction_correct = evaluation.get("direction_correct", False)
+        events: list[dict[str, Any]] = []
+
+        def plan(graph_data):
+            events.clear()  # re-planned from scratch if the commit conflicts
+            return self._plan_updates(graph_data, evaluation, cycle, events)
+
+        _, new_version = await self.graph.apply(plan)
+
+        # Log all learning events
+        await append_events(LEARNING_LOG, events)
+        if events:
+            r = await get_redis()
+            await r.hincrby(AGGREGATES_KEY, "graph_versions", 1)
+
+        return {
+            "cycle": cycle,
+            "events": events,
+            "graph_version": new_version,
+            "direction_correct": direction_correct,
+        }
+
+    def _plan_updates(
+        self,
+        graph_data: dict[str, Any],
+        evaluation: dict[str, Any],
+        cycle: int,
+        events: list[dict[str, Any]],
+    ) -> tuple[dict[str, dict[str, Any]], list[str]]:
+        """Apply this evaluation's weight updates to ``graph_data`` in place.
+
+        Returns the changed edges and pruned edge keys for ``CausalGraph.commit``
+        and appends a learning event per touched edge to ``events``.
+        """
         contributing_factors = evaluation.get("contributing_factors", [])
         direction_correct = evaluation.get("direction_correct", False)
         mae_before = evaluation.get("absolute_error", 0.0)
 
         alpha = adaptive_alpha(cycle)
-        events = []
+        edges = graph_data.get("edges", {})
+        changed: dict[str, dict[str, Any]] = {}
+        pruned: list[str] = []
 
         for factor_info in contributing_factors:
             factor_id = factor_info["factor"]
             factor_direction = factor_info.get("direction", "neutral")
 
             # Find all edges from this factor
-            for edge_key, edge in graph_data.get("edges", {}).items():
+            for edge_key, edge in list(edges.items()):
                 if edge["from"] != factor_id:
                     continue
 
@@ -81,9 +122,12 @@ class CausalLearner:
                     event_type = "edge_pruned"
                     desc = (f"Pruned {factor_id} → {edge['to']} "
                             f"(weight fell to {new_weight:.3f} after incorrect predictions)")
-                    await self.graph.prune_edge(factor_id, edge["to"])
+                    del edges[edge_key]
+                    changed.pop(edge_key, None)
+                    pruned.append(edge_key)
                 else:
-                    await self.graph.update_edge(factor_id, edge["to"], new_weight)
+                    apply_edge_update(edge, new_weight)
+                    changed[edge_key] = edge
 
                 events.append({
                     "cycle": cycle,
@@ -97,16 +141,4 @@ class CausalLearner:
                     "factor": factor_id,
                 })
 
-        # Increment graph version
-        new_version = await self.graph.increment_version()
-
-        # Log all learning events
-        for event in events:
-            await push_to_list("learning:log", event)
-
-        return {
-            "cycle": cycle,
-            "events": events,
-            "graph_version": new_version,
-            "direction_correct": direction_correct,
-        }
+        return changed, pruned
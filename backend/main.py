@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,6 +6,10 @@ from dotenv import load_dotenv
 
 load_dotenv("../.env")
 
+from config import get_settings
+from core.archive import run_archival_loop
+from ingestion.scheduler import get_scheduler
+from core.http_client import close_http_client
 from core.redis_client import check_redis, close_redis
 from core.weave_setup import init_weave
 from api.router import router
@@ -13,7 +18,18 @@ from api.router import router
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_weave()
+    settings = get_settings()
+    archiver = None
+    if settings.archive_after_days > 0:
+        archiver = asyncio.create_task(run_archival_loop())
+    if settings.ingest_scheduler:
+        get_scheduler().start()
     yield
+    if archiver:
+        archiver.cancel()
+        await asyncio.gather(archiver, return_exceptions=True)
+    await get_scheduler().stop()
+    await close_http_client()
     await close_redis()
 
 
@@ -8,23 +8,23 @@ from datetime import datetime, timezone
 from typing import Any
 import weave
 
-from core.redis_client import get_latest_signals, get_redis, store_json, get_json
-from ingestion.aws_spot import AWSSpotSource
-from ingestion.eia_electricity import EIAElectricitySource
-from ingestion.weather import WeatherSource
+from core.redis_client import get_forecast_values, get_latest_signals, get_redis, store_json, get_json
+from core.keys import CYCLE_COUNT, PREDICTIONS_INDEX, cycle_key
+from ingestion.scheduler import get_scheduler
 from causal.reasoner import CausalReasoner
 from prediction.predictor import PricePredictor
 from evaluation.evaluator import PredictionEvaluator
 from learning.learner import CausalLearner
 
+# Prediction horizons (beyond 1h) that forecast signals are attached for
+FORECAST_HORIZONS_H = [4, 24]
+
 
 class OracleOrchestrator:
     """Orchestrates the full predict → evaluate → learn cycle."""
 
     def __init__(self):
-        self.aws_source = AWSSpotSource()
-        self.eia_source = EIAElectricitySource()
-        self.weather_source = WeatherSource()
+        self.ingestion = get_scheduler()
         self.reasoner = CausalReasoner()
         self.predictor = PricePredictor()
         self.evaluator = PredictionEvaluator()
@@ -32,12 +32,12 @@ class OracleOrchestrator:
 
     async def _get_cycle_count(self) -> int:
         r = await get_redis()
-        count = await r.get("oracle:cycle_count")
+        count = await r.get(CYCLE_COUNT)
         return int(count) if count else 0
 
     async def _increment_cycle(self) -> int:
         r = await get_redis()
-        return await r.incr("oracle:cycle_count")
+        return await r.incr(CYCLE_COUNT)
 
     def _extract_target_price(
         self, signals: list[dict[str, Any]],
@@ -54,7 +54,7 @@ class OracleOrchestrator:
     async def _get_previous_prediction_id(self) -> str | None:
         """Get the most recent prediction ID from Redis."""
         r = await get_redis()
-        ids = await r.zrevrange("predictions:index", 0, 0)
+        ids = await r.zrevrange(PREDICTIONS_INDEX, 0, 0)
         if ids:
             return ids[0] if isinstance(ids[0], str) else ids[0].decode()
         return None
@@ -75,12 +75,15 @@ class OracleOrchestrator:
         cycle = await self._increment_cycle()
         results: dict[str, Any] = {"cycle": cycle, "timestamp": datetime.now(timezone.utc).isoformat()}
 
-        # Step 1: Ingest fresh signals
+        # Step 1: Make sure signals are fresh (the background scheduler
+        # usually already has them; otherwise ingest spot prices now)
         if signals is None:
-            await self.aws_source.ingest()
+            await self.ingestion.ensure_fresh("aws_spot")
             signals = await get_latest_signals()
             if not signals:
                 signals = []
+            # Stored weather forecasts for the longer prediction horizons
+            signals += await get_forecast_values(FORECAST_HORIZONS_H)
         results["signal_count"] = len(signals)
 
         # Step 2: In live mode, use the freshly ingested current price
@@ -124,7 +127,7 @@ class OracleOrchestrator:
             }
 
         # Store cycle result
-        await store_json(f"cycle:{cycle}", results)
+        await store_json(cycle_key(cycle), results)
 
         return results
 
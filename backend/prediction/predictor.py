@@ -6,6 +6,7 @@ import weave
 
 from core.llm_client import get_llm_client, PREDICTOR_MODEL
 from core.redis_client import store_json, get_redis
+from core.keys import PREDICTIONS_INDEX, prediction_key
 from causal.graph import CausalGraph
 
 PREDICTION_PROMPT = """You are a compute pricing prediction engine.
@@ -119,12 +120,12 @@ class PricePredictor:
         }
 
         # Store prediction in Redis
-        await store_json(f"prediction:{prediction_id}", prediction)
+        await store_json(prediction_key(prediction_id), prediction)
 
         # Add to sorted index
         r = await get_redis()
         ts = datetime.now(timezone.utc).timestamp()
-        await r.zadd("predictions:index", {prediction_id: ts})
+        await r.zadd(PREDICTIONS_INDEX, {prediction_id: ts})
 
         return prediction
 
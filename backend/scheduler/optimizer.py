@@ -8,26 +8,31 @@ from datetime import datetime, timezone
 from typing import Any
 import weave
 
-from core.redis_client import get_json, get_redis, store_json
+from core.redis_client import get_json_many, get_read_redis, store_json
+from core.keys import PREDICTIONS_INDEX, SCHEDULER_SAVINGS, prediction_key
+from evaluation.evaluator import PredictionEvaluator
 
 
 class SchedulerOptimizer:
     """Finds optimal compute windows from prediction data."""
 
+    def __init__(self):
+        self.evaluator = PredictionEvaluator()
+
     @weave.op()
     async def get_optimal_windows(
         self, hours_ahead: int = 48
     ) -> dict[str, Any]:
         """Analyze predictions to find the best times to run compute workloads."""
-        r = await get_redis()
+        r = await get_read_redis()
 
         # Get recent predictions
-        pred_ids = await r.zrevrange("predictions:index", 0, 50)
-        predictions = []
-        for pid in pred_ids:
-            pred = await get_json(f"prediction:{pid}")
-            if pred:
-                predictions.append(pred)
+        pred_ids = await r.zrevrange(PREDICTIONS_INDEX, 0, 50)
+        predictions = await get_json_many(
+            [prediction_key(pid) for pid in pred_ids],
+            fields=["timestamp", "current_price", "predictions"],
+        )
+        predictions = [p for p in predictions if p and p["timestamp"]]
 
         if not predictions:
             return {
@@ -67,23 +72,11 @@ class SchedulerOptimizer:
         windows.sort(key=lambda w: w["savings_pct"], reverse=True)
         windows = windows[:5]  # Top 5
 
-        # Calculate cumulative savings from evaluated predictions
-        eval_ids = await r.zrevrange("evaluations:index", 0, 100)
-        total_savings = 0.0
-        workloads = 0
-        naive_total = 0.0
-
-        for eid in eval_ids:
-            ev = await get_json(f"eval:{eid}")
-            if ev and ev.get("direction_correct"):
-                predicted = ev.get("predicted_price", 0)
-                actual = ev.get("actual_price", 0)
-                base = ev.get("current_price", actual)
-                if predicted < base:
-                    savings = base - actual
-                    total_savings += abs(savings)
-                    workloads += 1
-                naive_total += base
+        # Cumulative savings ledger, maintained by the evaluator at write time
+        aggregates = await self.evaluator.get_aggregates()
+        total_savings = aggregates["savings_usd"]
+        workloads = aggregates["workloads_optimized"]
+        naive_total = aggregates["naive_usd"]
 
         vs_naive_pct = round(total_savings / naive_total * 100, 1) if naive_total > 0 else 0.0
 
@@ -93,7 +86,7 @@ class SchedulerOptimizer:
             "vs_naive_pct": vs_naive_pct,
             "workloads_optimized": workloads,
         }
-        await store_json("scheduler:savings", savings_data)
+        await store_json(SCHEDULER_SAVINGS, savings_data)
 
         recommendation = "Run workloads during predicted price dips for optimal savings."
         if windows:
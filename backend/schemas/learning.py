@@ -20,6 +20,7 @@ class LearningMetricsResponse(BaseModel):
 
 
 class LearningEvent(BaseModel):
+    id: Optional[str] = None  # stream entry id (stream event log backend only)
     cycle: int
     timestamp: datetime
     type: str  # "edge_weight_update" | "edge_pruned" | "edge_added" | "prediction_evaluated"
@@ -30,3 +31,4 @@ class LearningEvent(BaseModel):
 
 class LearningLogResponse(BaseModel):
     events: list[LearningEvent]
+    cursor: Optional[str] = None  # newest event id, pass back as ?after=
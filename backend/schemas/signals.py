@@ -42,6 +42,13 @@ class SourceStatus(BaseModel):
     name: str
     status: str  # "active" | "inactive" | "error"
     last_update: Optional[datetime] = None
+    circuit: str = "closed"  # "closed" | "open"
+    last_error: Optional[str] = None
+    last_error_at: Optional[datetime] = None
+    latency_ms: Optional[int] = None
+    success_count: int = 0
+    error_count: int = 0
+    rejected_count: int = 0
 
 
 class SourcesResponse(BaseModel):
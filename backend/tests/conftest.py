@@ -0,0 +1,19 @@
+"""Tests run against the in-process store (``STORAGE_BACKEND=memory``)."""
+
+import os
+
+os.environ["STORAGE_BACKEND"] = "memory"
+
+import pytest
+
+from causal import graph
+from core.redis_client import close_redis, get_redis
+
+
+@pytest.fixture(autouse=True)
+async def store():
+    """A fresh, empty MemoryRedis for each test."""
+    await close_redis()
+    graph._cache.update(version=None, graph=None)
+    yield await get_redis()
+    await close_redis()
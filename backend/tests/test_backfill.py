@@ -0,0 +1,100 @@
+"""Resumable backfill: range checkpoints and failed windows."""
+
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+import backfill
+from ingestion.health import health_key
+from ingestion.scheduler import get_scheduler
+
+START = datetime(2025, 8, 1, tzinfo=timezone.utc)
+DAY = timedelta(days=1)
+
+
+async def test_records_progress_and_resumes_after_it(store):
+    end = START + 2 * DAY
+    key = backfill.checkpoint_key("aws_spot", START, end)
+
+    first = await backfill.backfill("aws_spot", START, end, retention_days=0)
+    again = await backfill.backfill("aws_spot", START, end, retention_days=0)
+
+    assert first["complete"] and first["written"] > 0
+    assert int(await store.hget(key, "last_ts")) == int(end.timestamp() * 1000)
+    assert again["points"] == 0
+
+
+async def test_resumes_an_interrupted_range(store):
+    end = START + 2 * DAY
+    second_day = await backfill.backfill("aws_spot", START + DAY, end, retention_days=0)
+    await store.hset(
+        backfill.checkpoint_key("aws_spot", START, end),
+        "last_ts", int((START + DAY).timestamp() * 1000),
+    )
+
+    resumed = await backfill.backfill("aws_spot", START, end, retention_days=0)
+
+    assert resumed["points"] == second_day["points"]
+
+
+async def test_another_range_starts_fresh():
+    await backfill.backfill("aws_spot", START, START + DAY, retention_days=0)
+
+    wider = await backfill.backfill("aws_spot", START, START + 2 * DAY, retention_days=0)
+
+    assert wider["points"] > 0
+    assert backfill.checkpoint_key("aws_spot", START, START + DAY) != (
+        backfill.checkpoint_key("aws_spot", START, START + 2 * DAY)
+    )
+
+
+@pytest.fixture
+def eia(monkeypatch):
+    """The EIA source behind a mock API; requests fail while ``down`` is set
+    or once they reach ``down_from`` (an ``%Y-%m-%dT%H`` period)."""
+    source = get_scheduler().sources["eia_electricity"]
+    state = {"down": False, "down_from": None}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        period = request.url.params["start"]
+        if state["down"] or (state["down_from"] and period >= state["down_from"]):
+            raise httpx.ConnectError("name resolution failed")
+        return httpx.Response(200, json={
+            "response": {"total": 1, "data": [{"period": period, "value": 100}]},
+        })
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(source, "_http_client", client)
+    return state
+
+
+async def test_failed_fetch_does_not_advance_the_checkpoint(store, eia):
+    end = START + 2 * DAY
+    key = backfill.checkpoint_key("eia_electricity", START, end)
+
+    eia["down"] = True
+    failed = await backfill.backfill("eia_electricity", START, end, window=DAY)
+
+    assert not failed["complete"]
+    assert await store.hget(key, "last_ts") is None
+
+    eia["down"] = False
+    await store.delete(health_key("eia_electricity"))  # close the breaker the outage tripped
+    done = await backfill.backfill("eia_electricity", START, end, window=DAY)
+
+    assert done["complete"]
+    assert done["written"] == 2 * 3  # one row per window per respondent
+    assert int(await store.hget(key, "last_ts")) == int(end.timestamp() * 1000)
+
+
+async def test_stops_at_the_first_failed_window(store, eia):
+    end = START + 3 * DAY
+    key = backfill.checkpoint_key("eia_electricity", START, end)
+    eia["down_from"] = f"{START + DAY:%Y-%m-%dT%H}"
+
+    totals = await backfill.backfill("eia_electricity", START, end, window=DAY)
+
+    assert not totals["complete"]
+    assert totals["written"] == 3
+    assert int(await store.hget(key, "last_ts")) == int((START + DAY).timestamp() * 1000)
@@ -0,0 +1,80 @@
+"""Write-time evaluation aggregates and their running histories."""
+
+from core.keys import prediction_key
+from core.redis_client import store_json
+from evaluation.evaluator import AGGREGATES_KEY, PredictionEvaluator, _summarize
+
+
+async def predict(prediction_id: str, cycle: int, predicted: float, current: float = 1.0) -> None:
+    await store_json(prediction_key(prediction_id), {
+        "cycle": cycle,
+        "current_price": current,
+        "predictions": [{
+            "horizon": "1h",
+            "predicted_price": predicted,
+            "direction": "down" if predicted < current else "up",
+        }],
+    })
+
+
+async def evaluate_all(evaluator: PredictionEvaluator, actuals: list[float]) -> list[dict]:
+    evaluations = []
+    for cycle, actual in enumerate(actuals, 1):
+        await predict(f"p{cycle}", cycle, predicted=0.9)
+        evaluations.append(await evaluator.evaluate(f"p{cycle}", actual))
+    return evaluations
+
+
+async def test_metrics_match_a_full_recompute():
+    evaluator = PredictionEvaluator()
+    evaluations = await evaluate_all(evaluator, [0.95, 1.2, 0.8, 1.0])
+
+    metrics = await evaluator.compute_metrics()
+    expected = _summarize(evaluations)
+
+    assert metrics["total_cycles"] == 4
+    assert metrics["overall_mae"] == expected["overall_mae"]
+    assert metrics["directional_accuracy"] == expected["directional_accuracy"]
+    assert metrics["mae_history"] == expected["mae_history"]
+    assert metrics["directional_accuracy_history"] == expected["directional_accuracy_history"]
+
+
+async def test_savings_count_correct_downward_calls():
+    evaluator = PredictionEvaluator()
+    await evaluate_all(evaluator, [0.95, 1.2])
+
+    aggregates = await evaluator.get_aggregates()
+
+    assert aggregates["evaluations"] == 2
+    assert aggregates["direction_hits"] == 1
+    assert aggregates["workloads_optimized"] == 1
+    assert round(aggregates["savings_usd"], 6) == 0.05
+
+
+async def test_re_evaluation_replaces_its_contribution():
+    evaluator = PredictionEvaluator()
+    await evaluate_all(evaluator, [0.95, 0.95, 0.95])
+
+    await evaluator.evaluate("p2", 1.3)
+    metrics = await evaluator.compute_metrics()
+
+    assert metrics["total_cycles"] == 3
+    assert metrics["overall_mae"] == round((0.05 + 0.4 + 0.05) / 3, 6)
+    assert len(metrics["mae_history"]) == 3
+    assert metrics["mae_history"][-1] == metrics["overall_mae"]
+    assert metrics["directional_accuracy_history"][-1] == metrics["directional_accuracy"]
+
+
+async def test_missing_aggregates_are_rebuilt_on_the_next_write(store):
+    evaluator = PredictionEvaluator()
+    evaluations = await evaluate_all(evaluator, [0.95, 1.2])
+    await store.delete(AGGREGATES_KEY)
+
+    assert (await evaluator.get_aggregates())["evaluations"] == 0
+
+    await predict("p3", 3, predicted=0.9)
+    evaluations.append(await evaluator.evaluate("p3", 0.8))
+    metrics = await evaluator.compute_metrics()
+
+    assert metrics["total_cycles"] == 3
+    assert metrics["overall_mae"] == _summarize(evaluations)["overall_mae"]
@@ -0,0 +1,84 @@
+"""Causal graph commits: the version-checked compare-and-swap."""
+
+import pytest
+
+from causal.graph import COMMIT_RETRIES, GRAPH_KEY, CausalGraph, GraphConflictError
+from core.redis_client import close_redis, commit_json_changes, get_json
+
+
+async def first_edge(graph: CausalGraph) -> tuple[str, dict]:
+    edges = (await graph.get_graph())["edges"]
+    key = next(iter(edges))
+    return key, dict(edges[key])
+
+
+async def test_commit_bumps_version_and_rejects_stale_base():
+    graph = CausalGraph()
+    base = (await graph.get_graph())["version"]
+    key, edge = await first_edge(graph)
+    edge["weight"] = 0.9
+
+    assert await graph.commit(base, {key: edge}) == base + 1
+    assert await graph.commit(base, {key: {**edge, "weight": 0.1}}) is None
+
+    stored = await get_json(GRAPH_KEY)
+    assert stored["version"] == base + 1
+    assert stored["edges"][key]["weight"] == 0.9
+
+
+async def test_commit_prunes_edges():
+    graph = CausalGraph()
+    base = (await graph.get_graph())["version"]
+    key, _ = await first_edge(graph)
+
+    await graph.commit(base, {}, [key])
+
+    assert key not in (await get_json(GRAPH_KEY))["edges"]
+
+
+async def test_apply_replans_after_losing_a_race(monkeypatch):
+    graph = CausalGraph()
+    key, edge = await first_edge(graph)
+    real_commit = CausalGraph.commit
+    bases = []
+
+    async def racing_commit(self, base_version, *args, **kwargs):
+        bases.append(base_version)
+        if len(bases) == 1:
+            # Another writer commits between our read and our write
+            await commit_json_changes(GRAPH_KEY, base_version, {"last_updated": "x"})
+        return await real_commit(self, base_version, *args, **kwargs)
+
+    monkeypatch.setattr(CausalGraph, "commit", racing_commit)
+    updated = await graph.update_edge(edge["from"], edge["to"], 0.42)
+
+    assert bases[1] == bases[0] + 1
+    assert updated["version"] == bases[0] + 2
+    assert (await get_json(GRAPH_KEY))["edges"][key]["weight"] == 0.42
+
+
+async def test_apply_gives_up_after_repeated_conflicts(monkeypatch):
+    async def always_conflicts(self, *args, **kwargs):
+        return None
+
+    monkeypatch.setattr(CausalGraph, "commit", always_conflicts)
+    calls = []
+
+    def plan(graph):
+        calls.append(graph["version"])
+        return {}, []
+
+    with pytest.raises(GraphConflictError):
+        await CausalGraph().apply(plan)
+    assert len(calls) == COMMIT_RETRIES
+
+
+async def test_update_edge_after_reconnect():
+    graph = CausalGraph()
+    _, edge = await first_edge(graph)
+    await graph.update_edge(edge["from"], edge["to"], 0.2)
+    await close_redis()
+
+    updated = await CausalGraph().update_edge(edge["from"], edge["to"], 0.3)
+
+    assert updated["edges"][f"{edge['from']}->{edge['to']}"]["weight"] == 0.3
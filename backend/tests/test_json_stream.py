@@ -0,0 +1,60 @@
+"""Streaming JSON array scanner used for the instances catalogue."""
+
+import json
+
+from ingestion.json_stream import JSONArrayScanner
+
+CATALOGUE = [
+    {"instance_type": "m5.large", "pricing": {"us-east-1": {"spot_avg": "0.04"}}},
+    {"pricing": {"note": "key after \"nested\" {braces}"}, "instance_type": "p3.2xlarge"},
+    {"instance_type": "g5.xlarge", "pretty_name": "G5 – Größe XL", "tags": ["a", "}"]},
+    {"instance_type": "t3.micro", "extra": [{"instance_type": "p3.2xlarge"}]},
+    {"instance_type": "g4dn.xlarge", "memory": 16.0},
+]
+WANTED = {"p3.2xlarge", "g5.xlarge", "g4dn.xlarge"}
+
+
+def scan(body: bytes, chunk_size: int, wanted: set[str] = WANTED) -> tuple[list, JSONArrayScanner]:
+    scanner = JSONArrayScanner("instance_type", wanted)
+    found = []
+    for i in range(0, len(body), chunk_size):
+        found.extend(scanner.feed(body[i:i + chunk_size]))
+    return found, scanner
+
+
+def test_returns_wanted_elements_at_any_chunk_size():
+    body = json.dumps(CATALOGUE, ensure_ascii=False, indent=1).encode()
+    expected = [e for e in CATALOGUE if e["instance_type"] in WANTED]
+
+    for chunk_size in (1, 2, 3, 7, 64, len(body)):
+        found, scanner = scan(body, chunk_size)
+        assert found == expected, chunk_size
+        assert scanner.done
+
+
+def test_ignores_the_key_in_nested_objects():
+    body = json.dumps(CATALOGUE).encode()
+
+    found, _ = scan(body, 5, {"p3.2xlarge"})
+
+    assert found == [CATALOGUE[1]]
+
+
+def test_not_done_until_every_wanted_element_is_seen():
+    body = json.dumps(CATALOGUE).encode()
+
+    _, scanner = scan(body, 16, WANTED | {"x1.32xlarge"})
+
+    assert scanner.found == WANTED
+    assert not scanner.done
+
+
+def test_drops_skipped_elements_from_its_buffer():
+    filler = [{"instance_type": f"c5.{i}", "blob": "x" * 1000} for i in range(50)]
+    body = json.dumps(filler).encode()
+    scanner = JSONArrayScanner("instance_type", {"p3.2xlarge"})
+
+    for i in range(0, len(body), 100):
+        assert scanner.feed(body[i:i + 100]) == []
+        # At most one unfinished string plus the chunk
+        assert len(scanner._buf) < 1000 + 2 * 100
@@ -0,0 +1,55 @@
+"""Aho-Corasick keyword matcher versus plain substring matching."""
+
+from ingestion.keyword_matcher import KeywordMatcher
+from ingestion.news import (
+    BEARISH_KEYWORDS,
+    BULLISH_KEYWORDS,
+    FALLBACK_HEADLINES,
+    RELEVANCE_KEYWORDS,
+)
+
+CATEGORIES = {
+    "relevance": RELEVANCE_KEYWORDS,
+    "bullish": BULLISH_KEYWORDS,
+    "bearish": BEARISH_KEYWORDS,
+}
+
+
+def naive(categories: dict[str, list[str]], text: str) -> dict[str, set[str]]:
+    lowered = text.lower()
+    return {
+        category: {kw.lower() for kw in keywords if kw and kw.lower() in lowered}
+        for category, keywords in categories.items()
+    }
+
+
+def test_matches_substrings_like_the_naive_scan():
+    matcher = KeywordMatcher(CATEGORIES)
+    titles = [h["title"] for h in FALLBACK_HEADLINES] + [
+        "",
+        "GPU SHORTAGE hits AI labs",
+        "said aid to the data centre",
+    ]
+
+    for title in titles:
+        assert matcher.match(title) == naive(CATEGORIES, title), title
+
+
+def test_overlapping_and_nested_keywords():
+    categories = {"a": ["he", "she", "hers", "his"], "b": ["e", "rs"], "empty": [""]}
+    matcher = KeywordMatcher(categories)
+
+    for text in ("ushers", "shis", "hhhershe", "xyz"):
+        assert matcher.match(text) == naive(categories, text), text
+
+
+def test_same_keyword_in_two_categories():
+    matcher = KeywordMatcher({"up": ["chip demand"], "topic": ["chip"]})
+
+    assert matcher.match("Chip Demand soars") == {"up": {"chip demand"}, "topic": {"chip"}}
+
+
+def test_match_many():
+    matcher = KeywordMatcher({"k": ["gpu"]})
+
+    assert matcher.match_many(["GPU", "cpu"]) == [{"k": {"gpu"}}, {"k": set()}]
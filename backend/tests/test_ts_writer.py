@@ -0,0 +1,85 @@
+"""Bulk TimeSeries writer: ts_add_many and the create-once series registry."""
+
+from core.redis_client import _parse_info, close_redis, get_redis, ts_add_many
+
+KEY = "signal:test:a:price"
+T0 = 1_754_006_400_000  # 2025-08-01T00:00Z
+
+
+def points(*values: float, start: int = T0, key: str = KEY) -> list[dict]:
+    return [
+        {
+            "key": key,
+            "timestamp": start + i * 60_000,
+            "value": value,
+            "labels": {"source": "test", "metric": "price"},
+        }
+        for i, value in enumerate(values)
+    ]
+
+
+async def info(store, key: str = KEY) -> dict:
+    return _parse_info(await store.execute_command("TS.INFO", key))
+
+
+async def last(store, key: str = KEY) -> tuple[int, float]:
+    ts, value = await store.execute_command("TS.GET", key)
+    return int(ts), float(value)
+
+
+async def test_writes_samples_and_creates_rollups(store):
+    report = await ts_add_many(points(1.0, 2.0, 3.0))
+
+    assert report == {"written": 3, "skipped": 0, "failed": []}
+    assert (await info(store))["totalSamples"] == 3
+    assert len((await info(store))["rules"]) == 6
+    assert await store.execute_command("TS.GET", f"{KEY}:1h:avg") == []
+
+
+async def test_chunks_large_batches(store):
+    report = await ts_add_many(points(*range(1200)), chunk_size=500)
+
+    assert report["written"] == 1200
+    assert (await info(store))["totalSamples"] == 1200
+
+
+async def test_only_changed_skips_repeated_values(store):
+    report = await ts_add_many(points(1.0, 1.0, 2.0, 2.0), only_changed=True)
+    assert (report["written"], report["skipped"]) == (2, 2)
+
+    report = await ts_add_many(points(2.0, 3.0, start=T0 + 3_600_000), only_changed=True)
+    assert (report["written"], report["skipped"]) == (1, 1)
+
+
+async def test_only_changed_rewrites_after_reconnect(store):
+    await ts_add_many(points(5.0), only_changed=True)
+    await close_redis()
+
+    report = await ts_add_many(points(5.0, start=T0 + 60_000), only_changed=True)
+
+    assert (report["written"], report["skipped"]) == (1, 0)
+    fresh = await get_redis()
+    assert fresh is not store
+    assert await last(fresh) == (T0 + 60_000, 5.0)
+
+
+async def test_only_changed_recreates_deleted_series(store):
+    await ts_add_many(points(5.0), only_changed=True)
+    await store.delete(KEY)
+
+    report = await ts_add_many(points(5.0, start=T0 + 60_000), only_changed=True)
+
+    assert (report["written"], report["skipped"]) == (1, 0)
+    assert len((await info(store))["rules"]) == 6
+
+
+async def test_upgrades_series_created_without_policy_or_rollups(store):
+    await store.execute_command("TS.CREATE", KEY)  # BLOCK, no rules
+
+    await ts_add_many(points(1.0))
+    report = await ts_add_many(points(4.0))
+
+    assert report["written"] == 1
+    assert await last(store) == (T0, 4.0)
+    assert (await info(store))["duplicatePolicy"] == "last"
+    assert len((await info(store))["rules"]) == 6